@@ -1,12 +1,26 @@
 import streamlit as st
 from typing import List, Dict, Any
-from app.services.openai_service import process_user_input
-from app.services.search_service import SearchService
+from app.services.openai_service import (
+    collect_pending_job,
+    collect_search_submissions,
+    get_pending_job,
+    get_search_score,
+    process_user_input,
+    should_speculate,
+    should_use_semantic_search,
+    stream_user_input,
+    submit_user_input
+)
+from app.services.job_queue import JobQueueFullError
+from app.services.service_container import get_service_container
 from app.utils.config import get_config
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds between refreshes of a pending assistant bubble
+JOB_POLL_INTERVAL = 0.5
+
 def render_chat_interface():
     """Render the main chat interface."""
     logger.info("Rendering chat interface")
@@ -16,16 +30,22 @@ def render_chat_interface():
     logger.debug("Getting configuration for services")
     config = get_config()
     
-    logger.info("Initializing search service")
-    search_service = SearchService(
-        api_endpoint=config["aws"]["api_endpoint"],
-        api_key=config["aws"]["api_key"]
-    )
+    logger.debug("Getting shared search service")
+    search_service = get_service_container(config).get_search_service()
     
     # Display chat messages
     logger.debug("Displaying chat messages")
     display_chat_messages()
     
+    if "job_error" in st.session_state:
+        st.error(st.session_state.pop("job_error"))
+    
+    if st.session_state.get("pending_job_id"):
+        render_pending_job()
+    
+    if st.session_state.get("pending_search_ids"):
+        render_pending_searches()
+    
     # Chat input
     logger.debug("Rendering chat input")
     user_input = st.chat_input("Type your message here...")
@@ -34,16 +54,73 @@ def render_chat_interface():
         logger.info("User submitted new input")
         logger.debug(f"User input: {user_input[:50]}{'...' if len(user_input) > 50 else ''}")
         
-        # Process user input
-        logger.info("Processing user input")
-        with st.spinner("Thinking..."):
-            response = process_user_input(user_input, search_service)
-            logger.debug(f"Response: {response[:50]}{'...' if len(response) > 50 else ''}")
+        # Search and ambiguous inputs go through process_user_input, which
+        # sends the search (speculatively answering in parallel if ambiguous).
+        # The intent is scored once per turn and passed down.
+        search_score = get_search_score(user_input)
+        searches = should_use_semantic_search(user_input, search_score) or should_speculate(user_input, search_score)
+        
+        if config["jobs"]["enabled"] and not searches:
+            # Queue the response; the pending bubble polls for it
+            logger.info("Submitting user input as background job")
+            try:
+                submit_user_input(user_input)
+            except JobQueueFullError as e:
+                logger.warning(f"Could not queue user input: {str(e)}")
+        elif config["openai"]["stream"] and not searches:
+            # Stream the response into the assistant bubble
+            logger.info("Streaming user input response")
+            st.chat_message("user").write(user_input)
+            with st.chat_message("assistant"):
+                stream = stream_user_input(user_input)
+                try:
+                    response = st.write_stream(stream)
+                finally:
+                    # Ensures the partial response is recorded if the run is interrupted
+                    stream.close()
+            logger.debug(f"Streamed response length: {len(response)}")
+        else:
+            # Process user input
+            logger.info("Processing user input")
+            with st.spinner("Thinking..."):
+                response = process_user_input(user_input, search_service, search_score=search_score)
+                logger.debug(f"Response: {response[:50]}{'...' if len(response) > 50 else ''}")
         
         # Force UI update
         logger.info("Triggering Streamlit rerun to update UI")
         st.rerun()
 
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def render_pending_job():
+    """Render the assistant bubble of the pending background job.
+    
+    Runs as a fragment so only this bubble refreshes while the job runs;
+    once the job is finished its result is collected and the app reruns.
+    """
+    job = get_pending_job()
+    if job is None or job.finished:
+        logger.info("Pending job finished, collecting result")
+        collect_pending_job()
+        st.rerun()
+    
+    with st.chat_message("assistant"):
+        text = job.text
+        if text:
+            st.write(text)
+        else:
+            st.write("Thinking...")
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def render_pending_searches():
+    """Poll the session's background search submissions.
+    
+    Renders nothing itself; once a submission has finished the app reruns
+    so its placeholder message shows the outcome.
+    """
+    if collect_search_submissions():
+        logger.info("Search submission finished, refreshing messages")
+        st.rerun()
+
 def display_chat_messages():
     """Display chat message history."""
     logger.debug("Displaying chat messages from session state")
@@ -64,7 +141,17 @@ def display_chat_messages():
         if role == "user":
             st.chat_message("user").write(content)
         elif role == "assistant":
-            st.chat_message("assistant").write(content)
+            with st.chat_message("assistant"):
+                st.write(content)
+                if message.get("truncated"):
+                    st.caption("Response interrupted")
+                search_status = message.get("search_status")
+                if search_status == "pending":
+                    st.caption("Submitting search...")
+                elif search_status == "accepted":
+                    st.caption("Search submitted, waiting for results")
+                elif search_status == "failed":
+                    st.caption(message.get("search_error", "Search failed"))
         elif role == "system":
             # Optionally display system messages differently
             st.chat_message("assistant").write(f"System: {content}") 
\ No newline at end of file
@@ -1,5 +1,19 @@
 import streamlit as st
-from app.services.websocket_client import WebSocketClient, handle_websocket_message, handle_websocket_error
+from typing import Dict, Any
+from app.services.async_openai_service import get_event_loop_thread
+from app.services.job_queue import get_job_executor
+from app.services.model_router import AUTO_MODEL, get_latency_histograms
+from app.services.openai_client import get_pool_stats
+from app.services.response_cache import get_response_cache
+from app.services.semantic_cache import get_semantic_cache
+from app.services.search_cache import get_search_cache
+from app.services.search_client import get_search_pool_stats
+from app.services.search_submitter import get_search_submitter
+from app.services.singleflight import get_singleflight
+from app.services.rate_limiter import get_rate_limiter
+from app.services.resilience import get_hedger, get_circuit_breaker_stats
+from app.services.usage_tracker import get_usage_tracker
+from app.services.service_container import get_service_container, invalidate_service_container
 from app.utils.config import get_config
 from app.utils.session import clear_conversation
 from app.utils.logger import get_logger
@@ -19,7 +33,7 @@ def render_sidebar():
         # Model selection
         logger.debug("Rendering model selection")
         st.subheader("Model Settings")
-        model_options = ["gpt-3.5-turbo", "gpt-4"]
+        model_options = ["gpt-3.5-turbo", "gpt-4", AUTO_MODEL]
         
         # Use default model from config if not set in session state
         if "openai_model" not in st.session_state:
@@ -41,6 +55,7 @@ def render_sidebar():
         # WebSocket connection
         logger.debug("Rendering WebSocket connection section")
         st.subheader("WebSocket Connection")
+        refresh_websocket_connection(config)
         websocket_status = "Connected" if st.session_state.websocket_connected else "Disconnected"
         logger.debug(f"WebSocket status: {websocket_status}")
         st.write(f"Status: {websocket_status}")
@@ -74,6 +89,86 @@ def render_sidebar():
             config["app"]["debug"] = debug_mode
             st.session_state.config = config
         
+        if debug_mode:
+            logger.debug("Rendering debug panels")
+            with st.expander("Services"):
+                st.json(get_service_container(config).get_stats())
+                if st.button("Rebuild Services"):
+                    logger.info("Rebuild Services button clicked")
+                    invalidate_service_container()
+                    # Lets the WebSocket section reconnect on the new container
+                    st.rerun()
+            
+            if config["jobs"]["enabled"]:
+                with st.expander("Background Jobs"):
+                    st.json(get_job_executor(config["jobs"]).get_stats())
+            
+            if config["openai"]["async"]:
+                with st.expander("Async Event Loop"):
+                    st.json(get_event_loop_thread().get_stats())
+            
+            usage_tracker = get_usage_tracker(config["usage"])
+            if usage_tracker is not None:
+                with st.expander("Usage"):
+                    st.json(usage_tracker.get_aggregates())
+                    st.download_button(
+                        "Export CSV",
+                        data=usage_tracker.export_csv(),
+                        file_name="usage.csv",
+                        mime="text/csv"
+                    )
+                    st.download_button(
+                        "Export JSONL",
+                        data=usage_tracker.export_jsonl(),
+                        file_name="usage.jsonl",
+                        mime="application/x-ndjson"
+                    )
+            
+            with st.expander("Model Latency"):
+                st.json(get_latency_histograms())
+            
+            with st.expander("Circuit Breakers"):
+                st.json(get_circuit_breaker_stats())
+            
+            with st.expander("OpenAI Connection Pool"):
+                st.json(get_pool_stats())
+            
+            with st.expander("Search Connection Pool"):
+                st.json(get_search_pool_stats())
+            
+            search_submitter = get_search_submitter(config["aws"]["submit"])
+            if search_submitter is not None:
+                with st.expander("Search Submissions"):
+                    st.json(search_submitter.get_stats())
+            
+            response_cache = get_response_cache(config["response_cache"])
+            if response_cache is not None:
+                with st.expander("Response Cache"):
+                    st.json(response_cache.get_stats())
+            
+            search_cache = get_search_cache(config["search_cache"])
+            if search_cache is not None:
+                with st.expander("Search Result Cache"):
+                    st.json(search_cache.get_stats())
+            
+            semantic_cache = get_semantic_cache(config["semantic_cache"])
+            if semantic_cache is not None:
+                with st.expander("Semantic Cache"):
+                    st.json(semantic_cache.get_stats())
+            
+            with st.expander("Request Coalescing"):
+                st.json(get_singleflight().get_stats())
+            
+            rate_limiter = get_rate_limiter(config["openai"]["rate_limits"])
+            if rate_limiter is not None:
+                with st.expander("Rate Limiter"):
+                    st.json(rate_limiter.get_stats())
+            
+            hedger = get_hedger(config["openai"]["retry"])
+            if hedger is not None:
+                with st.expander("Request Hedging"):
+                    st.json(hedger.get_stats())
+        
         # About section
         logger.debug("Rendering about section")
         st.subheader("About")
@@ -99,11 +194,9 @@ def connect_websocket():
         
         # Initialize WebSocket client
         logger.info("Initializing WebSocket client")
-        client = WebSocketClient(
-            websocket_url=websocket_url,
-            on_message=handle_websocket_message,
-            on_error=handle_websocket_error
-        )
+        container = get_service_container(config)
+        client = container.create_websocket_client(st.session_state.session_id)
+        st.session_state.websocket_generation = container.generation
         
         # Connect to WebSocket
         logger.info("Connecting to WebSocket")
@@ -120,6 +213,24 @@ def connect_websocket():
         logger.error(f"Failed to connect to WebSocket: {str(e)}", exc_info=True)
         st.sidebar.error(f"Failed to connect to WebSocket: {str(e)}")
 
+def refresh_websocket_connection(config: Dict[str, Any]):
+    """Reconnect the session's WebSocket if the service container it was opened on was rebuilt.
+    
+    Rebuilding the container disconnects every WebSocket client it handed
+    out, which the session's connection flag does not reflect.
+    
+    Args:
+        config: Application configuration
+    """
+    if not st.session_state.websocket_connected:
+        return
+    generation = get_service_container(config).generation
+    if st.session_state.get("websocket_generation") == generation:
+        return
+    logger.info("Service container was rebuilt, reconnecting WebSocket")
+    st.session_state.websocket_connected = False
+    connect_websocket()
+
 def disconnect_websocket():
     """Disconnect from WebSocket endpoint."""
     logger.info("Attempting to disconnect from WebSocket")
@@ -132,7 +243,7 @@ def disconnect_websocket():
     try:
         if "websocket_client" in st.session_state:
             logger.info("Disconnecting WebSocket client")
-            st.session_state.websocket_client.disconnect()
+            get_service_container(get_config()).release_websocket_client(st.session_state.session_id)
             st.session_state.websocket_connected = False
             logger.info("WebSocket disconnected successfully")
             st.sidebar.success("WebSocket disconnected")
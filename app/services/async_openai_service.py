@@ -0,0 +1,419 @@
+import asyncio
+import functools
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Coroutine, List, Dict, Any, Optional
+from app.services.openai_client import get_async_openai_client
+from app.services.generation_profiles import ROUTE_CHAT
+from app.services.openai_service import OpenAIService, _read_usage
+from app.services.rate_limiter import get_rate_limiter
+from app.services.resilience import get_circuit_breaker, is_retryable_error
+from app.services.response_cache import get_response_cache
+from app.services.semantic_cache import get_semantic_cache
+from app.services.usage_tracker import get_usage_tracker
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Threads running the blocking work of async requests (rate limit waits,
+# SQLite cache access, token counting) so it never stalls the event loop
+BLOCKING_WORKERS = 32
+
+# Seconds between cancellation checks while waiting on the network
+CANCEL_POLL_INTERVAL = 0.1
+
+class GenerationCancelled(Exception):
+    """Raised inside an async generation once its caller has asked to cancel it."""
+
+async def _until_cancelled(awaitable, should_cancel: Callable[[], bool]):
+    """Await ``awaitable``, abandoning it as soon as ``should_cancel`` returns True.
+
+    Raises:
+        GenerationCancelled: If the caller cancelled before ``awaitable`` finished
+    """
+    task = asyncio.ensure_future(awaitable)
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=CANCEL_POLL_INTERVAL)
+        if done:
+            return task.result()
+        if should_cancel():
+            task.cancel()
+            raise GenerationCancelled()
+
+class EventLoopThread:
+    """A dedicated thread running one asyncio event loop forever.
+
+    Other threads hand coroutines to the loop with ``submit`` and get a
+    ``concurrent.futures.Future`` back, so any number of generations can be
+    in flight without one blocked thread each. Blocking calls the
+    coroutines need are run on a dedicated executor with ``run_blocking``.
+    """
+
+    def __init__(self, name: str = "openai-event-loop"):
+        """Start the loop thread.
+
+        Args:
+            name: Name of the thread
+        """
+        logger.info("Starting shared asyncio event loop thread")
+        self.loop = asyncio.new_event_loop()
+        self.executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix=f"{name}-blocking")
+        self._in_flight = 0
+        self._submitted = 0
+        self._lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name=name)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _run(self):
+        """Run the event loop (thread target)."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on the loop from any thread.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            Future resolved with the coroutine's result
+        """
+        with self._lock:
+            self._in_flight += 1
+            self._submitted += 1
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(self._on_done)
+        return future
+
+    async def run_blocking(self, fn: Callable, *args):
+        """Run a blocking function on the dedicated executor and await its result.
+
+        Args:
+            fn: Function to call
+            *args: Positional arguments for ``fn``
+
+        Returns:
+            The result of ``fn``
+        """
+        return await self.loop.run_in_executor(self.executor, functools.partial(fn, *args))
+
+    def _on_done(self, future: Future):
+        """Update the in-flight counter once a coroutine finishes."""
+        with self._lock:
+            self._in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get loop statistics.
+
+        Returns:
+            Dictionary with in-flight and submitted coroutine counts
+        """
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "submitted": self._submitted,
+                "running": self.loop.is_running()
+            }
+
+# Shared by every session in the process
+_loop_thread: Optional[EventLoopThread] = None
+_loop_thread_lock = threading.Lock()
+
+def get_event_loop_thread() -> EventLoopThread:
+    """Get the process-wide event loop thread, starting it on first use.
+
+    Returns:
+        Shared EventLoopThread instance
+    """
+    global _loop_thread
+    with _loop_thread_lock:
+        if _loop_thread is None:
+            _loop_thread = EventLoopThread()
+        return _loop_thread
+
+class AsyncOpenAIService(OpenAIService):
+    """OpenAI service whose requests run on the shared asyncio event loop.
+
+    Caches, rate limits, the circuit breaker and retry settings behave as in
+    OpenAIService. Request coalescing and hedging are not applied on the
+    async path.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        pool_config: Optional[Dict[str, Any]] = None,
+        loop_thread: Optional[EventLoopThread] = None,
+        **kwargs
+    ):
+        """Initialize the async OpenAI service.
+
+        Args:
+            api_key: OpenAI API key
+            base_url: Optional custom API base URL
+            pool_config: Optional connection pool limits
+            loop_thread: Event loop thread to run on (defaults to the shared one)
+            **kwargs: Further OpenAIService options (caches, limiter, breaker, ...)
+        """
+        super().__init__(api_key, base_url=base_url, pool_config=pool_config, **kwargs)
+        self.async_client = get_async_openai_client(
+            api_key, base_url=base_url, **(pool_config or {})
+        ).with_options(max_retries=0)
+        self.loop_thread = loop_thread or get_event_loop_thread()
+
+    def submit_response(self, messages: List[Dict[str, str]], model: str = "gpt-4", route: str = ROUTE_CHAT) -> Future:
+        """Generate a response on the event loop; safe to call from any thread.
+
+        Args:
+            messages: List of message dictionaries with role and content
+            model: OpenAI model to use
+            route: Request route selecting the generation profile
+
+        Returns:
+            Future resolved with the response text
+        """
+        return self.loop_thread.submit(self.agenerate_response(messages, model=model, route=route))
+
+    def submit_stream(
+        self,
+        messages: List[Dict[str, str]],
+        on_delta: Callable[[str], None],
+        model: str = "gpt-4",
+        route: str = ROUTE_CHAT,
+        should_cancel: Callable[[], bool] = lambda: False
+    ) -> Future:
+        """Stream a response on the event loop; safe to call from any thread.
+
+        Args:
+            messages: List of message dictionaries with role and content
+            on_delta: Called on the loop thread with each content delta
+            model: OpenAI model to use
+            route: Request route selecting the generation profile
+            should_cancel: Polled until the stream ends; returning True closes it
+
+        Returns:
+            Future resolved with the full (or partial, if cancelled) response text
+        """
+        return self.loop_thread.submit(
+            self.astream_response(messages, on_delta, model=model, route=route, should_cancel=should_cancel)
+        )
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-4",
+        route: str = ROUTE_CHAT
+    ) -> str:
+        """Generate a response using the async OpenAI client.
+
+        Args:
+            messages: List of message dictionaries with role and content
+            model: OpenAI model to use
+            route: Request route selecting the generation profile
+
+        Returns:
+            Generated response text
+        """
+        logger.info(f"Generating async response with OpenAI model: {model}")
+        start = time.monotonic()
+        usage: Dict[str, Any] = {"upstream": True}
+        run_blocking = self.loop_thread.run_blocking
+        params = await run_blocking(self._get_params, model, route, messages)
+        cached = await run_blocking(self._get_cached, model, params, messages)
+        if cached is not None:
+            self._record_usage(model, route, {}, start, cache_hit=True)
+            return cached
+
+        async def attempt():
+            # Every attempt, retries included, draws on the rate limit
+            await run_blocking(self._wait_for_capacity, model, params, messages)
+            return await self.async_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                timeout=self.retry_config["timeout"],
+                **params
+            )
+
+        response = await self._acall_with_resilience(attempt)
+        response_text = response.choices[0].message.content.strip()
+        await run_blocking(_read_usage, usage, response.usage, model, messages, response_text)
+        logger.info("Successfully received async response from OpenAI")
+
+        await run_blocking(self._store_cached, model, params, messages, response_text)
+        self._record_usage(model, route, usage, start)
+        return response_text
+
+    async def astream_response(
+        self,
+        messages: List[Dict[str, str]],
+        on_delta: Callable[[str], None],
+        model: str = "gpt-4",
+        route: str = ROUTE_CHAT,
+        should_cancel: Callable[[], bool] = lambda: False
+    ) -> str:
+        """Stream a response using the async OpenAI client.
+
+        Args:
+            messages: List of message dictionaries with role and content
+            on_delta: Called with each content delta
+            model: OpenAI model to use
+            route: Request route selecting the generation profile
+            should_cancel: Polled before the request, while waiting for the
+                response and its first delta, and between deltas; returning
+                True closes the stream
+
+        Returns:
+            The full (or partial, if cancelled) response text
+        """
+        logger.info(f"Streaming async response with OpenAI model: {model}")
+        start = time.monotonic()
+        usage: Dict[str, Any] = {"upstream": True}
+        run_blocking = self.loop_thread.run_blocking
+        params = await run_blocking(self._get_params, model, route, messages)
+        cached = await run_blocking(self._get_cached, model, params, messages)
+        if cached is not None:
+            self._record_usage(model, route, {}, start, cache_hit=True)
+            on_delta(cached)
+            return cached
+
+        async def open_stream():
+            # Every attempt, retries included, draws on the rate limit
+            await run_blocking(self._wait_for_capacity, model, params, messages)
+            if should_cancel():
+                raise GenerationCancelled()
+            return await _until_cancelled(
+                self.async_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    timeout=self.retry_config["timeout"],
+                    **params
+                ),
+                should_cancel
+            )
+
+        try:
+            stream = await self._acall_with_resilience(open_stream, should_cancel=should_cancel)
+        except GenerationCancelled:
+            logger.info("Async generation cancelled before the response started")
+            return ""
+        chunks = []
+        first_token_at = None
+        completed = False
+        try:
+            deltas = stream.__aiter__()
+            while True:
+                try:
+                    if first_token_at is None:
+                        # The first token can take long, so keep checking for cancellation meanwhile
+                        chunk = await _until_cancelled(deltas.__anext__(), should_cancel)
+                    else:
+                        chunk = await deltas.__anext__()
+                except StopAsyncIteration:
+                    completed = True
+                    break
+                if should_cancel():
+                    logger.info("Async generation cancelled, closing OpenAI stream")
+                    break
+                if getattr(chunk, "usage", None) is not None:
+                    # Reported usage is only copied, no tokens are counted
+                    _read_usage(usage, chunk.usage, model, messages, "")
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if first_token_at is None:
+                        first_token_at = time.monotonic()
+                    chunks.append(delta)
+                    on_delta(delta)
+        except GenerationCancelled:
+            logger.info("Async generation cancelled before the first token, closing OpenAI stream")
+        finally:
+            await stream.close()
+
+        response_text = "".join(chunks).strip()
+        if "completion_tokens" not in usage:
+            await run_blocking(_read_usage, usage, None, model, messages, response_text)
+        if completed:
+            logger.info("Async OpenAI stream finished")
+            await run_blocking(self._store_cached, model, params, messages, response_text)
+        self._record_usage(model, route, usage, start, first_token_at=first_token_at, cancelled=not completed)
+        return response_text
+
+    async def _acall_with_resilience(
+        self,
+        attempt: Callable[[], Coroutine],
+        should_cancel: Callable[[], bool] = lambda: False
+    ):
+        """Run an async upstream attempt with bounded jittered retries and the circuit breaker.
+
+        Like ``CircuitBreaker.call``, every admitted call reports an outcome:
+        transient upstream errors count as failures, any other error as a
+        success, and a cancelled call gives its probe slot back.
+        """
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.allow_request()
+
+        start = time.monotonic()
+        succeeded: Optional[bool] = None
+        retry = 0
+        try:
+            while True:
+                try:
+                    result = await attempt()
+                    break
+                except GenerationCancelled:
+                    raise
+                except Exception as e:
+                    if retry >= self.retry_config["max_retries"] or not is_retryable_error(e):
+                        succeeded = not is_retryable_error(e)
+                        raise
+                    delay = random.uniform(
+                        0, min(self.retry_config["max_delay"], self.retry_config["base_delay"] * (2 ** retry))
+                    )
+                    retry += 1
+                    logger.warning(
+                        f"Retryable error ({type(e).__name__}), retry {retry}/{self.retry_config['max_retries']} in {delay:.2f}s"
+                    )
+                    await asyncio.sleep(delay)
+                    if should_cancel():
+                        raise GenerationCancelled()
+            succeeded = True
+            return result
+        finally:
+            if self.circuit_breaker is not None:
+                if succeeded is None:
+                    self.circuit_breaker.release()
+                elif succeeded:
+                    self.circuit_breaker.record_success(time.monotonic() - start)
+                else:
+                    self.circuit_breaker.record_failure()
+
+def create_async_openai_service(config: Dict[str, Any], session_id: str = "default") -> AsyncOpenAIService:
+    """Create an async OpenAI service from the app configuration.
+
+    Args:
+        config: App configuration
+        session_id: Session the requests belong to, used for fair queuing
+
+    Returns:
+        AsyncOpenAIService sharing the process-wide caches, limiter and breaker
+    """
+    return AsyncOpenAIService(
+        config["openai"]["api_key"],
+        base_url=config["openai"]["base_url"],
+        pool_config=config["openai"]["pool"],
+        cache=get_response_cache(config["response_cache"]),
+        semantic_cache=get_semantic_cache(config["semantic_cache"]),
+        rate_limiter=get_rate_limiter(config["openai"]["rate_limits"]),
+        session_id=session_id,
+        retry_config=config["openai"]["retry"],
+        circuit_breaker=get_circuit_breaker("OpenAI", config["circuit_breaker"]),
+        generation_config=config["openai"]["generation"],
+        usage_tracker=get_usage_tracker(config["usage"])
+    )
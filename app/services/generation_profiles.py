@@ -0,0 +1,76 @@
+from typing import List, Dict, Any, Optional
+from app.utils.logger import get_logger
+from app.utils.tokens import count_prompt_tokens
+
+logger = get_logger(__name__)
+
+# Routes a completion request can take; each may have its own profile
+ROUTE_CHAT = "chat"
+ROUTE_SHORT = "short"
+ROUTE_SUMMARY = "summary"
+
+# Sampling parameters used where no profile overrides them
+DEFAULT_GENERATION_PARAMS = {
+    "temperature": 0.7,
+    "max_tokens": 1000,
+    "top_p": 1.0,
+    "frequency_penalty": 0.0,
+    "presence_penalty": 0.0
+}
+
+# Context window assumed for models without a configured one
+DEFAULT_CONTEXT_WINDOW = 4096
+
+def resolve_generation_params(
+    model: str,
+    route: str,
+    messages: List[Dict[str, str]],
+    generation_config: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Build the sampling parameters for a request.
+
+    Defaults are overridden by the model's profile, then by the route's
+    profile. ``max_tokens`` is then capped by what is left of the model's
+    context window after the prompt, so a long conversation does not
+    reserve (and wait on rate limits for) tokens the model cannot produce.
+    The ``min_completion_tokens`` floor is itself capped by the window.
+
+    Args:
+        model: OpenAI model the request is for
+        route: Request route (e.g. ROUTE_CHAT, ROUTE_SHORT, ROUTE_SUMMARY)
+        messages: Prompt messages
+        generation_config: The ``generation`` section of the OpenAI configuration
+
+    Returns:
+        Parameters to pass to the completions API
+
+    Raises:
+        ValueError: If the prompt alone fills the model's context window
+    """
+    generation_config = generation_config or {}
+    params = dict(DEFAULT_GENERATION_PARAMS)
+    params.update(generation_config.get("model_profiles", {}).get(model, {}))
+    params.update(generation_config.get("route_profiles", {}).get(route, {}))
+
+    context_window = generation_config.get("context_windows", {}).get(
+        model, generation_config.get("default_context_window", DEFAULT_CONTEXT_WINDOW)
+    )
+    prompt_tokens = count_prompt_tokens(messages, model)
+    remaining = context_window - prompt_tokens
+    if remaining < 1:
+        raise ValueError(
+            f"Prompt of {prompt_tokens} tokens leaves no room for a reply in the "
+            f"{context_window}-token context window of {model}"
+        )
+    # The floor never pushes the request past the context window
+    min_tokens = min(generation_config.get("min_completion_tokens", 64), remaining)
+    max_tokens = max(min(params["max_tokens"], remaining), min_tokens)
+    if max_tokens < params["max_tokens"]:
+        logger.debug(f"Capped max_tokens for {model} from {params['max_tokens']} to {max_tokens}")
+    params["max_tokens"] = max_tokens
+
+    if not params.get("stop"):
+        params.pop("stop", None)
+
+    logger.debug(f"Generation params for {model} ({route}): {params}")
+    return params
@@ -0,0 +1,171 @@
+"""Local search-vs-chat intent classifier.
+
+Retrain from labeled JSONL (one ``{"text": ..., "label": "search" | "chat"}``
+object per line):
+
+    PYTHONPATH=. python -m app.services.intent_classifier app/data/intent_examples.jsonl
+"""
+import argparse
+import json
+import os
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from app.services.semantic_cache import embed_text
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SEARCH_LABEL = "search"
+CHAT_LABEL = "chat"
+
+# Trained model shipped with the app
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "intent_model.npz")
+
+class IntentClassifier:
+    """Logistic regression over hashed n-gram features, evaluated with NumPy.
+
+    Features come from ``embed_text`` (word unigrams, bigrams and character
+    trigrams hashed into ``dim`` buckets), so inference needs no network
+    and no vocabulary, only one hashing pass and a dot product.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: float):
+        """Initialize the classifier.
+
+        Args:
+            weights: Weight vector; its length is the feature dimension
+            bias: Intercept
+        """
+        self.weights = weights.astype(np.float32)
+        self.bias = float(bias)
+        self.dim = len(weights)
+
+    def predict_proba(self, text: str) -> float:
+        """Get the probability that a text is a search request.
+
+        Args:
+            text: User's input text
+
+        Returns:
+            Probability between 0 (chat) and 1 (search)
+        """
+        logit = float(embed_text(text, self.dim) @ self.weights) + self.bias
+        return float(1.0 / (1.0 + np.exp(-logit)))
+
+    @classmethod
+    def train(
+        cls,
+        examples: List[Tuple[str, int]],
+        dim: int = 2048,
+        epochs: int = 300,
+        learning_rate: float = 2.0,
+        l2: float = 1e-4
+    ) -> "IntentClassifier":
+        """Fit a classifier with full-batch gradient descent.
+
+        Classes are weighted inversely to their frequency, so an unbalanced
+        training set does not bias the decision threshold.
+
+        Args:
+            examples: (text, label) pairs, label 1 for search and 0 for chat
+            dim: Feature dimension
+            epochs: Gradient descent iterations
+            learning_rate: Step size
+            l2: L2 regularization strength
+
+        Returns:
+            Trained IntentClassifier
+        """
+        features = np.stack([embed_text(text, dim) for text, _ in examples])
+        labels = np.array([label for _, label in examples], dtype=np.float32)
+        positives = max(labels.sum(), 1.0)
+        negatives = max(len(labels) - labels.sum(), 1.0)
+        sample_weights = np.where(labels == 1, len(labels) / (2 * positives), len(labels) / (2 * negatives))
+
+        weights = np.zeros(dim, dtype=np.float32)
+        bias = 0.0
+        for _ in range(epochs):
+            predictions = 1.0 / (1.0 + np.exp(-(features @ weights + bias)))
+            error = (predictions - labels) * sample_weights
+            weights -= learning_rate * (features.T @ error / len(labels) + l2 * weights)
+            bias -= learning_rate * float(error.mean())
+        return cls(weights, bias)
+
+    def save(self, path: str):
+        """Write the model to a NumPy ``.npz`` file."""
+        np.savez(path, weights=self.weights, bias=np.array([self.bias], dtype=np.float32))
+        logger.info(f"Saved intent classifier to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "IntentClassifier":
+        """Read a model written by ``save``."""
+        with np.load(path) as data:
+            return cls(data["weights"], float(data["bias"][0]))
+
+def load_examples(path: str) -> List[Tuple[str, int]]:
+    """Read labeled examples from a JSONL file.
+
+    Args:
+        path: File with one ``{"text": ..., "label": "search" | "chat"}`` object per line
+
+    Returns:
+        (text, label) pairs, label 1 for search and 0 for chat
+    """
+    examples = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record["label"] not in (SEARCH_LABEL, CHAT_LABEL):
+                raise ValueError(f"Line {line_number}: unknown label {record['label']!r}")
+            examples.append((record["text"], 1 if record["label"] == SEARCH_LABEL else 0))
+    return examples
+
+# Loaded once per process, keyed by model path
+_classifiers: Dict[str, Optional[IntentClassifier]] = {}
+_classifiers_lock = threading.Lock()
+
+def get_intent_classifier(classifier_config: Dict[str, Any]) -> Optional[IntentClassifier]:
+    """Get the process-wide intent classifier, loading it on first use.
+
+    Args:
+        classifier_config: The ``intent_classifier`` section of the app configuration
+
+    Returns:
+        Shared IntentClassifier instance, or None if disabled or the model cannot be loaded
+    """
+    if not classifier_config["enabled"]:
+        return None
+    path = classifier_config["model_path"] or DEFAULT_MODEL_PATH
+    with _classifiers_lock:
+        if path not in _classifiers:
+            try:
+                logger.info(f"Loading intent classifier from {path}")
+                _classifiers[path] = IntentClassifier.load(path)
+            except (OSError, KeyError, ValueError) as e:
+                logger.error(f"Could not load intent classifier, using keyword routing: {str(e)}")
+                _classifiers[path] = None
+        return _classifiers[path]
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the search-vs-chat intent classifier from labeled JSONL.")
+    parser.add_argument("data", help="JSONL file with text and label (search or chat) per line")
+    parser.add_argument("--output", default=DEFAULT_MODEL_PATH, help="Where to write the model (.npz)")
+    parser.add_argument("--dim", type=int, default=2048)
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--learning-rate", type=float, default=2.0)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    examples = load_examples(args.data)
+    classifier = IntentClassifier.train(
+        examples, dim=args.dim, epochs=args.epochs, learning_rate=args.learning_rate, l2=args.l2
+    )
+    correct = sum((classifier.predict_proba(text) >= 0.5) == bool(label) for text, label in examples)
+    print(f"Trained on {len(examples)} examples, training accuracy {correct / len(examples):.3f}")
+    classifier.save(args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class JobQueueFullError(RuntimeError):
+    """Raised when the background executor has no room for another job."""
+
+class GenerationJob:
+    """A queued assistant turn whose output is filled in by a worker thread.
+
+    Worker threads only touch the job object; the Streamlit script thread
+    polls it and copies the result into session state.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, handle):
+        """Initialize a pending job.
+
+        Args:
+            handle: GenerationHandle used to cancel the job
+        """
+        self.id = uuid.uuid4().hex
+        self.handle = handle
+        self.status = self.PENDING
+        self.error: Optional[Exception] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._chunks: List[str] = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def append(self, text: str):
+        """Append generated text (called from the worker thread)."""
+        with self._lock:
+            self._chunks.append(text)
+
+    @property
+    def text(self) -> str:
+        """Text generated so far."""
+        with self._lock:
+            return "".join(self._chunks)
+
+    @property
+    def finished(self) -> bool:
+        """Whether the worker is done with the job."""
+        return self.status in (self.DONE, self.FAILED)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job is finished.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the job finished, False on timeout
+        """
+        return self._done.wait(timeout)
+
+class JobExecutor:
+    """Bounded thread pool running generation jobs off the script thread."""
+
+    def __init__(self, max_workers: int = 8, max_queued: int = 32, max_async: int = 256, retention: float = 600.0):
+        """Initialize the executor.
+
+        Args:
+            max_workers: Number of worker threads
+            max_queued: Maximum jobs waiting for a worker before submissions are rejected
+            max_async: Maximum unfinished jobs running on the event loop
+            retention: Seconds finished jobs are kept if nobody collects them
+        """
+        logger.info("Initializing background job executor")
+        logger.debug(f"Job executor: max_workers={max_workers}, max_queued={max_queued}")
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_async = max_async
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generation")
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._async_jobs = set()
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def submit(self, fn: Callable[[GenerationJob], None], handle) -> GenerationJob:
+        """Queue a job.
+
+        Args:
+            fn: Function producing the job's output; receives the job
+            handle: GenerationHandle used to cancel the job
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFullError: If too many jobs are already waiting
+        """
+        with self._lock:
+            self._purge()
+            unfinished = sum(1 for job in self._jobs.values() if not job.finished)
+            if unfinished >= self.max_workers + self.max_queued:
+                self.rejected += 1
+                logger.warning(f"Job queue full ({unfinished} unfinished jobs)")
+                raise JobQueueFullError("The assistant is very busy right now, please try again in a moment.")
+
+            job = GenerationJob(handle)
+            self._jobs[job.id] = job
+            self.submitted += 1
+
+        logger.info(f"Submitting background job {job.id}")
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def submit_async(self, start: Callable[[GenerationJob], Future], handle) -> GenerationJob:
+        """Track a job whose work runs on the asyncio event loop instead of a worker thread.
+
+        Args:
+            start: Function that schedules the job's work and returns its future
+            handle: GenerationHandle used to cancel the job
+
+        Returns:
+            The running job
+
+        Raises:
+            JobQueueFullError: If too many async jobs are unfinished
+        """
+        with self._lock:
+            self._purge()
+            if len(self._async_jobs) >= self.max_async:
+                self.rejected += 1
+                logger.warning(f"Async job limit reached ({len(self._async_jobs)} unfinished jobs)")
+                raise JobQueueFullError("The assistant is very busy right now, please try again in a moment.")
+
+            job = GenerationJob(handle)
+            job.status = GenerationJob.RUNNING
+            self._jobs[job.id] = job
+            self._async_jobs.add(job.id)
+            self.submitted += 1
+
+        logger.info(f"Submitting async job {job.id}")
+        try:
+            future = start(job)
+        except Exception as e:
+            self._complete(job, e)
+            raise
+        future.add_done_callback(lambda finished: self._complete(job, finished.exception()))
+        return job
+
+    def _complete(self, job: GenerationJob, error: Optional[BaseException]):
+        """Record the outcome of an async job."""
+        with self._lock:
+            self._async_jobs.discard(job.id)
+            if error is not None:
+                self.failed += 1
+        if error is not None:
+            logger.error(f"Async job {job.id} failed: {str(error)}")
+            job.error = error
+            job.status = GenerationJob.FAILED
+        else:
+            logger.info(f"Async job {job.id} finished")
+            job.status = GenerationJob.DONE
+        job.finished_at = time.time()
+        job._done.set()
+
+    def _run(self, job: GenerationJob, fn: Callable[[GenerationJob], None]):
+        """Run a job on a worker thread, recording its outcome."""
+        job.status = GenerationJob.RUNNING
+        try:
+            if not job.handle.cancelled:
+                fn(job)
+            job.status = GenerationJob.DONE
+            logger.info(f"Background job {job.id} finished")
+        except Exception as e:
+            logger.error(f"Background job {job.id} failed: {str(e)}", exc_info=True)
+            job.error = e
+            job.status = GenerationJob.FAILED
+            with self._lock:
+                self.failed += 1
+        finally:
+            job.finished_at = time.time()
+            job._done.set()
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        """Look up a job by ID."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pop(self, job_id: str) -> Optional[GenerationJob]:
+        """Remove a job once its result has been collected."""
+        with self._lock:
+            return self._jobs.pop(job_id, None)
+
+    def _purge(self):
+        """Drop finished jobs nobody collected within the retention period (lock held)."""
+        cutoff = time.time() - self.retention
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]:
+            del self._jobs[job_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics.
+
+        Returns:
+            Dictionary with queue depth and job counters
+        """
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+            return {
+                "max_workers": self.max_workers,
+                "running": statuses.count(GenerationJob.RUNNING),
+                "running_async": len(self._async_jobs),
+                "queued": statuses.count(GenerationJob.PENDING),
+                "uncollected": sum(1 for status in statuses if status in (GenerationJob.DONE, GenerationJob.FAILED)),
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "failed": self.failed
+            }
+
+# Shared by every session in the process
+_job_executor: Optional[JobExecutor] = None
+_job_executor_lock = threading.Lock()
+
+def get_job_executor(job_config: Dict[str, Any]) -> JobExecutor:
+    """Get the process-wide job executor, creating it on first use.
+
+    Args:
+        job_config: The ``jobs`` section of the app configuration
+
+    Returns:
+        Shared JobExecutor instance
+    """
+    global _job_executor
+    with _job_executor_lock:
+        if _job_executor is None:
+            _job_executor = JobExecutor(
+                max_workers=job_config["max_workers"],
+                max_queued=job_config["max_queued"],
+                max_async=job_config["max_async"]
+            )
+        return _job_executor
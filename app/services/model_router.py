@@ -0,0 +1,184 @@
+import bisect
+import re
+import threading
+from typing import List, Dict, Any, Optional
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+AUTO_MODEL = "auto"
+
+_GREETING_RE = re.compile(
+    r"^(hi|hello|hey|thanks|thank you|ok|okay|good (morning|afternoon|evening)|bye|goodbye)\W*$",
+    re.IGNORECASE
+)
+_REASONING_RE = re.compile(
+    r"\b(why|explain|compare|analy[sz]e|reason|prove|derive|design|plan|evaluate|"
+    r"step[- ]by[- ]step|trade-?offs?|pros and cons|implement|debug|refactor)\b",
+    re.IGNORECASE
+)
+_CODE_RE = re.compile(r"```|\bdef |\bclass |\bfunction\b|\bSELECT\b|[{};]\s*$", re.MULTILINE)
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in seconds."""
+
+    BUCKETS = (0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds: float):
+        """Add a latency sample."""
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket containing it.
+
+        Returns:
+            Latency bound in seconds (inf for the overflow bucket), or None if empty
+        """
+        if not self.count:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for idx, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return self.BUCKETS[idx] if idx < len(self.BUCKETS) else float("inf")
+        return float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the histogram for display."""
+        labels = [f"<={bound}s" for bound in self.BUCKETS] + [f">{self.BUCKETS[-1]}s"]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+# Per-model latency histograms shared by every session in the process
+_histograms: Dict[str, LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+def record_model_latency(model: str, seconds: float):
+    """Record the latency of a completed generation.
+
+    Args:
+        model: OpenAI model that produced the response
+        seconds: End-to-end generation latency
+    """
+    with _histograms_lock:
+        _histograms.setdefault(model, LatencyHistogram()).record(seconds)
+
+def get_latency_histograms() -> Dict[str, Any]:
+    """Get the latency histograms of every model used so far.
+
+    Returns:
+        Dictionary keyed by model
+    """
+    with _histograms_lock:
+        return {model: histogram.to_dict() for model, histogram in _histograms.items()}
+
+def _get_p50(model: str) -> Optional[float]:
+    """Get a model's median latency, or None if it has no samples."""
+    with _histograms_lock:
+        histogram = _histograms.get(model)
+        return histogram.quantile(0.5) if histogram is not None else None
+
+def score_complexity(text: str, history_depth: int = 0) -> float:
+    """Estimate how demanding a prompt is, locally and without network calls.
+
+    Args:
+        text: User's input text
+        history_depth: Number of earlier messages in the conversation
+
+    Returns:
+        Score between 0 (trivial) and 1 (complex)
+    """
+    stripped = text.strip()
+    if _GREETING_RE.match(stripped):
+        return 0.0
+
+    score = min(len(stripped.split()) / 150, 0.4)
+    if _REASONING_RE.search(stripped):
+        score += 0.35
+    if _CODE_RE.search(stripped):
+        score += 0.3
+    if stripped.count("?") > 1:
+        score += 0.1
+    score += min(history_depth / 40, 0.2)
+    return min(score, 1.0)
+
+class ModelRouter:
+    """Routes each prompt to the fastest model that is adequate for it.
+
+    Prompts scoring at or above ``complexity_threshold`` are only adequate
+    for the strong model. Simpler prompts may use either model, and the one
+    with the lower observed median latency is picked (the fast model until
+    there is data).
+    """
+
+    def __init__(self, fast_model: str, strong_model: str, complexity_threshold: float = 0.35):
+        """Initialize the router.
+
+        Args:
+            fast_model: Cheaper, lower-latency model
+            strong_model: More capable model for complex prompts
+            complexity_threshold: Score from which only the strong model is adequate
+        """
+        self.fast_model = fast_model
+        self.strong_model = strong_model
+        self.complexity_threshold = complexity_threshold
+
+    def choose_model(self, text: str, history_depth: int = 0) -> str:
+        """Pick a model for a prompt.
+
+        Args:
+            text: User's input text
+            history_depth: Number of earlier messages in the conversation
+
+        Returns:
+            Model name
+        """
+        score = score_complexity(text, history_depth)
+        if score >= self.complexity_threshold:
+            candidates = [self.strong_model]
+        else:
+            candidates = [self.fast_model, self.strong_model]
+
+        latencies = [_get_p50(candidate) for candidate in candidates]
+        if None in latencies:
+            # Not enough data to compare, prefer the first adequate model
+            model = candidates[0]
+        else:
+            model = candidates[latencies.index(min(latencies))]
+        logger.info(f"Routed prompt with complexity {score:.2f} to {model}")
+        return model
+
+def resolve_model(selected_model: str, text: str, history: List[Dict[str, Any]], router_config: Dict[str, Any]) -> str:
+    """Resolve the model selected in the sidebar to an actual OpenAI model.
+
+    Args:
+        selected_model: Model from session state (a model name or "auto")
+        text: User's input text
+        history: Conversation history before this input
+        router_config: The ``router`` section of the app configuration
+
+    Returns:
+        Model name to use for this turn
+    """
+    if selected_model != AUTO_MODEL:
+        return selected_model
+    router = ModelRouter(
+        router_config["fast_model"],
+        router_config["strong_model"],
+        complexity_threshold=router_config["complexity_threshold"]
+    )
+    return router.choose_model(text, history_depth=len(history))
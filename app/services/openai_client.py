@@ -0,0 +1,173 @@
+import threading
+from typing import Dict, Any, Optional, Tuple
+import httpx
+from openai import AsyncOpenAI, OpenAI
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Shared clients live at module level so they survive Streamlit reruns and are
+# reused by every session in the process.
+_clients: Dict[Tuple[str, Optional[str]], OpenAI] = {}
+_stats: Dict[Tuple[str, Optional[str]], Dict[str, int]] = {}
+_async_clients: Dict[Tuple[str, Optional[str]], AsyncOpenAI] = {}
+_async_stats: Dict[Tuple[str, Optional[str]], Dict[str, int]] = {}
+_lock = threading.Lock()
+
+def get_openai_client(
+    api_key: str,
+    base_url: Optional[str] = None,
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    keepalive_expiry: float = 60.0
+) -> OpenAI:
+    """Get the shared OpenAI client for an API key and base URL.
+
+    The client is created on first use and reused afterwards, so the HTTP
+    connection pool (and its TLS sessions) is kept alive across turns.
+    Pool limits only apply when the client is first created.
+
+    Args:
+        api_key: OpenAI API key
+        base_url: Optional custom API base URL
+        max_connections: Maximum number of concurrent connections
+        max_keepalive_connections: Maximum number of idle connections kept open
+        keepalive_expiry: Seconds an idle connection is kept open
+
+    Returns:
+        Shared OpenAI client instance
+    """
+    key = (api_key, base_url)
+    with _lock:
+        client = _clients.get(key)
+        if client is not None:
+            _stats[key]["reuses"] += 1
+            logger.debug("Reusing pooled OpenAI client")
+            return client
+
+        logger.info("Creating pooled OpenAI client")
+        logger.debug(
+            f"Pool limits: max_connections={max_connections}, "
+            f"max_keepalive_connections={max_keepalive_connections}, "
+            f"keepalive_expiry={keepalive_expiry}"
+        )
+        stats = {"reuses": 0, "requests": 0}
+
+        def _count_request(request: httpx.Request) -> None:
+            stats["requests"] += 1
+
+        http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            event_hooks={"request": [_count_request]}
+        )
+        client = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+        _clients[key] = client
+        _stats[key] = stats
+        return client
+
+def get_async_openai_client(
+    api_key: str,
+    base_url: Optional[str] = None,
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    keepalive_expiry: float = 60.0
+) -> AsyncOpenAI:
+    """Get the shared AsyncOpenAI client for an API key and base URL.
+
+    Async clients must only be used from the shared event loop thread
+    (see async_openai_service). Pool limits only apply when the client is
+    first created.
+
+    Args:
+        api_key: OpenAI API key
+        base_url: Optional custom API base URL
+        max_connections: Maximum number of concurrent connections
+        max_keepalive_connections: Maximum number of idle connections kept open
+        keepalive_expiry: Seconds an idle connection is kept open
+
+    Returns:
+        Shared AsyncOpenAI client instance
+    """
+    key = (api_key, base_url)
+    with _lock:
+        client = _async_clients.get(key)
+        if client is not None:
+            _async_stats[key]["reuses"] += 1
+            return client
+
+        logger.info("Creating pooled AsyncOpenAI client")
+        stats = {"reuses": 0, "requests": 0}
+
+        async def _count_request(request: httpx.Request) -> None:
+            stats["requests"] += 1
+
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            event_hooks={"request": [_count_request]}
+        )
+        client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+        _async_clients[key] = client
+        _async_stats[key] = stats
+        return client
+
+def _describe_pools(clients: Dict[Tuple[str, Optional[str]], Any], stats_by_key: Dict, label: str) -> Dict[str, Any]:
+    """Build pool statistics for a client registry (lock held)."""
+    pool_stats = {}
+    for idx, (key, client) in enumerate(clients.items(), 1):
+        stats = dict(stats_by_key[key])
+        base_url = key[1]
+
+        # httpx does not expose its pool publicly; read it defensively
+        pool = getattr(getattr(client._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            stats["open_connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for conn in connections if conn.is_idle())
+
+        pool_stats[f"{label} {idx} ({base_url or 'default'})"] = stats
+    return pool_stats
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Get connection pool statistics for every pooled OpenAI and AsyncOpenAI client.
+
+    Returns:
+        Dictionary keyed by base URL (API keys are never included) with
+        reuse, request and connection counts
+    """
+    with _lock:
+        return {
+            **_describe_pools(_clients, _stats, "client"),
+            **_describe_pools(_async_clients, _async_stats, "async client")
+        }
+
+def close_clients() -> None:
+    """Close every pooled synchronous OpenAI client and forget it."""
+    logger.info("Closing pooled OpenAI clients")
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        _stats.clear()
+
+def close_client(api_key: str, base_url: Optional[str] = None) -> None:
+    """Close the pooled synchronous OpenAI client for an API key and base URL, if any.
+
+    Args:
+        api_key: OpenAI API key
+        base_url: Optional custom API base URL
+    """
+    key = (api_key, base_url)
+    with _lock:
+        client = _clients.pop(key, None)
+        _stats.pop(key, None)
+    if client is not None:
+        logger.info("Closing pooled OpenAI client")
+        client.close()
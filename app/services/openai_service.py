@@ -1,33 +1,202 @@
 import logging
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+import time
+import uuid
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Callable, TypeVar
 import streamlit as st
+from app.services.openai_client import get_openai_client
+from app.services.generation_profiles import (
+    ROUTE_CHAT,
+    ROUTE_SHORT,
+    resolve_generation_params
+)
+from app.services.intent_classifier import get_intent_classifier
+from app.services.job_queue import GenerationJob, JobQueueFullError, get_job_executor
+from app.services.model_router import record_model_latency, resolve_model, score_complexity
+from app.services.response_cache import ResponseCache, get_response_cache, make_cache_key
+from app.services.search_intent import SEARCH_INTENT_THRESHOLD, score_search_intent
+from app.services.search_cache import get_search_cache
+from app.services.search_submitter import SearchSubmission, SearchSubmitter, get_search_submitter
+from app.services.semantic_cache import SemanticCache, get_semantic_cache
+from app.services.service_container import get_service_container
+from app.services.singleflight import SingleFlight, get_singleflight
+from app.services.rate_limiter import RateLimiter, get_rate_limiter
+from app.services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HedgedAttempt,
+    Hedger,
+    call_with_retry,
+    get_circuit_breaker,
+    get_hedger,
+    is_retryable_error
+)
+from app.services.summary_service import ConversationSummarizer
+from app.services.usage_tracker import UsageTracker, get_usage_tracker
+from app.services.websocket_client import apply_search_results
 from app.utils.logger import get_logger
-from app.utils.session import get_messages_for_openai, add_message
+from app.utils.session import (
+    GenerationHandle,
+    add_message,
+    finish_generation,
+    get_messages_for_openai,
+    get_prompt_history,
+    remember_search_query,
+    start_generation
+)
 from app.utils.config import get_config
+from app.utils.tokens import count_prompt_tokens, count_tokens
 
 logger = get_logger(__name__)
 
+# Request timeout (seconds) and retry backoff used when none is configured
+DEFAULT_RETRY_CONFIG = {
+    "timeout": 60.0,
+    "max_retries": 2,
+    "base_delay": 0.5,
+    "max_delay": 8.0
+}
+
+# Reply shown while a semantic search is being processed
+SEARCHING_MESSAGE = "Searching for relevant information..."
+
+T = TypeVar("T")
+
 class OpenAIService:
     """Service for interacting with OpenAI API."""
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        pool_config: Optional[Dict[str, Any]] = None,
+        cache: Optional[ResponseCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        singleflight: Optional[SingleFlight] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        session_id: str = "default",
+        retry_config: Optional[Dict[str, Any]] = None,
+        hedger: Optional[Hedger] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        generation_config: Optional[Dict[str, Any]] = None,
+        usage_tracker: Optional[UsageTracker] = None
+    ):
         """Initialize OpenAI service.
         
+        The underlying client is shared process-wide per API key and base URL,
+        so constructing a service per turn does not open new connections.
+        
         Args:
             api_key: OpenAI API key
+            base_url: Optional custom API base URL
+            pool_config: Optional connection pool limits passed to get_openai_client
+            cache: Optional response cache consulted before calling the API
+            semantic_cache: Optional similarity cache consulted after an exact miss
+            singleflight: Optional coalescer sharing identical in-flight requests
+            rate_limiter: Optional limiter every upstream request must pass
+            session_id: Session the requests belong to, used for fair queuing
+            retry_config: Optional timeout and retry settings (see DEFAULT_RETRY_CONFIG)
+            hedger: Optional hedger sending backup requests for slow attempts
+            circuit_breaker: Optional breaker failing fast while OpenAI is unhealthy
+            generation_config: Optional per-model and per-route generation profiles
+            usage_tracker: Optional tracker recording tokens and latency per request
         """
         logger.info("Initializing OpenAI service")
         self.api_key = api_key
-        self.client = OpenAI(api_key=api_key)
+        # Retries are handled by call_with_retry, not inside the client
+        self.client = get_openai_client(
+            api_key, base_url=base_url, **(pool_config or {})
+        ).with_options(max_retries=0)
+        self.cache = cache
+        self.semantic_cache = semantic_cache
+        self.singleflight = singleflight
+        self.rate_limiter = rate_limiter
+        self.session_id = session_id
+        self.retry_config = {**DEFAULT_RETRY_CONFIG, **(retry_config or {})}
+        self.hedger = hedger
+        self.circuit_breaker = circuit_breaker
+        self.generation_config = generation_config
+        self.usage_tracker = usage_tracker
         logger.debug("OpenAI API key configured")
     
-    def generate_response(self, messages: List[Dict[str, str]], model: str = "gpt-4") -> str:
+    def _get_cached(self, model: str, params: Dict[str, Any], messages: List[Dict[str, str]]) -> Optional[str]:
+        """Look up a response in the exact cache, then the semantic cache."""
+        if self.cache is not None:
+            cached = self.cache.get(make_cache_key(model, params, messages))
+            if cached is not None:
+                logger.info("Returning cached OpenAI response")
+                return cached
+        
+        semantic_query = _get_semantic_query(model, params, messages)
+        if self.semantic_cache is not None and semantic_query is not None:
+            cached = self.semantic_cache.get(*semantic_query)
+            if cached is not None:
+                logger.info("Returning semantically cached OpenAI response")
+                return cached
+        return None
+    
+    def _store_cached(self, model: str, params: Dict[str, Any], messages: List[Dict[str, str]], response: str):
+        """Store a response in every configured cache."""
+        if self.cache is not None:
+            self.cache.put(make_cache_key(model, params, messages), response)
+        
+        semantic_query = _get_semantic_query(model, params, messages)
+        if self.semantic_cache is not None and semantic_query is not None:
+            self.semantic_cache.put(*semantic_query, response)
+    
+    def _wait_for_capacity(self, model: str, params: Dict[str, Any], messages: List[Dict[str, str]]):
+        """Block until the rate limiter admits a request of this size."""
+        if self.rate_limiter is None:
+            return
+        tokens = params["max_tokens"] + count_prompt_tokens(messages, model)
+        self.rate_limiter.acquire(model, tokens, session_id=self.session_id)
+    
+    def _get_params(self, model: str, route: str, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Resolve the generation parameters for a request."""
+        return resolve_generation_params(model, route, messages, self.generation_config)
+    
+    def _record_usage(
+        self,
+        model: str,
+        route: str,
+        usage: Dict[str, Any],
+        start: float,
+        first_token_at: Optional[float] = None,
+        cache_hit: bool = False,
+        cancelled: bool = False
+    ):
+        """Record a request's usage, filled in by the upstream call (if this caller made one).
+        
+        Only generations this caller completed against OpenAI feed the model
+        latency histograms; cache hits, coalesced followers and cancelled
+        requests would drag the median the model router relies on down.
+        """
+        latency = time.monotonic() - start
+        if usage.get("upstream") and not cache_hit and not cancelled:
+            record_model_latency(model, latency)
+        if self.usage_tracker is None:
+            return
+        self.usage_tracker.record(
+            self.session_id,
+            model,
+            route,
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            cached_tokens=usage.get("cached_tokens", 0),
+            time_to_first_token=first_token_at - start if first_token_at is not None else None,
+            latency=latency,
+            cache_hit=cache_hit,
+            coalesced=not cache_hit and not usage.get("upstream"),
+            cancelled=cancelled,
+            estimated=usage.get("estimated", False)
+        )
+    
+    def generate_response(self, messages: List[Dict[str, str]], model: str = "gpt-4", route: str = ROUTE_CHAT) -> str:
         """Generate a response using OpenAI API.
         
         Args:
             messages: List of message dictionaries with role and content
             model: OpenAI model to use
+            route: Request route selecting the generation profile
             
         Returns:
             Generated response text
@@ -36,33 +205,284 @@ class OpenAIService:
             logger.info(f"Generating response with OpenAI model: {model}")
             logger.debug(f"Using {len(messages)} messages as context")
             
-            logger.debug("Sending request to OpenAI API")
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1000,
-                top_p=1.0,
-                frequency_penalty=0.0,
-                presence_penalty=0.0
-            )
-            
-            response_text = response.choices[0].message.content.strip()
-            logger.info("Successfully received response from OpenAI")
-            logger.debug(f"Response preview: {response_text[:50]}{'...' if len(response_text) > 50 else ''}")
+            start = time.monotonic()
+            usage: Dict[str, Any] = {}
+            params = self._get_params(model, route, messages)
+            cached = self._get_cached(model, params, messages)
+            if cached is not None:
+                self._record_usage(model, route, usage, start, cache_hit=True)
+                return cached
             
+            if self.singleflight is not None:
+                key = make_cache_key(model, params, messages)
+                response_text = self.singleflight.do(key, lambda: self._complete(model, params, messages, usage))
+            else:
+                response_text = self._complete(model, params, messages, usage)
+            self._record_usage(model, route, usage, start)
             return response_text
             
         except Exception as e:
             logger.error(f"Error generating OpenAI response: {str(e)}", exc_info=True)
             raise
+    
+    def _complete(
+        self,
+        model: str,
+        params: Dict[str, Any],
+        messages: List[Dict[str, str]],
+        usage: Dict[str, Any]
+    ) -> str:
+        """Call the completions API, cache the response and fill in ``usage``."""
+        usage["upstream"] = True
+        
+        def attempt():
+            # Every attempt, retries included, draws on the rate limit
+            self._wait_for_capacity(model, params, messages)
+            logger.debug("Sending request to OpenAI API")
+            return self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                timeout=self.retry_config["timeout"],
+                **params
+            )
+        
+        # A blocking completion cannot be aborted once sent, so it is never hedged
+        response = self._call_with_resilience(model, attempt, hedge=False)
+        
+        response_text = response.choices[0].message.content.strip()
+        _read_usage(usage, response.usage, model, messages, response_text)
+        logger.info("Successfully received response from OpenAI")
+        logger.debug(f"Response preview: {response_text[:50]}{'...' if len(response_text) > 50 else ''}")
+        
+        self._store_cached(model, params, messages, response_text)
+        return response_text
+    
+    def _call_with_resilience(
+        self,
+        key: str,
+        attempt: Callable[..., T],
+        discard: Optional[Callable[[T], None]] = None,
+        hedge: bool = True
+    ) -> T:
+        """Run one upstream attempt with hedging (if enabled), bounded retries and the circuit breaker.
+        
+        Hedged attempts receive a HedgedAttempt to register how to abort
+        themselves; unhedged ones are called without arguments.
+        """
+        if self.hedger is not None and hedge:
+            hedged_attempt = lambda: self.hedger.call(key, attempt, discard=discard)
+        else:
+            hedged_attempt = attempt
+        retried_attempt = lambda: call_with_retry(
+            hedged_attempt,
+            max_retries=self.retry_config["max_retries"],
+            base_delay=self.retry_config["base_delay"],
+            max_delay=self.retry_config["max_delay"]
+        )
+        if self.circuit_breaker is not None:
+            # Only transient upstream failures count against the breaker
+            return self.circuit_breaker.call(retried_attempt, is_failure=is_retryable_error)
+        return retried_attempt()
+    
+    def generate_response_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-4",
+        route: str = ROUTE_CHAT
+    ) -> Iterator[str]:
+        """Generate a response using OpenAI API, yielding content deltas as they arrive.
+        
+        Closing the generator early closes the underlying HTTP stream, so an
+        abandoned generation stops consuming tokens. Only complete responses
+        are written to the cache.
+        
+        Args:
+            messages: List of message dictionaries with role and content
+            model: OpenAI model to use
+            route: Request route selecting the generation profile
+            
+        Yields:
+            Response text deltas in arrival order
+        """
+        logger.info(f"Streaming response with OpenAI model: {model}")
+        logger.debug(f"Using {len(messages)} messages as context")
+        
+        start = time.monotonic()
+        usage: Dict[str, Any] = {}
+        params = self._get_params(model, route, messages)
+        cached = self._get_cached(model, params, messages)
+        if cached is not None:
+            self._record_usage(model, route, usage, start, cache_hit=True)
+            yield cached
+            return
+        
+        if self.singleflight is not None:
+            key = make_cache_key(model, params, messages)
+            source = self.singleflight.do_stream(key, lambda: self._stream(model, params, messages, usage))
+        else:
+            source = self._stream(model, params, messages, usage)
+        
+        first_token_at = None
+        received = []
+        try:
+            for delta in source:
+                if first_token_at is None:
+                    first_token_at = time.monotonic()
+                received.append(delta)
+                yield delta
+        except GeneratorExit:
+            # Close upstream first so the usage of the partial response is filled in
+            source.close()
+            if "completion_tokens" not in usage:
+                # A shared stream keeps running for its other readers, so estimate what this one used
+                usage = dict(usage)
+                _read_usage(usage, None, model, messages, "".join(received))
+            self._record_usage(model, route, usage, start, first_token_at=first_token_at, cancelled=True)
+            raise
+        finally:
+            source.close()
+        self._record_usage(model, route, usage, start, first_token_at=first_token_at)
+    
+    def _stream(
+        self,
+        model: str,
+        params: Dict[str, Any],
+        messages: List[Dict[str, str]],
+        usage: Dict[str, Any]
+    ) -> Iterator[str]:
+        """Call the completions API in streaming mode, cache the full response and fill in ``usage``.
+        
+        Retries and hedging apply until the first delta arrives; once output
+        has been yielded the stream is not retried.
+        """
+        usage["upstream"] = True
+        
+        def open_stream(hedged: Optional[HedgedAttempt] = None):
+            # Every attempt, retries and hedges included, draws on the rate limit
+            self._wait_for_capacity(model, params, messages)
+            logger.debug("Sending streaming request to OpenAI API")
+            stream = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=self.retry_config["timeout"],
+                **params
+            )
+            if hedged is not None:
+                # Closing the response aborts the wait for the first token if the other attempt wins
+                hedged.on_abandon(stream.close)
+            deltas = _iter_deltas(stream, usage)
+            try:
+                first = next(deltas, None)
+            except Exception:
+                stream.close()
+                raise
+            return stream, deltas, first
+        
+        stream, deltas, first = self._call_with_resilience(
+            f"{model}:first_token",
+            open_stream,
+            discard=lambda opened: opened[0].close()
+        )
+        
+        chunks = []
+        try:
+            if first is not None:
+                chunks.append(first)
+                yield first
+            for delta in deltas:
+                chunks.append(delta)
+                yield delta
+            logger.info("OpenAI stream finished")
+            
+            self._store_cached(model, params, messages, "".join(chunks).strip())
+        finally:
+            logger.debug("Closing OpenAI stream")
+            stream.close()
+            if "completion_tokens" not in usage:
+                # Abandoned streams never receive the final usage chunk
+                _read_usage(usage, None, model, messages, "".join(chunks))
+
+def _read_usage(usage: Dict[str, Any], reported, model: str, messages: List[Dict[str, str]], response_text: str):
+    """Fill ``usage`` from a usage payload, estimating the counts locally if none was reported."""
+    if reported is not None:
+        usage["prompt_tokens"] = reported.prompt_tokens
+        usage["completion_tokens"] = reported.completion_tokens
+        details = getattr(reported, "prompt_tokens_details", None)
+        usage["cached_tokens"] = (getattr(details, "cached_tokens", None) or 0) if details is not None else 0
+        if usage["cached_tokens"]:
+            logger.debug(f"Provider reused {usage['cached_tokens']} cached prompt tokens")
+    else:
+        usage["prompt_tokens"] = count_prompt_tokens(messages, model)
+        usage["completion_tokens"] = count_tokens(response_text, model)
+        usage["estimated"] = True
+
+def _iter_deltas(stream, usage: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """Yield the non-empty content deltas of a completion stream, filling in ``usage`` if reported."""
+    for chunk in stream:
+        if usage is not None and getattr(chunk, "usage", None) is not None:
+            _read_usage(usage, chunk.usage, "", [], "")
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
 
-def process_user_input(user_input: str, search_service) -> str:
+def _get_semantic_query(model: str, params: Dict[str, Any], messages: List[Dict[str, str]]) -> Optional[Tuple[str, str]]:
+    """Get the (scope, text) semantic cache query for a request.
+    
+    Only opening questions are eligible: once a conversation has history,
+    a similarity match could return an answer written for another context.
+    
+    Returns:
+        Tuple of scope key and prompt text, or None if not eligible
+    """
+    system_messages = [msg for msg in messages if msg["role"] == "system"]
+    conversation = [msg for msg in messages if msg["role"] != "system"]
+    if len(conversation) != 1 or conversation[0]["role"] != "user":
+        return None
+    return make_cache_key(model, params, system_messages), conversation[0]["content"]
+
+def create_openai_service() -> OpenAIService:
+    """Get the session's OpenAI service for the current configuration.
+    
+    The service is built once per session and configuration by the
+    service container and reused across reruns.
+    
+    Returns:
+        OpenAIService using the pooled client and shared response caches
+    """
+    config = get_config()
+    return get_service_container(config).get_session_service(
+        "openai_service", st.session_state.session_id, lambda: _build_openai_service(config)
+    )
+
+def _build_openai_service(config: Dict[str, Any]) -> OpenAIService:
+    """Build an OpenAI service for the current session from a configuration."""
+    return OpenAIService(
+        config["openai"]["api_key"],
+        base_url=config["openai"]["base_url"],
+        pool_config=config["openai"]["pool"],
+        cache=get_response_cache(config["response_cache"]),
+        semantic_cache=get_semantic_cache(config["semantic_cache"]),
+        singleflight=get_singleflight() if config["openai"]["coalesce_requests"] else None,
+        rate_limiter=get_rate_limiter(config["openai"]["rate_limits"]),
+        session_id=st.session_state.session_id,
+        retry_config=config["openai"]["retry"],
+        hedger=get_hedger(config["openai"]["retry"]),
+        circuit_breaker=get_circuit_breaker("OpenAI", config["circuit_breaker"]),
+        generation_config=config["openai"]["generation"],
+        usage_tracker=get_usage_tracker(config["usage"])
+    )
+
+def process_user_input(user_input: str, search_service, search_score: Optional[float] = None) -> str:
     """Process user input and determine whether to use OpenAI or semantic search.
     
     Args:
         user_input: User's input text
         search_service: Service for semantic search
+        search_score: The turn's get_search_score result, if already computed
         
     Returns:
         Assistant's response
@@ -70,68 +490,615 @@ def process_user_input(user_input: str, search_service) -> str:
     logger.info("Processing user input")
     logger.debug(f"User input: {user_input[:50]}{'...' if len(user_input) > 50 else ''}")
     
+    # Cancel the previous turn's generation if it is still running
+    handle = start_generation()
+    # A superseded background job's partial output precedes this turn
+    collect_pending_job()
+    try:
+        return _answer_user_input(user_input, search_service, handle, search_score)
+    finally:
+        # Every path, including cached and accepted searches, ends the turn
+        finish_generation(handle)
+
+def _answer_user_input(
+    user_input: str,
+    search_service,
+    handle: GenerationHandle,
+    search_score: Optional[float] = None
+) -> str:
+    """Route a turn to semantic search, speculation or OpenAI and return the response.
+    
+    Args:
+        user_input: User's input text
+        search_service: Service for semantic search
+        handle: Generation handle of the current turn
+        search_score: The turn's get_search_score result, if already computed
+        
+    Returns:
+        Assistant's response
+    """
     # Add user message to history
     logger.debug("Adding user message to conversation history")
     add_message("user", user_input)
     
     # Determine if the input requires semantic search
-    use_search = should_use_semantic_search(user_input)
+    if search_score is None:
+        search_score = get_search_score(user_input)
+    use_search = search_score >= SEARCH_INTENT_THRESHOLD
     logger.info(f"Decision: {'Use semantic search' if use_search else 'Use OpenAI directly'}")
     
+    speculate = _in_speculative_band(search_score)
+    
+    if use_search or speculate:
+        search_cache = get_search_cache(get_config()["search_cache"])
+        conversation_id = st.session_state.conversation_id or "new_conversation"
+        cached_results = search_cache.get(user_input, conversation_id) if search_cache is not None else None
+        if cached_results is not None:
+            logger.info("Showing cached search results, skipping the search request")
+            return apply_search_results({"search_results": cached_results}, from_cache=True)
+    
+    if speculate:
+        return _process_speculatively(user_input, search_service, handle)
+    
     if use_search:
         # Trigger semantic search
         logger.info("Triggering semantic search")
-        search_service.perform_search(user_input)
-        return "Searching for relevant information..."
+        submitter = get_search_submitter(get_config()["aws"]["submit"])
+        if submitter is not None:
+            try:
+                return _submit_search(user_input, search_service, submitter)
+            except JobQueueFullError as e:
+                logger.warning(f"Could not queue search, sending it synchronously: {str(e)}")
+        request_id = uuid.uuid4().hex
+        remember_search_query(request_id, user_input)
+        try:
+            search_service.perform_search(user_input, request_id=request_id)
+        except CircuitOpenError as e:
+            logger.warning(f"Semantic search skipped: {str(e)}")
+            add_message("assistant", str(e), status=True)
+            return str(e)
+        return SEARCHING_MESSAGE
     else:
         # Use OpenAI for direct response
+        return _generate_answer(user_input, handle)
+
+def _generate_answer(user_input: str, handle: GenerationHandle) -> str:
+    """Generate the OpenAI answer to a turn on the script thread and add it to the history.
+    
+    Args:
+        user_input: User's input text (already added to the history)
+        handle: Generation handle of the current turn
+        
+    Returns:
+        Assistant's response
+    """
+    try:
+        model = get_turn_model(user_input)
+        route = get_turn_route(user_input)
+        
+        logger.info("Getting conversation history for OpenAI")
+        messages = get_messages_for_openai(model)
+        
+        logger.info("Initializing OpenAI service")
+        openai_service = create_openai_service()
+        
+        logger.info(f"Generating response with model: {model}")
+        response = openai_service.generate_response(
+            messages, 
+            model=model,
+            route=route
+        )
+        
+        if handle.cancelled:
+            # Blocking responses cannot be cut short, so the complete text is the "partial"
+            _store_partial_response(handle, response)
+            return response
+        
+        # Add assistant response to history
+        logger.info("Adding assistant response to conversation history")
+        add_message("assistant", response)
+        schedule_summary()
+        
+        return response
+        
+    except CircuitOpenError as e:
+        logger.warning(f"OpenAI call skipped: {str(e)}")
+        add_message("assistant", str(e), status=True)
+        return str(e)
+    except Exception as e:
+        logger.error(f"Error processing user input: {str(e)}", exc_info=True)
+        return f"Error: {str(e)}"
+
+def _submit_search(user_input: str, search_service, submitter: SearchSubmitter) -> str:
+    """Queue the search POST and add a placeholder message tied to its request ID.
+    
+    Args:
+        user_input: User's input text
+        search_service: Service for semantic search
+        submitter: Background search submitter
+        
+    Returns:
+        Placeholder text
+        
+    Raises:
+        JobQueueFullError: If the submitter has no room for another search
+    """
+    conversation_id = st.session_state.conversation_id or "new_conversation"
+    submission = submitter.submit(search_service, user_input, conversation_id)
+    remember_search_query(submission.id, user_input)
+    add_message("assistant", SEARCHING_MESSAGE, search_query=user_input, search_request_id=submission.id)
+    st.session_state.pending_search_ids = st.session_state.get("pending_search_ids", []) + [submission.id]
+    return SEARCHING_MESSAGE
+
+def collect_search_submissions() -> bool:
+    """Record the outcome of the session's finished background search submissions.
+    
+    Returns:
+        True if any submission finished since the last call
+    """
+    pending = st.session_state.get("pending_search_ids") or []
+    if not pending:
+        return False
+    submitter = get_search_submitter(get_config()["aws"]["submit"])
+    placeholders = {
+        message["search_request_id"]: message for message in st.session_state.messages
+        if message.get("search_request_id") in pending
+    }
+    
+    still_pending = []
+    for submission_id in pending:
+        submission = submitter.get(submission_id) if submitter is not None else None
+        if submission is not None and not submission.finished:
+            still_pending.append(submission_id)
+            continue
+        if submitter is not None:
+            submitter.pop(submission_id)
+        
+        placeholder = placeholders.get(submission_id)
+        if placeholder is None:
+            continue
+        if submission is None:
+            logger.warning(f"Search submission {submission_id} no longer exists")
+            placeholder["search_status"] = SearchSubmission.FAILED
+            placeholder["search_error"] = "The search request was lost. Please try again."
+            continue
+        
+        logger.info(f"Collecting search submission {submission_id} ({submission.status})")
+        placeholder["search_status"] = submission.status
+        if submission.error:
+            placeholder["search_error"] = submission.error
+        if submission.new_conversation_id and not st.session_state.conversation_id:
+            logger.info(f"Extracted new conversation ID: {submission.new_conversation_id}")
+            st.session_state.conversation_id = submission.new_conversation_id
+    
+    st.session_state.pending_search_ids = still_pending
+    return len(still_pending) < len(pending)
+
+def _process_speculatively(user_input: str, search_service, handle: GenerationHandle) -> str:
+    """Run the OpenAI answer and the semantic search in parallel for an ambiguous input.
+    
+    The answer is generated on a background worker while the search request
+    is sent from the script thread. If the search backend accepts the
+    request, the search path is confirmed and the generation is cancelled;
+    otherwise (rejected, failed or circuit open) the answer that is already
+    under way is kept, without paying for the search round trip first. If
+    no worker was free for the answer and the search is not accepted
+    either, the answer is generated on the script thread.
+    
+    Args:
+        user_input: User's input text (already added to the history)
+        search_service: Service for semantic search
+        handle: Generation handle of the current turn
+        
+    Returns:
+        Assistant's response
+    """
+    logger.info("Ambiguous input, starting OpenAI answer and semantic search in parallel")
+    try:
+        model = get_turn_model(user_input)
+        route = get_turn_route(user_input)
+        messages = get_messages_for_openai(model)
+        openai_service = create_openai_service()
+        
+        executor = get_job_executor(get_config()["jobs"])
         try:
-            logger.info("Getting conversation history for OpenAI")
-            messages = get_messages_for_openai()
-            
-            # Get configuration
-            logger.info("Getting OpenAI API key from config")
-            config = get_config()
-            api_key = config["openai"]["api_key"]
-            
-            logger.info("Initializing OpenAI service")
-            openai_service = OpenAIService(api_key)
-            
-            logger.info(f"Generating response with model: {st.session_state.openai_model}")
-            response = openai_service.generate_response(
-                messages, 
-                model=st.session_state.openai_model
+            job = executor.submit(
+                lambda job: _run_generation_job(job, openai_service, messages, model, route),
+                handle
             )
+        except JobQueueFullError:
+            logger.warning("No worker free for the speculative answer, trying semantic search first")
+            job = None
+        
+        try:
+            request_id = uuid.uuid4().hex
+            remember_search_query(request_id, user_input)
+            accepted = search_service.perform_search(user_input, request_id=request_id)
+        except CircuitOpenError as e:
+            logger.warning(f"Semantic search skipped: {str(e)}")
+            accepted = False
+        
+        if job is None:
+            if accepted:
+                return SEARCHING_MESSAGE
+            # Neither a search nor an answer is under way, so answer now
+            logger.info("Semantic search not accepted, answering directly")
+            return _generate_answer(user_input, handle)
+        
+        # Speculative jobs are never collected by the pending job bubble
+        try:
+            if accepted:
+                logger.info("Semantic search confirmed, cancelling the speculative answer")
+                handle.cancel("speculation")
+                return SEARCHING_MESSAGE
             
-            # Add assistant response to history
-            logger.info("Adding assistant response to conversation history")
-            add_message("assistant", response)
-            
+            logger.info("Semantic search not accepted, keeping the speculative answer")
+            job.wait()
+        finally:
+            executor.pop(job.id)
+        
+        if job.error is not None:
+            raise job.error
+        response = job.text.strip()
+        
+        if handle.cancelled:
+            _store_partial_response(handle, response)
             return response
+        
+        add_message("assistant", response)
+        schedule_summary()
+        return response
+        
+    except CircuitOpenError as e:
+        logger.warning(f"OpenAI call skipped: {str(e)}")
+        add_message("assistant", str(e), status=True)
+        return str(e)
+    except Exception as e:
+        logger.error(f"Error processing user input: {str(e)}", exc_info=True)
+        return f"Error: {str(e)}"
+
+def stream_user_input(user_input: str) -> Iterator[str]:
+    """Add the user's message to history and stream the OpenAI response.
+    
+    The turn gets a generation handle; starting another turn or clearing the
+    conversation cancels it, which stops reading and closes the upstream
+    stream. The assistant message is added once the stream finishes. A
+    cancelled turn's partial text is kept as a truncated message (unless
+    disabled in config or the conversation was cleared).
+    
+    Args:
+        user_input: User's input text
+        
+    Yields:
+        Response text deltas in arrival order
+    """
+    logger.info("Streaming response for user input")
+    logger.debug(f"User input: {user_input[:50]}{'...' if len(user_input) > 50 else ''}")
+    
+    handle = start_generation()
+    collect_pending_job()
+    
+    # Add user message to history
+    logger.debug("Adding user message to conversation history")
+    add_message("user", user_input)
+    
+    chunks: List[str] = []
+    failed = False
+    unavailable = False
+    try:
+        model = get_turn_model(user_input)
+        route = get_turn_route(user_input)
+        
+        logger.info("Getting conversation history for OpenAI")
+        messages = get_messages_for_openai(model)
+        
+        openai_service = create_openai_service()
+        
+        logger.info(f"Streaming response with model: {model}")
+        stream = openai_service.generate_response_stream(
+            messages,
+            model=model,
+            route=route
+        )
+        try:
+            for delta in stream:
+                if handle.cancelled:
+                    logger.info("Generation cancelled, closing OpenAI stream")
+                    break
+                chunks.append(delta)
+                yield delta
+        finally:
+            stream.close()
             
-        except Exception as e:
-            logger.error(f"Error processing user input: {str(e)}", exc_info=True)
-            return f"Error: {str(e)}"
+    except GeneratorExit:
+        handle.cancel("interrupted")
+        raise
+    except CircuitOpenError as e:
+        logger.warning(f"OpenAI call skipped: {str(e)}")
+        # Recorded as a status message so it stays visible after the rerun
+        chunks = [str(e)]
+        unavailable = True
+        yield str(e)
+    except Exception as e:
+        failed = True
+        logger.error(f"Error streaming response: {str(e)}", exc_info=True)
+        yield f"Error: {str(e)}"
+    finally:
+        response = "".join(chunks).strip()
+        if handle.cancelled:
+            _store_partial_response(handle, response)
+        elif response and not failed:
+            logger.info("Adding assistant response to conversation history")
+            add_message("assistant", response, status=unavailable)
+            schedule_summary()
+        finish_generation(handle)
 
-def should_use_semantic_search(user_input: str) -> bool:
-    """Determine if the user input should trigger semantic search.
+def _store_partial_response(handle: GenerationHandle, response: str):
+    """Keep or discard the partial response of a cancelled generation."""
+    if not response:
+        return
+    if handle.reason == "cleared" or not get_config()["app"]["keep_partial_responses"]:
+        logger.info(f"Discarding partial response of cancelled generation ({handle.reason})")
+        return
+    logger.info(f"Keeping partial response of cancelled generation ({handle.reason})")
+    add_message("assistant", response, truncated=True)
+
+def submit_user_input(user_input: str) -> str:
+    """Add the user's message to history and queue the OpenAI response as a background job.
+    
+    The request is prepared on the script thread (history, model, service);
+    only the generation runs on a worker thread, or on the shared asyncio
+    event loop when async mode is enabled. Any previous pending job is
+    cancelled and collected first so its partial output precedes this turn.
     
     Args:
         user_input: User's input text
         
     Returns:
-        True if semantic search should be used, False otherwise
+        ID of the queued job (also stored as ``pending_job_id`` in session state)
     """
-    logger.info("Evaluating if input should use semantic search")
+    logger.info("Submitting user input as background job")
+    logger.debug(f"User input: {user_input[:50]}{'...' if len(user_input) > 50 else ''}")
+    
+    handle = start_generation()
+    collect_pending_job()
+    
+    # Add user message to history
+    logger.debug("Adding user message to conversation history")
+    add_message("user", user_input)
+    
+    try:
+        config = get_config()
+        model = get_turn_model(user_input)
+        route = get_turn_route(user_input)
+        messages = get_messages_for_openai(model)
+        executor = get_job_executor(config["jobs"])
+        
+        if config["openai"]["async"]:
+            # Imported here because the async service module builds on this one
+            from app.services.async_openai_service import create_async_openai_service
+            session_id = st.session_state.session_id
+            async_service = get_service_container(config).get_session_service(
+                "async_openai_service", session_id, lambda: create_async_openai_service(config, session_id=session_id)
+            )
+            job = executor.submit_async(
+                lambda job: _start_async_generation_job(job, async_service, messages, model, route),
+                handle
+            )
+        else:
+            openai_service = create_openai_service()
+            job = executor.submit(
+                lambda job: _run_generation_job(job, openai_service, messages, model, route),
+                handle
+            )
+    except JobQueueFullError as e:
+        add_message("assistant", str(e), status=True)
+        finish_generation(handle)
+        raise
     
-    # Simple heuristic: check if the input contains search-related keywords
-    search_keywords = [
-        "search", "find", "look up", "lookup", "search for", 
-        "find information", "get information", "retrieve"
-    ]
+    st.session_state.pending_job_id = job.id
+    return job.id
+
+def _run_generation_job(
+    job: GenerationJob,
+    openai_service: OpenAIService,
+    messages: List[Dict[str, str]],
+    model: str,
+    route: str
+):
+    """Stream a response into a job (runs on a worker thread, no session state access)."""
+    stream = openai_service.generate_response_stream(messages, model=model, route=route)
+    try:
+        for delta in stream:
+            if job.handle.cancelled:
+                logger.info(f"Job {job.id} cancelled, closing OpenAI stream")
+                break
+            job.append(delta)
+    finally:
+        stream.close()
+
+def _start_async_generation_job(
+    job: GenerationJob,
+    async_service,
+    messages: List[Dict[str, str]],
+    model: str,
+    route: str
+):
+    """Schedule a job's generation on the shared event loop and return its future."""
+    return async_service.submit_stream(
+        messages,
+        job.append,
+        model=model,
+        route=route,
+        should_cancel=lambda: job.handle.cancelled
+    )
+
+def get_pending_job() -> Optional[GenerationJob]:
+    """Get the session's pending background job, if any.
     
-    # Check if any search keyword is in the user input
-    should_search = any(keyword in user_input.lower() for keyword in search_keywords)
+    Returns:
+        GenerationJob, or None if no job is pending or it was purged
+    """
+    job_id = st.session_state.get("pending_job_id")
+    if not job_id:
+        return None
+    return get_job_executor(get_config()["jobs"]).get(job_id)
+
+def collect_pending_job():
+    """Copy the pending job's result into the conversation history and forget the job.
+    
+    Finished jobs add their response; cancelled jobs keep or discard their
+    partial text; failed jobs store their error for display.
+    """
+    job_id = st.session_state.pop("pending_job_id", None)
+    if not job_id:
+        return
+    job = get_job_executor(get_config()["jobs"]).pop(job_id)
+    if job is None:
+        logger.warning(f"Pending job {job_id} no longer exists")
+        return
+    
+    logger.info(f"Collecting background job {job.id} ({job.status})")
+    response = job.text.strip()
+    if job.handle.cancelled:
+        _store_partial_response(job.handle, response)
+    elif isinstance(job.error, CircuitOpenError):
+        add_message("assistant", str(job.error), status=True)
+    elif job.error is not None:
+        st.session_state.job_error = f"Error: {str(job.error)}"
+    elif response:
+        logger.info("Adding assistant response to conversation history")
+        add_message("assistant", response)
+        schedule_summary()
+    finish_generation(job.handle)
+
+def get_turn_model(user_input: str) -> str:
+    """Get the model for the current turn, routing automatically if "auto" is selected.
+    
+    Args:
+        user_input: User's input text (already added to the history)
+        
+    Returns:
+        OpenAI model name
+    """
+    return resolve_model(
+        st.session_state.openai_model,
+        user_input,
+        st.session_state.messages[:-1],
+        get_config()["router"]
+    )
+
+def get_turn_route(user_input: str) -> str:
+    """Get the generation route for the current turn.
+    
+    The short route is opt-in: only when a ``short`` route profile is
+    configured do prompts scoring below the short threshold take it. The
+    complexity score is length-based, so a terse request for a long answer
+    can score low too.
+    
+    Args:
+        user_input: User's input text (already added to the history)
+        
+    Returns:
+        ROUTE_SHORT or ROUTE_CHAT
+    """
+    config = get_config()
+    if ROUTE_SHORT not in config["openai"]["generation"]["route_profiles"]:
+        return ROUTE_CHAT
+    score = score_complexity(user_input, len(st.session_state.messages) - 1)
+    route = ROUTE_SHORT if score < config["router"]["short_threshold"] else ROUTE_CHAT
+    logger.debug(f"Turn route: {route} (complexity {score:.2f})")
+    return route
+
+def get_summarizer() -> Optional[ConversationSummarizer]:
+    """Get the session's conversation summarizer, creating it on first use.
+    
+    Returns:
+        ConversationSummarizer instance, or None if summarization is disabled
+    """
+    config = get_config()
+    summary_config = config["summary"]
+    if not summary_config["enabled"]:
+        return None
     
-    logger.debug(f"Search decision: {should_search} (based on keywords in input)")
-    return should_search 
\ No newline at end of file
+    if "summarizer" not in st.session_state:
+        logger.info("Creating conversation summarizer")
+        st.session_state.summarizer = ConversationSummarizer(
+            create_openai_service(),
+            model=summary_config["model"],
+            threshold=summary_config["threshold"],
+            keep_recent=summary_config["keep_recent"]
+        )
+    return st.session_state.summarizer
+
+def schedule_summary():
+    """Start a background summary update if the conversation has grown too long."""
+    try:
+        summarizer = get_summarizer()
+        if summarizer is not None:
+            summarizer.maybe_schedule(get_prompt_history())
+    except Exception as e:
+        logger.error(f"Error scheduling conversation summary: {str(e)}", exc_info=True)
+
+def get_search_score(user_input: str) -> float:
+    """Score the user input's search intent.
+    
+    Uses the local intent classifier's confidence when its model is
+    available, and the configured keyword set otherwise.
+    
+    Args:
+        user_input: User's input text
+        
+    Returns:
+        Score between 0 (chat) and 1 (search)
+    """
+    router_config = get_config()["router"]
+    classifier = get_intent_classifier(router_config["intent_classifier"])
+    if classifier is not None:
+        score = classifier.predict_proba(user_input)
+        logger.debug(f"Intent classifier search confidence: {score:.3f}")
+        return score
+    return score_search_intent(user_input, router_config["search_keywords"])
+
+def _in_speculative_band(search_score: float) -> bool:
+    """Whether a search intent score is ambiguous enough to answer and search in parallel."""
+    speculative_config = get_config()["router"]["speculative"]
+    return (
+        speculative_config["enabled"]
+        and speculative_config["min_score"] <= search_score <= speculative_config["max_score"]
+    )
+
+def should_speculate(user_input: str, search_score: Optional[float] = None) -> bool:
+    """Determine if the user input should take the speculative search path.
+    
+    Such inputs must go through process_user_input, which starts the
+    OpenAI answer and the semantic search in parallel.
+    
+    Args:
+        user_input: User's input text
+        search_score: The turn's get_search_score result, if already computed
+        
+    Returns:
+        True if speculative routing is enabled and the input's search intent is ambiguous
+    """
+    if search_score is None:
+        search_score = get_search_score(user_input)
+    speculate = _in_speculative_band(search_score)
+    logger.debug(f"Speculative routing decision: {speculate}")
+    return speculate
+
+def should_use_semantic_search(user_input: str, search_score: Optional[float] = None) -> bool:
+    """Determine if the user input should trigger semantic search.
+    
+    Args:
+        user_input: User's input text
+        search_score: The turn's get_search_score result, if already computed
+        
+    Returns:
+        True if semantic search should be used, False otherwise
+    """
+    logger.info("Evaluating if input should use semantic search")
+    score = search_score if search_score is not None else get_search_score(user_input)
+    should_search = score >= SEARCH_INTENT_THRESHOLD
+    logger.debug(f"Search decision: {should_search} (search intent score {score:.3f})")
+    return should_search
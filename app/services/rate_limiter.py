@@ -0,0 +1,210 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Any, Optional
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class RateLimitTimeoutError(RuntimeError):
+    """Raised when a request waited longer than allowed for rate limit capacity."""
+
+class TokenBucket:
+    """Token bucket refilled continuously up to its capacity."""
+
+    def __init__(self, capacity: float, per_minute: float):
+        """Initialize a full bucket.
+
+        Args:
+            capacity: Maximum number of tokens in the bucket
+            per_minute: Tokens added per minute
+        """
+        self.capacity = capacity
+        self.rate = per_minute / 60.0
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        """Add the tokens accrued since the last update."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if available now)."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate) if self.rate > 0 else float("inf")
+
+    def consume(self, amount: float):
+        """Take tokens from the bucket (call after time_until returned 0)."""
+        self.tokens -= min(amount, self.capacity)
+
+class RateLimiter:
+    """Process-wide requests/minute and tokens/minute limiter for OpenAI calls.
+
+    Each model has its own request and token bucket. Waiters are served
+    round-robin across sessions: a session with many queued requests gets
+    one grant per rotation, so a single chatty user cannot starve others.
+    """
+
+    def __init__(self, requests_per_minute: Dict[str, int], tokens_per_minute: Dict[str, int], max_wait: float = 30.0):
+        """Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Request limit per model (unlisted models are not limited)
+            tokens_per_minute: Token limit per model (unlisted models are not limited)
+            max_wait: Maximum seconds a request may wait before failing
+        """
+        logger.info("Initializing OpenAI rate limiter")
+        logger.debug(f"Rate limits: rpm={requests_per_minute}, tpm={tokens_per_minute}, max_wait={max_wait}")
+        self.max_wait = max_wait
+        self._request_buckets = {
+            model: TokenBucket(limit, limit) for model, limit in requests_per_minute.items()
+        }
+        self._token_buckets = {
+            model: TokenBucket(limit, limit) for model, limit in tokens_per_minute.items()
+        }
+        self._queues: Dict[str, "OrderedDict[str, deque]"] = {}
+        self._cond = threading.Condition()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _model_stats(self, model: str) -> Dict[str, float]:
+        """Get the mutable statistics record for a model (lock held)."""
+        return self._stats.setdefault(model, {
+            "granted": 0,
+            "timeouts": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0
+        })
+
+    def acquire(self, model: str, tokens: int, session_id: str = "default") -> float:
+        """Wait until a request for a model may be sent.
+
+        Args:
+            model: OpenAI model the request is for
+            tokens: Estimated tokens (prompt plus max completion)
+            session_id: Session the request belongs to, used for fair queuing
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitTimeoutError: If capacity did not free up within max_wait
+        """
+        request_bucket = self._request_buckets.get(model)
+        token_bucket = self._token_buckets.get(model)
+        if request_bucket is None and token_bucket is None:
+            return 0.0
+
+        ticket = object()
+        start = time.monotonic()
+        deadline = start + self.max_wait
+
+        with self._cond:
+            queue = self._queues.setdefault(model, OrderedDict())
+            queue.setdefault(session_id, deque()).append(ticket)
+
+            granted = False
+            try:
+                while True:
+                    now = time.monotonic()
+                    is_head = self._is_next(queue, session_id, ticket)
+                    delay = deadline - now
+                    if is_head:
+                        delay = 0.0
+                        if request_bucket is not None:
+                            delay = max(delay, request_bucket.time_until(1, now))
+                        if token_bucket is not None:
+                            delay = max(delay, token_bucket.time_until(tokens, now))
+                        if delay == 0.0:
+                            break
+                    
+                    # Fail fast if capacity cannot free up before the deadline
+                    if now >= deadline or (is_head and now + delay > deadline):
+                        self._model_stats(model)["timeouts"] += 1
+                        logger.warning(f"Rate limit wait would exceed {self.max_wait}s for {model}")
+                        raise RateLimitTimeoutError(
+                            f"The {model} model is busy right now, please try again in a moment."
+                        )
+                    # Waiters that are not at the head are woken when the head is served
+                    self._cond.wait(timeout=min(delay, deadline - now))
+
+                if request_bucket is not None:
+                    request_bucket.consume(1)
+                if token_bucket is not None:
+                    token_bucket.consume(tokens)
+                granted = True
+            finally:
+                self._remove(queue, session_id, ticket, rotate=granted)
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            stats = self._model_stats(model)
+            stats["granted"] += 1
+            stats["total_wait"] += waited
+            stats["max_wait"] = max(stats["max_wait"], waited)
+
+        if waited > 0.01:
+            logger.info(f"Rate limiter delayed {model} request by {waited:.2f}s")
+        return waited
+
+    @staticmethod
+    def _is_next(queue: "OrderedDict[str, deque]", session_id: str, ticket: object) -> bool:
+        """Check whether a ticket is at the head of the round-robin rotation."""
+        head_session = next(iter(queue))
+        return head_session == session_id and queue[session_id][0] is ticket
+
+    @staticmethod
+    def _remove(queue: "OrderedDict[str, deque]", session_id: str, ticket: object, rotate: bool):
+        """Remove a ticket, rotating its session to the back of the queue if it was served."""
+        tickets = queue[session_id]
+        tickets.remove(ticket)
+        if tickets:
+            if rotate:
+                queue.move_to_end(session_id)
+        else:
+            del queue[session_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and wait time statistics per model.
+
+        Returns:
+            Dictionary keyed by model
+        """
+        with self._cond:
+            result = {}
+            for model in set(self._stats) | set(self._queues):
+                stats = dict(self._model_stats(model))
+                queue = self._queues.get(model, {})
+                stats["queue_depth"] = sum(len(tickets) for tickets in queue.values())
+                stats["queued_sessions"] = len(queue)
+                stats["avg_wait"] = round(stats["total_wait"] / stats["granted"], 3) if stats["granted"] else 0.0
+                stats["total_wait"] = round(stats["total_wait"], 3)
+                stats["max_wait"] = round(stats["max_wait"], 3)
+                result[model] = stats
+            return result
+
+# Shared by every session in the process
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter(limit_config: Dict[str, Any]) -> Optional[RateLimiter]:
+    """Get the process-wide rate limiter, creating it on first use.
+
+    Args:
+        limit_config: The ``rate_limits`` section of the OpenAI configuration
+
+    Returns:
+        Shared RateLimiter instance, or None if no limits are configured
+    """
+    global _rate_limiter
+    if not limit_config["requests_per_minute"] and not limit_config["tokens_per_minute"]:
+        return None
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(
+                limit_config["requests_per_minute"],
+                limit_config["tokens_per_minute"],
+                max_wait=limit_config["max_wait"]
+            )
+        return _rate_limiter
@@ -0,0 +1,510 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, TypeVar
+import openai
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+def is_retryable_error(error: Exception) -> bool:
+    """Check whether an OpenAI error is transient and worth retrying.
+
+    Args:
+        error: Exception raised by the OpenAI client
+
+    Returns:
+        True for timeouts, connection errors, 429s and 5xx responses
+    """
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+def call_with_retry(
+    fn: Callable[[], T],
+    max_retries: int = 2,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    is_retryable: Callable[[Exception], bool] = is_retryable_error,
+    sleep: Callable[[float], None] = time.sleep
+) -> T:
+    """Call ``fn``, retrying transient failures with full-jitter exponential backoff.
+
+    Args:
+        fn: Function performing one attempt
+        max_retries: Number of retries after the first attempt
+        base_delay: Backoff base in seconds
+        max_delay: Upper bound for a single backoff in seconds
+        is_retryable: Predicate deciding whether an error is retried
+        sleep: Function waiting out a backoff (replaceable in tests)
+
+    Returns:
+        The result of the first successful attempt
+    """
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            attempt += 1
+            logger.warning(
+                f"Retryable error ({type(e).__name__}), retry {attempt}/{max_retries} in {delay:.2f}s"
+            )
+            sleep(delay)
+
+class LatencyTracker:
+    """Keeps a sliding window of latency samples per key."""
+
+    def __init__(self, window: int = 200):
+        """Initialize the tracker.
+
+        Args:
+            window: Number of most recent samples kept per key
+        """
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float):
+        """Record a latency sample.
+
+        Args:
+            key: Sample series (e.g. a model name)
+            seconds: Observed latency
+        """
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, key: str, quantile: float, min_samples: int = 20) -> Optional[float]:
+        """Get a latency percentile.
+
+        Args:
+            key: Sample series
+            quantile: Quantile between 0 and 1
+            min_samples: Minimum samples needed for a meaningful value
+
+        Returns:
+            Latency in seconds, or None if there are too few samples
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(quantile * len(samples)))]
+
+class HedgedAttempt:
+    """One attempt of a hedged call, which the hedger can abandon.
+
+    An attempt registers how to abort itself (e.g. closing its HTTP
+    response) with ``on_abandon``; once the other attempt wins, the hedger
+    calls it so the loser stops waiting on the network.
+    """
+
+    def __init__(self):
+        """Initialize an attempt that has not been abandoned."""
+        self._lock = threading.Lock()
+        self._close: Optional[Callable[[], None]] = None
+        self.abandoned = False
+
+    def on_abandon(self, close: Callable[[], None]):
+        """Register how to abort the attempt, aborting it now if it was already abandoned."""
+        with self._lock:
+            self._close = close
+            abandoned = self.abandoned
+        if abandoned:
+            _quietly(close)
+
+    def abandon(self):
+        """Abort the attempt; later work it finishes is discarded by the hedger."""
+        with self._lock:
+            self.abandoned = True
+            close = self._close
+        if close is not None:
+            _quietly(close)
+
+def _quietly(fn: Callable[[], None]):
+    """Call a cleanup function, logging instead of raising its errors."""
+    try:
+        fn()
+    except Exception as e:
+        logger.debug(f"Error releasing hedged attempt: {str(e)}")
+
+class Hedger:
+    """Runs a backup attempt when the first one is slower than the observed p95.
+
+    The hedge delay per key is the p95 of recent latencies (never below
+    ``min_delay``). The primary attempt runs on the caller's thread; only
+    backups run on the pool, so the pool size bounds hedges, not calls.
+    Whichever attempt succeeds first wins and the other is abandoned, so
+    attempts must register how to abort themselves with
+    ``HedgedAttempt.on_abandon``. Calls that cannot be aborted once sent
+    (e.g. non-streaming completions) should not be hedged.
+    """
+
+    def __init__(
+        self,
+        min_delay: float = 1.0,
+        quantile: float = 0.95,
+        max_workers: int = 16,
+        timer: Callable[[float, Callable[[], None]], Any] = threading.Timer
+    ):
+        """Initialize the hedger.
+
+        Args:
+            min_delay: Lower bound for the hedge delay in seconds
+            quantile: Latency quantile after which the backup attempt starts
+            max_workers: Size of the thread pool running backup attempts
+            timer: Factory scheduling the backup launch, with threading.Timer's
+                interface (replaceable in tests)
+        """
+        logger.info("Initializing request hedger")
+        self.min_delay = min_delay
+        self.quantile = quantile
+        self.timer = timer
+        self.latency = LatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedged = 0
+        self.backup_wins = 0
+
+    def get_delay(self, key: str) -> float:
+        """Get the current hedge delay for a key."""
+        observed = self.latency.percentile(key, self.quantile)
+        return max(self.min_delay, observed) if observed is not None else self.min_delay
+
+    def call(
+        self,
+        key: str,
+        fn: Callable[[HedgedAttempt], T],
+        discard: Optional[Callable[[T], None]] = None
+    ) -> T:
+        """Run ``fn``, hedging with a second attempt if the first is slow.
+
+        Args:
+            key: Latency series for the call (e.g. the model name)
+            fn: Function performing one attempt, given the attempt's HedgedAttempt
+            discard: Optional callback releasing the result of an attempt that lost
+
+        Returns:
+            The result of the first attempt to succeed
+        """
+        start = time.monotonic()
+        with self._lock:
+            self.calls += 1
+        primary, backup = HedgedAttempt(), HedgedAttempt()
+        state_lock = threading.Lock()
+        # winner: None until an attempt succeeds, then "primary" or "backup"
+        state: Dict[str, Any] = {"winner": None, "result": None, "launched": False, "primary_failed": False}
+        backup_done = threading.Event()
+
+        def release(result):
+            if discard is not None:
+                _quietly(lambda: discard(result))
+
+        def run_backup():
+            try:
+                result = fn(backup)
+            except Exception as e:
+                logger.debug(f"Backup attempt for {key} failed: {type(e).__name__}")
+                backup_done.set()
+                return
+            with state_lock:
+                won = state["winner"] is None
+                if won:
+                    state["winner"], state["result"] = "backup", result
+            if won:
+                with self._lock:
+                    self.backup_wins += 1
+                self.latency.record(key, time.monotonic() - start)
+                primary.abandon()
+            else:
+                release(result)
+            backup_done.set()
+
+        def launch_backup():
+            with state_lock:
+                if state["winner"] is not None or state["primary_failed"]:
+                    return
+                state["launched"] = True
+            logger.info(f"Primary request slower than hedge delay, sending backup for {key}")
+            with self._lock:
+                self.hedged += 1
+            self._executor.submit(run_backup)
+
+        timer = self.timer(self.get_delay(key), launch_backup)
+        timer.daemon = True
+        timer.start()
+        try:
+            result = fn(primary)
+        except Exception as e:
+            timer.cancel()
+            with state_lock:
+                state["primary_failed"] = True
+                launched = state["launched"]
+            if launched:
+                backup_done.wait()
+            with state_lock:
+                if state["winner"] == "backup":
+                    return state["result"]
+            raise e
+
+        timer.cancel()
+        with state_lock:
+            if state["winner"] is None:
+                state["winner"] = "primary"
+        if state["winner"] == "backup":
+            release(result)
+            return state["result"]
+        backup.abandon()
+        self.latency.record(key, time.monotonic() - start)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hedging statistics.
+
+        Returns:
+            Dictionary with call, hedge and backup-win counts
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "backup_wins": self.backup_wins
+            }
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency while its circuit breaker is open."""
+
+class CircuitBreaker:
+    """Fails fast while a dependency is unhealthy.
+
+    Outcomes of the last ``window`` calls are tracked; calls slower than
+    ``slow_call_seconds`` count as failures. When at least ``min_calls``
+    outcomes are known and the failure rate reaches ``failure_rate`` the
+    breaker opens. After ``reset_timeout`` seconds it lets up to
+    ``half_open_calls`` probe requests through: a successful probe closes it,
+    a failed one opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window: int = 20,
+        slow_call_seconds: float = 30.0,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1
+    ):
+        """Initialize a closed circuit breaker.
+
+        Args:
+            name: Name of the protected dependency, used in messages
+            failure_rate: Failure ratio (0-1) that opens the breaker
+            min_calls: Minimum outcomes in the window before it can open
+            window: Number of most recent outcomes considered
+            slow_call_seconds: Latency above which a call counts as failed
+            reset_timeout: Seconds the breaker stays open before probing
+            half_open_calls: Number of concurrent probes allowed when half open
+        """
+        logger.info(f"Initializing circuit breaker for {name}")
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.state = self.CLOSED
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.trips = 0
+
+    def allow_request(self):
+        """Check that a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the breaker is open or all probe slots are taken
+        """
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                logger.info(f"Circuit breaker for {self.name} half open, probing")
+                self.state = self.HALF_OPEN
+                self._probes = 0
+
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return
+
+            self.rejected += 1
+        raise CircuitOpenError(
+            f"The {self.name} service is temporarily unavailable. Please try again in a little while."
+        )
+
+    def record_success(self, latency: float):
+        """Record a completed call.
+
+        Args:
+            latency: Call duration in seconds (slow calls count as failures)
+        """
+        if latency > self.slow_call_seconds:
+            logger.warning(f"Slow {self.name} call ({latency:.1f}s) counted as failure")
+            self.record_failure()
+            return
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                logger.info(f"Circuit breaker for {self.name} closed after successful probe")
+                self.state = self.CLOSED
+                self._outcomes.clear()
+            self._outcomes.append(True)
+
+    def record_failure(self):
+        """Record a failed call, opening the breaker if the threshold is reached."""
+        with self._lock:
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            tripped = (
+                self.state == self.HALF_OPEN
+                or (
+                    self.state == self.CLOSED
+                    and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate
+                )
+            )
+            if tripped:
+                logger.error(f"Circuit breaker for {self.name} opened ({failures}/{len(self._outcomes)} failures)")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.trips += 1
+
+    def release(self):
+        """Give back a probe slot taken by ``allow_request`` without recording an outcome.
+
+        Used when an admitted call is cancelled before it succeeds or fails;
+        otherwise a half-open breaker would keep the slot and reject every
+        later call.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def call(self, fn: Callable[[], T], is_failure: Callable[[Exception], bool] = lambda e: True) -> T:
+        """Call ``fn`` through the breaker.
+
+        Args:
+            fn: Function calling the dependency
+            is_failure: Predicate deciding whether an exception counts against the breaker
+
+        Returns:
+            The result of ``fn``
+        """
+        self.allow_request()
+        start = time.monotonic()
+        try:
+            result = fn()
+        except Exception as e:
+            if is_failure(e):
+                self.record_failure()
+            else:
+                self.record_success(time.monotonic() - start)
+            raise
+        except BaseException:
+            # Interrupted before an outcome was known
+            self.release()
+            raise
+        self.record_success(time.monotonic() - start)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the breaker state and counters.
+
+        Returns:
+            Dictionary with state, window failure count, trips and rejections
+        """
+        with self._lock:
+            return {
+                "state": self.state,
+                "window_calls": len(self._outcomes),
+                "window_failures": self._outcomes.count(False),
+                "trips": self.trips,
+                "rejected": self.rejected
+            }
+
+# Shared by every session in the process
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(name: str, breaker_config: Dict[str, Any]) -> Optional[CircuitBreaker]:
+    """Get the process-wide circuit breaker for a dependency.
+
+    Args:
+        name: Dependency name (e.g. "OpenAI" or "search")
+        breaker_config: The ``circuit_breaker`` section of the app configuration
+
+    Returns:
+        Shared CircuitBreaker instance, or None if breakers are disabled
+    """
+    if not breaker_config["enabled"]:
+        return None
+    with _circuit_breakers_lock:
+        if name not in _circuit_breakers:
+            _circuit_breakers[name] = CircuitBreaker(
+                name,
+                failure_rate=breaker_config["failure_rate"],
+                min_calls=breaker_config["min_calls"],
+                window=breaker_config["window"],
+                slow_call_seconds=breaker_config["slow_call_seconds"],
+                reset_timeout=breaker_config["reset_timeout"]
+            )
+        return _circuit_breakers[name]
+
+def get_circuit_breaker_stats() -> Dict[str, Any]:
+    """Get the state of every circuit breaker created so far.
+
+    Returns:
+        Dictionary keyed by dependency name
+    """
+    with _circuit_breakers_lock:
+        breakers = list(_circuit_breakers.values())
+    return {breaker.name: breaker.get_stats() for breaker in breakers}
+
+# Shared by every session in the process
+_hedger: Optional[Hedger] = None
+_hedger_lock = threading.Lock()
+
+def get_hedger(retry_config: Dict[str, Any]) -> Optional[Hedger]:
+    """Get the process-wide hedger, creating it on first use.
+
+    Args:
+        retry_config: The ``retry`` section of the OpenAI configuration
+
+    Returns:
+        Shared Hedger instance, or None if hedging is disabled
+    """
+    global _hedger
+    if not retry_config["hedge"]:
+        return None
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = Hedger(min_delay=retry_config["hedge_min_delay"])
+        return _hedger
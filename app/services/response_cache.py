@@ -0,0 +1,202 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def make_cache_key(model: str, params: Dict[str, Any], messages: List[Dict[str, str]]) -> str:
+    """Build a stable hash for a generation request.
+
+    Message content is whitespace-normalized so trivially different inputs
+    share an entry; everything is serialized with sorted keys.
+
+    Args:
+        model: OpenAI model name
+        params: Generation parameters (temperature, max_tokens, ...)
+        messages: List of message dictionaries with role and content
+
+    Returns:
+        Hex digest identifying the request
+    """
+    normalized = [
+        {"role": msg["role"], "content": " ".join(msg["content"].split())}
+        for msg in messages
+    ]
+    payload = json.dumps(
+        {"model": model, "params": params, "messages": normalized},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """Exact-match cache for OpenAI responses with LRU eviction and TTL.
+
+    Entries live in a bounded in-memory LRU. If a SQLite path is given,
+    entries are also written to disk so they survive restarts; disk hits are
+    promoted back into memory.
+    """
+
+    def __init__(self, capacity: int = 1000, ttl: float = 3600.0, sqlite_path: Optional[str] = None):
+        """Initialize the response cache.
+
+        Args:
+            capacity: Maximum number of in-memory entries
+            ttl: Seconds an entry stays valid
+            sqlite_path: Optional SQLite database file for the on-disk tier
+        """
+        logger.info("Initializing response cache")
+        logger.debug(f"Response cache: capacity={capacity}, ttl={ttl}, sqlite_path={sqlite_path or '[NONE]'}")
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._db = None
+
+        if sqlite_path:
+            self._open_db(sqlite_path)
+
+    def _open_db(self, sqlite_path: str):
+        """Open the SQLite tier and drop expired rows."""
+        try:
+            logger.info(f"Opening response cache database: {sqlite_path}")
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Could not open response cache database, using memory only: {str(e)}", exc_info=True)
+            self._db = None
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                response, created_at = entry
+                if now - created_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    logger.debug("Response cache hit (memory)")
+                    return response
+                del self._entries[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"Response cache database read failed: {str(e)}")
+                    row = None
+                if row is not None and now - row[1] <= self.ttl:
+                    self._store(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    logger.debug("Response cache hit (disk)")
+                    return row[0]
+
+            self.misses += 1
+            logger.debug("Response cache miss")
+            return None
+
+    def put(self, key: str, response: str):
+        """Store a response.
+
+        Args:
+            key: Cache key from make_cache_key
+            response: Response text to cache
+        """
+        created_at = time.time()
+        with self._lock:
+            self._store(key, response, created_at)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                        (key, response, created_at)
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Response cache database write failed: {str(e)}")
+
+    def _store(self, key: str, response: str, created_at: float):
+        """Insert into the in-memory LRU, evicting the oldest entries (lock held)."""
+        self._entries[key] = (response, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Remove every entry from memory and disk."""
+        logger.info("Clearing response cache")
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with size, hit/miss counters and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+# Shared by every session in the process
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache(cache_config: Dict[str, Any]) -> Optional[ResponseCache]:
+    """Get the process-wide response cache, creating it on first use.
+
+    Args:
+        cache_config: The ``response_cache`` section of the app configuration
+
+    Returns:
+        Shared ResponseCache instance, or None if caching is disabled
+    """
+    global _response_cache
+    if not cache_config["enabled"]:
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                capacity=cache_config["capacity"],
+                ttl=cache_config["ttl"],
+                sqlite_path=cache_config["sqlite_path"]
+            )
+        return _response_cache
@@ -0,0 +1,156 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Words that never change what a search is about. Relational words
+# ("to", "from", "in") are kept: they distinguish queries such as
+# "flights from Paris to Rome" and "flights from Rome to Paris".
+FILLER_WORDS = frozenset(("a", "an", "the", "please"))
+
+# Commands users open a search with ("search for", "can you look up", "find me")
+_COMMAND_PREFIX = re.compile(
+    r"^(?:(?:please|can you|could you|would you)\s+)*"
+    r"(?:search|look up|lookup|find|show|retrieve|get)(?:\s+me)?(?:\s+(?:for|about))?\s+"
+)
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+
+def normalize_query(query: str) -> str:
+    """Reduce a search query to the form its results are cached under.
+
+    Lowercases, drops punctuation, collapses whitespace, strips a leading
+    search command and removes filler words, keeping the word order, so
+    "Search for the vacation policy!" and "vacation  policy?" share a key.
+    A query made only of filler words keeps all its words.
+
+    Args:
+        query: Search query as typed by the user
+
+    Returns:
+        Normalized query
+    """
+    words = _PUNCTUATION.sub(" ", query.lower()).split()
+    text = _COMMAND_PREFIX.sub("", " ".join(words))
+    keywords = [word for word in text.split() if word not in FILLER_WORDS]
+    return " ".join(keywords or words)
+
+class SearchResultCache:
+    """Cache of semantic search results keyed on conversation and normalized query.
+
+    The search backend may rank results using the conversation, so entries
+    are never shared between conversations. A hit lets the app show results
+    without sending the search request and waiting for them on the
+    WebSocket. Entries live in a bounded in-memory LRU and expire after
+    ``ttl`` seconds, since the indexed documents change over time.
+    """
+
+    def __init__(self, capacity: int = 500, ttl: float = 900.0):
+        """Initialize the search result cache.
+
+        Args:
+            capacity: Maximum number of cached queries
+            ttl: Seconds an entry stays valid
+        """
+        logger.info("Initializing search result cache")
+        logger.debug(f"Search result cache: capacity={capacity}, ttl={ttl}")
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[List[Dict[str, Any]], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def get(self, query: str, conversation_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Look up the results of a query.
+
+        Args:
+            query: Search query as typed by the user
+            conversation_id: Conversation the search belongs to
+
+        Returns:
+            Cached search results, or None on a miss
+        """
+        key = (conversation_id, normalize_query(query))
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                results, created_at = entry
+                if now - created_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    logger.debug(f"Search result cache hit: {key}")
+                    return results
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            logger.debug(f"Search result cache miss: {key}")
+            return None
+
+    def put(self, query: str, conversation_id: str, results: List[Dict[str, Any]]):
+        """Store the results of a query.
+
+        Args:
+            query: Search query as typed by the user
+            conversation_id: Conversation the search belongs to
+            results: Search results received for it
+        """
+        key = (conversation_id, normalize_query(query))
+        with self._lock:
+            self._entries[key] = (results, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove every entry."""
+        logger.info("Clearing search result cache")
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with size, hit/miss counters and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+# Shared by every session in the process
+_search_cache: Optional[SearchResultCache] = None
+_search_cache_lock = threading.Lock()
+
+def get_search_cache(cache_config: Dict[str, Any]) -> Optional[SearchResultCache]:
+    """Get the process-wide search result cache, creating it on first use.
+
+    Args:
+        cache_config: The ``search_cache`` section of the app configuration
+
+    Returns:
+        Shared SearchResultCache instance, or None if caching is disabled
+    """
+    global _search_cache
+    if not cache_config["enabled"]:
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchResultCache(capacity=cache_config["capacity"], ttl=cache_config["ttl"])
+        return _search_cache
@@ -0,0 +1,107 @@
+import threading
+from typing import Dict, Any, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Defaults for the ``aws.pool`` configuration section
+DEFAULT_SEARCH_POOL_CONFIG = {
+    "pool_maxsize": 10,
+    "connect_timeout": 3.05,
+    "read_timeout": 10.0,
+    "max_retries": 2,
+    "retry_backoff": 0.3
+}
+
+# Upstream statuses worth retrying when the request method is idempotent
+RETRY_STATUSES = (502, 503, 504)
+
+# Shared sessions live at module level so they survive Streamlit reruns and
+# are reused by every session in the process.
+_sessions: Dict[Tuple[int, int, float], requests.Session] = {}
+_lock = threading.Lock()
+
+def get_search_session(pool_config: Dict[str, Any]) -> requests.Session:
+    """Get the shared HTTP session for the search API.
+
+    The session's connection pool keeps TCP/TLS connections to API Gateway
+    open across searches. Connection failures are retried for every method,
+    since the request never reached the server; read errors and 502/503/504
+    responses only for idempotent methods, so a search POST is never sent
+    twice. Pool settings only apply when the session is first created.
+
+    Args:
+        pool_config: The ``aws.pool`` section of the app configuration
+
+    Returns:
+        Shared requests.Session instance
+    """
+    key = (pool_config["pool_maxsize"], pool_config["max_retries"], pool_config["retry_backoff"])
+    with _lock:
+        session = _sessions.get(key)
+        if session is not None:
+            logger.debug("Reusing pooled search session")
+            return session
+
+        logger.info("Creating pooled search session")
+        logger.debug(
+            f"Search pool: pool_maxsize={pool_config['pool_maxsize']}, "
+            f"max_retries={pool_config['max_retries']}, retry_backoff={pool_config['retry_backoff']}"
+        )
+        retry = Retry(
+            total=pool_config["max_retries"],
+            connect=pool_config["max_retries"],
+            read=pool_config["max_retries"],
+            status=pool_config["max_retries"],
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            backoff_factor=pool_config["retry_backoff"],
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_config["pool_maxsize"],
+            max_retries=retry,
+            pool_block=False
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _sessions[key] = session
+        return session
+
+def get_search_pool_stats() -> Dict[str, Any]:
+    """Get connection reuse statistics for every pooled search session.
+
+    Returns:
+        Dictionary keyed by host with request, new connection, reuse and idle connection counts
+    """
+    pool_stats = {}
+    with _lock:
+        adapters = {id(adapter): adapter for session in _sessions.values() for adapter in session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for pool_key in pools.keys():
+                pool = pools.get(pool_key)
+                if pool is None:
+                    continue
+                # urllib3 counts every request and every connection it had to open
+                pool_stats[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                    "requests": pool.num_requests,
+                    "new_connections": pool.num_connections,
+                    "reused_connections": max(pool.num_requests - pool.num_connections, 0),
+                    # The pool queue holds None placeholders for slots without a connection
+                    "idle_connections": sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0
+                }
+    return pool_stats
+
+def close_search_sessions() -> None:
+    """Close every pooled search session and forget it."""
+    logger.info("Closing pooled search sessions")
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,144 @@
+import re
+from functools import lru_cache
+from typing import Iterable, Dict, Optional, Tuple
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Keywords that mark an input as a search request
+DEFAULT_SEARCH_KEYWORDS = (
+    "search", "find", "look up", "lookup", "search for",
+    "find information", "get information", "retrieve"
+)
+
+# Search intent score from which an input is routed to semantic search
+SEARCH_INTENT_THRESHOLD = 0.5
+
+# Keyword sets up to this size are prefiltered with plain substring checks
+PREFILTER_MAX_KEYWORDS = 32
+
+# Inflections a keyword may carry and still match ("searching", "finds")
+_SUFFIX_PATTERN = r"(?:s|es|d|ed|ing)?"
+
+def _trie_pattern(trie: Dict[str, dict]) -> str:
+    """Turn a character trie into a regex alternation that shares common prefixes."""
+    if "" in trie and len(trie) == 1:
+        return ""
+    branches = []
+    for char in sorted(key for key in trie if key):
+        branches.append(re.escape(char) + _trie_pattern(trie[char]))
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if "" in trie else body
+
+def _contains_shorter_keyword(keyword: str, keywords: set) -> bool:
+    """Check whether a phrase contains another keyword as a run of whole words."""
+    words = keyword.split()
+    return any(
+        " ".join(words[start:end]) in keywords
+        for start in range(len(words))
+        for end in range(start + 1, len(words) + 1)
+        if end - start < len(words)
+    )
+
+class KeywordMatcher:
+    """Single-pass, precompiled matcher for a set of whole-word keywords.
+
+    Keywords are compiled once into one regex built from a prefix trie, so
+    the input is scanned a single time regardless of how many keywords
+    there are. Matching is case-insensitive, bounded by word boundaries,
+    treats any run of whitespace as a space and allows simple inflections.
+    Multi-word keywords that contain a shorter keyword as a whole word
+    ("search for" vs "search") are dropped as redundant.
+
+    For small keyword sets, C-level substring checks of each keyword's
+    first word run before the regex; they are faster than any regex scan
+    and rule out most inputs, which contain no keyword at all.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """Compile the matcher.
+
+        Args:
+            keywords: Words or phrases to match
+        """
+        normalized = {" ".join(keyword.lower().split()) for keyword in keywords}
+        normalized.discard("")
+        self.keywords = tuple(sorted(
+            keyword for keyword in normalized if not _contains_shorter_keyword(keyword, normalized)
+        ))
+        logger.debug(f"Compiling keyword matcher for {len(self.keywords)} keywords")
+
+        self._prefilter = None
+        if len(self.keywords) <= PREFILTER_MAX_KEYWORDS:
+            self._prefilter = tuple({keyword.split()[0] for keyword in self.keywords})
+
+        if not self.keywords:
+            self._regex = None
+            return
+
+        trie: Dict[str, dict] = {}
+        for keyword in self.keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        pattern = _trie_pattern(trie).replace(r"\ ", r"\s+")
+        # Inputs are lowercased before matching; that is cheaper than re.IGNORECASE
+        self._regex = re.compile(rf"\b{pattern}{_SUFFIX_PATTERN}\b")
+
+    def search(self, text: str) -> Optional[str]:
+        """Find the first keyword occurrence in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            The matched text (lowercased), or None if no keyword occurs
+        """
+        if self._regex is None:
+            return None
+        lowered = text.lower()
+        if self._prefilter is not None and not any(word in lowered for word in self._prefilter):
+            return None
+        match = self._regex.search(lowered)
+        return match.group(0) if match else None
+
+    def matches(self, text: str) -> bool:
+        """Check whether any keyword occurs in a text."""
+        return self.search(text) is not None
+
+@lru_cache(maxsize=8)
+def get_keyword_matcher(keywords: Tuple[str, ...] = DEFAULT_SEARCH_KEYWORDS) -> KeywordMatcher:
+    """Get the compiled matcher for a keyword set, compiling it on first use.
+
+    Args:
+        keywords: Keyword set (a tuple, so it can be cached)
+
+    Returns:
+        Shared KeywordMatcher instance
+    """
+    return KeywordMatcher(keywords)
+
+# Compile the default keyword set at import so the first request does not pay for it
+get_keyword_matcher(DEFAULT_SEARCH_KEYWORDS)
+
+def score_search_intent(user_input: str, keywords: Tuple[str, ...] = DEFAULT_SEARCH_KEYWORDS) -> float:
+    """Score how likely the user input is a request for semantic search.
+
+    Inputs with a search keyword score high; if they are also phrased as a
+    question to the assistant, they are ambiguous and score mid-range.
+
+    Args:
+        user_input: User's input text
+        keywords: Keyword set marking search requests
+
+    Returns:
+        Score between 0 (chat) and 1 (search)
+    """
+    matched = get_keyword_matcher(keywords).search(user_input)
+    if matched is None:
+        return 0.0
+    logger.debug(f"Search keyword found in input: {matched}")
+    if user_input.rstrip().endswith("?"):
+        return 0.5
+    return 0.9
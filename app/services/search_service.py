@@ -1,8 +1,10 @@
 import json
 import logging
-import requests
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Optional, Tuple
 import streamlit as st
+from app.services.resilience import CircuitBreaker
+from app.services.search_client import DEFAULT_SEARCH_POOL_CONFIG, get_search_session
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -10,17 +12,29 @@ logger = get_logger(__name__)
 class SearchService:
     """Service for performing semantic search via AWS API Gateway."""
     
-    def __init__(self, api_endpoint: str, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_endpoint: str,
+        api_key: Optional[str] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        pool_config: Optional[Dict[str, Any]] = None
+    ):
         """Initialize search service.
         
         Args:
             api_endpoint: AWS API Gateway endpoint for semantic search
             api_key: Optional API key for authentication
+            circuit_breaker: Optional breaker failing fast while the API is unhealthy
+            pool_config: Optional connection pool, timeout and retry settings (see DEFAULT_SEARCH_POOL_CONFIG)
         """
         logger.info("Initializing Search Service")
         logger.debug(f"API Endpoint: {api_endpoint}")
         self.api_endpoint = api_endpoint
         self.api_key = api_key
+        self.circuit_breaker = circuit_breaker
+        pool_config = {**DEFAULT_SEARCH_POOL_CONFIG, **(pool_config or {})}
+        self.session = get_search_session(pool_config)
+        self.timeout = (pool_config["connect_timeout"], pool_config["read_timeout"])
         self.headers = {}
         
         if api_key:
@@ -29,67 +43,125 @@ class SearchService:
         else:
             logger.debug("No API key provided")
     
-    def perform_search(self, query: str) -> bool:
+    def perform_search(self, query: str, request_id: Optional[str] = None) -> bool:
         """Perform semantic search by sending request to AWS API Gateway.
         
         Args:
             query: Search query
+            request_id: Optional client request ID echoed back with the results
             
         Returns:
             True if request was successful, False otherwise
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
         """
+        conversation_id = st.session_state.conversation_id or "new_conversation"
+        accepted, new_conversation_id = self.send_search(query, conversation_id, request_id=request_id)
+        
+        # If this is a new conversation, keep the conversation ID from the response
+        if new_conversation_id and not st.session_state.conversation_id:
+            logger.info(f"Extracted new conversation ID: {new_conversation_id}")
+            st.session_state.conversation_id = new_conversation_id
+        return accepted
+    
+    def send_search(
+        self,
+        query: str,
+        conversation_id: str,
+        request_id: Optional[str] = None
+    ) -> Tuple[bool, Optional[str]]:
+        """Send a search request to AWS API Gateway.
+        
+        Does not touch session state, so it is safe to call from worker threads.
+        
+        Args:
+            query: Search query
+            conversation_id: Conversation the search belongs to ("new_conversation" for none yet)
+            request_id: Optional client request ID echoed back with the results
+            
+        Returns:
+            Tuple of whether the request was accepted and the conversation ID
+            returned for a new conversation, if any
+            
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+        """
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.allow_request()
+        
+        # Every admitted request reports an outcome or gives its (half-open probe) slot back
+        outcome_recorded = False
         try:
             logger.info(f"Performing semantic search")
             logger.debug(f"Search query: {query}")
-            
-            # Prepare request payload
-            conversation_id = st.session_state.conversation_id or "new_conversation"
             logger.debug(f"Using conversation ID: {conversation_id}")
             
+            # Prepare request payload
             payload = {
                 "query": query,
                 "conversation_id": conversation_id
             }
+            if request_id:
+                payload["request_id"] = request_id
             
             # Send request to API Gateway
             logger.info(f"Sending POST request to {self.api_endpoint}")
             logger.debug(f"Request payload: {json.dumps(payload)}")
             logger.debug(f"Request headers: {json.dumps({k: '***' if k.lower() == 'x-api-key' else v for k, v in self.headers.items()})}")
             
-            response = requests.post(
-                self.api_endpoint,
-                headers=self.headers,
-                json=payload
-            )
+            start = time.monotonic()
+            try:
+                response = self.session.post(
+                    self.api_endpoint,
+                    headers=self.headers,
+                    json=payload,
+                    timeout=self.timeout
+                )
+            except Exception:
+                outcome_recorded = True
+                self._record_outcome(False, start)
+                raise
             
             # Check response status
             logger.info(f"Received response with status code: {response.status_code}")
+            outcome_recorded = True
+            self._record_outcome(response.status_code < 500, start)
             
             if response.status_code == 202:  # Accepted
                 logger.info("Search request accepted for processing")
                 
-                # If this is a new conversation, get the conversation ID from response
-                if not st.session_state.conversation_id:
+                new_conversation_id = None
+                if conversation_id == "new_conversation":
                     try:
                         logger.debug("Attempting to extract conversation ID from response")
                         response_data = response.json()
                         logger.debug(f"Response data: {json.dumps(response_data)}")
                         
                         new_conversation_id = response_data.get("conversation_id")
-                        if new_conversation_id:
-                            logger.info(f"Extracted new conversation ID: {new_conversation_id}")
-                            st.session_state.conversation_id = new_conversation_id
-                        else:
+                        if not new_conversation_id:
                             logger.warning("Response did not contain conversation_id")
                     except Exception as e:
                         logger.warning(f"Could not extract conversation ID from response: {str(e)}")
                 
-                return True
+                return True, new_conversation_id
             else:
                 logger.error(f"Search request failed: {response.status_code}")
                 logger.debug(f"Response content: {response.text}")
-                return False
+                return False, None
                 
         except Exception as e:
             logger.error(f"Error performing semantic search: {str(e)}", exc_info=True)
-            return False 
\ No newline at end of file
+            return False, None
+        finally:
+            if not outcome_recorded and self.circuit_breaker is not None:
+                self.circuit_breaker.release()
+    
+    def _record_outcome(self, success: bool, start: float):
+        """Report a request outcome to the circuit breaker, if any."""
+        if self.circuit_breaker is None:
+            return
+        if success:
+            self.circuit_breaker.record_success(time.monotonic() - start)
+        else:
+            self.circuit_breaker.record_failure()
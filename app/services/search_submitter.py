@@ -0,0 +1,193 @@
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+from app.services.job_queue import JobQueueFullError
+from app.services.resilience import CircuitOpenError
+from app.services.search_service import SearchService
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Submission latencies kept for the percentile stats
+LATENCY_SAMPLES = 1000
+
+# Seconds a finished submission waits to be collected before it is dropped
+SUBMISSION_RETENTION = 600
+
+class SearchSubmission:
+    """A search POST sent by a worker thread, tracked by its request ID."""
+
+    PENDING = "pending"
+    ACCEPTED = "accepted"
+    FAILED = "failed"
+
+    def __init__(self, query: str, conversation_id: str):
+        """Initialize a pending submission.
+
+        Args:
+            query: Search query
+            conversation_id: Conversation the search belongs to
+        """
+        self.id = uuid.uuid4().hex
+        self.query = query
+        self.conversation_id = conversation_id
+        self.status = self.PENDING
+        self.new_conversation_id: Optional[str] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.monotonic()
+        self.latency: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the POST has completed, successfully or not."""
+        return self.status != self.PENDING
+
+class SearchSubmitter:
+    """Sends search requests from a small thread pool.
+
+    The search API only acknowledges a request (202 Accepted) and delivers
+    results over the WebSocket, so the script thread has nothing to wait
+    for: it enqueues the POST, shows a placeholder and moves on. Finished
+    submissions are kept until their session collects them.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 64):
+        """Initialize the submitter.
+
+        Args:
+            max_workers: Worker threads sending requests
+            max_pending: Maximum submissions queued or in flight
+        """
+        logger.info(f"Initializing search submitter with {max_workers} workers")
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search-submit")
+        self._submissions: Dict[str, SearchSubmission] = {}
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+        self.submitted = 0
+        self.accepted = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def submit(self, search_service: SearchService, query: str, conversation_id: str) -> SearchSubmission:
+        """Queue a search request.
+
+        Args:
+            search_service: Service sending the request
+            query: Search query
+            conversation_id: Conversation the search belongs to ("new_conversation" for none yet)
+
+        Returns:
+            SearchSubmission tracking the request
+
+        Raises:
+            JobQueueFullError: If ``max_pending`` submissions are already queued or in flight
+        """
+        submission = SearchSubmission(query, conversation_id)
+        with self._lock:
+            self._purge(submission.submitted_at)
+            if self._in_flight >= self.max_pending:
+                self.rejected += 1
+                raise JobQueueFullError("Too many searches are being submitted. Please try again in a moment.")
+            self._in_flight += 1
+            self.submitted += 1
+            self._submissions[submission.id] = submission
+        logger.info(f"Queued search submission {submission.id}")
+        self._executor.submit(self._send, search_service, submission)
+        return submission
+
+    def _send(self, search_service: SearchService, submission: SearchSubmission):
+        """Send one search request on a worker thread."""
+        try:
+            accepted, new_conversation_id = search_service.send_search(
+                submission.query, submission.conversation_id, request_id=submission.id
+            )
+            submission.new_conversation_id = new_conversation_id
+            if not accepted:
+                submission.error = "The search request could not be submitted. Please try again."
+        except CircuitOpenError as e:
+            accepted = False
+            submission.error = str(e)
+        except Exception as e:
+            logger.error(f"Search submission {submission.id} failed: {str(e)}", exc_info=True)
+            accepted = False
+            submission.error = f"Error: {str(e)}"
+
+        submission.latency = time.monotonic() - submission.submitted_at
+        with self._lock:
+            self._in_flight -= 1
+            self._latencies.append(submission.latency)
+            if accepted:
+                self.accepted += 1
+            else:
+                self.failed += 1
+        # Set last: the script thread reads the other fields once the status changes
+        submission.status = SearchSubmission.ACCEPTED if accepted else SearchSubmission.FAILED
+        logger.info(f"Search submission {submission.id} {submission.status} in {submission.latency:.3f}s")
+
+    def _purge(self, now: float):
+        """Drop finished submissions nobody collected, e.g. after a conversation was cleared (lock held)."""
+        expired = [
+            submission_id for submission_id, submission in self._submissions.items()
+            if submission.finished and now - submission.submitted_at > SUBMISSION_RETENTION
+        ]
+        for submission_id in expired:
+            del self._submissions[submission_id]
+
+    def get(self, submission_id: str) -> Optional[SearchSubmission]:
+        """Get a submission by request ID."""
+        with self._lock:
+            return self._submissions.get(submission_id)
+
+    def pop(self, submission_id: str) -> Optional[SearchSubmission]:
+        """Forget a submission and return it."""
+        with self._lock:
+            return self._submissions.pop(submission_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get submission counts and latency percentiles.
+
+        Returns:
+            Dictionary of submitter statistics
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                "submitted": self.submitted,
+                "accepted": self.accepted,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "in_flight": self._in_flight,
+                "uncollected": len(self._submissions)
+            }
+        for name, q in (("latency_p50", 0.5), ("latency_p95", 0.95)):
+            stats[name] = round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 3) if latencies else None
+        return stats
+
+# Shared by every session in the process
+_search_submitter: Optional[SearchSubmitter] = None
+_search_submitter_lock = threading.Lock()
+
+def get_search_submitter(submit_config: Dict[str, Any]) -> Optional[SearchSubmitter]:
+    """Get the process-wide search submitter, creating it on first use.
+
+    Args:
+        submit_config: The ``aws.submit`` section of the app configuration
+
+    Returns:
+        Shared SearchSubmitter instance, or None if searches are sent synchronously
+    """
+    global _search_submitter
+    if not submit_config["async"]:
+        return None
+    with _search_submitter_lock:
+        if _search_submitter is None:
+            _search_submitter = SearchSubmitter(
+                max_workers=submit_config["max_workers"],
+                max_pending=submit_config["max_pending"]
+            )
+        return _search_submitter
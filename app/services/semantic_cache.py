@@ -0,0 +1,230 @@
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+
+# Distinct scopes tracked before the least recently used one is forgotten
+MAX_SCOPES = 1024
+
+def embed_text(text: str, dim: int = 512) -> np.ndarray:
+    """Embed text locally as a normalized vector of hashed n-gram counts.
+
+    Features are word unigrams, word bigrams and character trigrams of each
+    word, hashed into ``dim`` buckets with CRC32 (stable across processes).
+
+    Args:
+        text: Text to embed
+        dim: Embedding dimension
+
+    Returns:
+        L2-normalized float32 vector of length ``dim``
+    """
+    words = _WORD_RE.findall(text.lower())
+    features = list(words)
+    features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+    for word in words:
+        padded = f"#{word}#"
+        features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature in features:
+        vector[zlib.crc32(feature.encode("utf-8")) % dim] += 1.0
+
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+class SemanticCache:
+    """Similarity-based response cache backed by a NumPy embedding matrix.
+
+    Lookups compute the cosine similarity against every stored entry in one
+    matrix-vector product and return the best match above the threshold.
+    Entries are partitioned by scope (model, parameters and system prompt) so
+    similar prompts only match within the same generation setup. Storing a
+    prompt already cached in its scope replaces that entry's response.
+
+    The hashed n-gram embedding measures surface overlap, not meaning: at
+    the default threshold it matches repeats that differ in case,
+    punctuation or a word or two, while real paraphrases ("when are you
+    open" vs "what are your opening hours") miss. Lowering the threshold
+    does not help, since near-misses that need a different answer ("capital
+    of France" vs "capital of Spain") score as high as paraphrases; see
+    ``benchmarks/semantic_cache_paraphrases.py``.
+    """
+
+    def __init__(self, capacity: int = 10000, threshold: float = 0.9, ttl: float = 3600.0, dim: int = 512):
+        """Initialize the semantic cache.
+
+        Args:
+            capacity: Maximum number of entries before LRU eviction
+            threshold: Minimum cosine similarity for a hit
+            ttl: Seconds an entry stays valid
+            dim: Embedding dimension
+        """
+        logger.info("Initializing semantic cache")
+        logger.debug(f"Semantic cache: capacity={capacity}, threshold={threshold}, ttl={ttl}, dim={dim}")
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl = ttl
+        self.dim = dim
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._scopes = np.full(capacity, -1, dtype=np.int64)
+        self._created_at = np.zeros(capacity, dtype=np.float64)
+        self._last_used = np.zeros(capacity, dtype=np.float64)
+        self._responses: List[Optional[str]] = [None] * capacity
+        # Exact (scope ID, prompt) of each slot, so repeated puts reuse their slot
+        self._keys: List[Optional[Tuple[int, str]]] = [None] * capacity
+        self._slots: Dict[Tuple[int, str], int] = {}
+        self._scope_ids: "OrderedDict[str, int]" = OrderedDict()
+        self._next_scope_id = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, scope: str, text: str) -> Optional[str]:
+        """Look up a response for text similar to a cached prompt.
+
+        Args:
+            scope: Scope key the entry must belong to
+            text: Prompt text to match
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        query = embed_text(text, self.dim)
+        now = time.time()
+        with self._lock:
+            scope_id = self._scope_ids.get(scope)
+            if scope_id is None or self._size == 0:
+                self.misses += 1
+                return None
+            self._scope_ids.move_to_end(scope)
+
+            size = self._size
+            similarities = self._vectors[:size] @ query
+            invalid = (self._scopes[:size] != scope_id) | (now - self._created_at[:size] > self.ttl)
+            similarities[invalid] = -1.0
+            best = int(np.argmax(similarities))
+
+            if similarities[best] < self.threshold:
+                self.misses += 1
+                logger.debug(f"Semantic cache miss (best similarity {similarities[best]:.3f})")
+                return None
+
+            self._last_used[best] = now
+            self.hits += 1
+            logger.debug(f"Semantic cache hit (similarity {similarities[best]:.3f})")
+            return self._responses[best]
+
+    def put(self, scope: str, text: str, response: str):
+        """Store a response for a prompt.
+
+        Args:
+            scope: Scope key for the entry
+            text: Prompt text
+            response: Response text to cache
+        """
+        vector = embed_text(text, self.dim)
+        now = time.time()
+        with self._lock:
+            scope_id = self._get_scope_id(scope)
+            key = (scope_id, text)
+            slot = self._slots.get(key)
+            if slot is not None:
+                # The same prompt again: refresh its entry instead of adding a duplicate vector
+                logger.debug("Replacing semantic cache entry for an identical prompt")
+                self._created_at[slot] = now
+                self._last_used[slot] = now
+                self._responses[slot] = response
+                return
+
+            if self._size < self.capacity:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+                self.evictions += 1
+                self._slots.pop(self._keys[slot], None)
+
+            self._vectors[slot] = vector
+            self._scopes[slot] = scope_id
+            self._created_at[slot] = now
+            self._last_used[slot] = now
+            self._responses[slot] = response
+            self._keys[slot] = key
+            self._slots[key] = slot
+
+    def _get_scope_id(self, scope: str) -> int:
+        """Get the ID of a scope, registering it and forgetting the least recently used one if needed (lock held)."""
+        scope_id = self._scope_ids.get(scope)
+        if scope_id is not None:
+            self._scope_ids.move_to_end(scope)
+            return scope_id
+
+        # IDs are never reused, so entries of a forgotten scope cannot match a new one
+        scope_id = self._next_scope_id
+        self._next_scope_id += 1
+        self._scope_ids[scope] = scope_id
+        if len(self._scope_ids) > MAX_SCOPES:
+            _, dropped = self._scope_ids.popitem(last=False)
+            stale = self._scopes[:self._size] == dropped
+            self._scopes[:self._size][stale] = -1
+            # Unreachable entries are the first to be evicted
+            self._last_used[:self._size][stale] = 0.0
+            logger.debug(f"Forgot semantic cache scope {dropped} ({int(stale.sum())} entries)")
+        return scope_id
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with size, hit/miss counters and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": self._size,
+                "capacity": self.capacity,
+                "scopes": len(self._scope_ids),
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+# Shared by every session in the process
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+def get_semantic_cache(cache_config: Dict[str, Any]) -> Optional[SemanticCache]:
+    """Get the process-wide semantic cache, creating it on first use.
+
+    Args:
+        cache_config: The ``semantic_cache`` section of the app configuration
+
+    Returns:
+        Shared SemanticCache instance, or None if it is disabled
+    """
+    global _semantic_cache
+    if not cache_config["enabled"]:
+        return None
+    with _semantic_cache_lock:
+        if _semantic_cache is None:
+            _semantic_cache = SemanticCache(
+                capacity=cache_config["capacity"],
+                threshold=cache_config["threshold"],
+                ttl=cache_config["ttl"]
+            )
+        return _semantic_cache
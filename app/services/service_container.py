@@ -0,0 +1,268 @@
+import copy
+import hashlib
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from openai import OpenAI
+from app.services.openai_client import close_client, get_openai_client
+from app.services.resilience import get_circuit_breaker
+from app.services.search_client import close_search_sessions
+from app.services.search_service import SearchService
+from app.services.websocket_client import WebSocketClient, handle_websocket_message, handle_websocket_error
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Per-session services kept before the least recently used are dropped
+MAX_SESSION_SERVICES = 1024
+
+# Incremented for every container built, so sessions can tell a rebuild happened
+_generations = itertools.count(1)
+
+# Settings read once by process-wide singletons the container does not own;
+# changing them only takes effect after the process is restarted
+RESTART_REQUIRED_SETTINGS = (
+    (("openai", "rate_limits"), "rate limiter"),
+    (("openai", "retry", "hedge_min_delay"), "hedger"),
+    (("response_cache",), "response cache"),
+    (("semantic_cache",), "semantic cache"),
+    (("search_cache",), "search result cache"),
+    (("jobs",), "job executor"),
+    (("aws", "submit"), "search submitter"),
+    (("circuit_breaker",), "circuit breakers"),
+    (("usage",), "usage tracker")
+)
+
+def config_fingerprint(config: Dict[str, Any]) -> str:
+    """Hash the parts of the configuration services are built from.
+
+    The ``app`` section only holds UI flags toggled at runtime, so changing
+    it does not invalidate any service.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        Hex digest identifying the configuration
+    """
+    relevant = {section: values for section, values in config.items() if section != "app"}
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True, default=str).encode()).hexdigest()
+
+def restart_required_changes(previous: Dict[str, Any], config: Dict[str, Any]) -> List[str]:
+    """List the process-wide services whose settings differ between two configurations.
+
+    Args:
+        previous: Configuration the process-wide singletons were built from
+        config: New configuration
+
+    Returns:
+        Names of the services that keep their old settings until a restart
+    """
+    def lookup(values: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+        for part in path:
+            values = values.get(part) if isinstance(values, dict) else None
+        return values
+
+    return [name for path, name in RESTART_REQUIRED_SETTINGS if lookup(previous, path) != lookup(config, path)]
+
+class ServiceContainer:
+    """Builds services once per configuration and hands out shared references.
+
+    Streamlit reruns the whole script on every interaction, so anything
+    built in a render function is rebuilt each time. The container keeps
+    the search service, the pooled OpenAI client, per-session services and
+    WebSocket clients alive across reruns until the configuration changes,
+    then closes them; requests still using them are aborted. Each container
+    has a ``generation``; a session whose WebSocket was opened on an older
+    generation has lost it to a rebuild and must reconnect.
+
+    The rate limiter, caches, hedger, job executor, search submitter, usage
+    tracker and circuit breakers are process-wide singletons built from the
+    first configuration and are not owned by the container: changes to their
+    settings (see RESTART_REQUIRED_SETTINGS) need a restart and are listed
+    under ``restart_required`` in the stats.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize an empty container for a configuration.
+
+        Args:
+            config: Application configuration the services are built from
+        """
+        self.config = config
+        self.fingerprint = config_fingerprint(config)
+        self.generation = next(_generations)
+        logger.info(f"Creating service container for configuration {self.fingerprint[:12]}")
+        self.created_at = time.time()
+        self._lock = threading.RLock()
+        self._search_service: Optional[SearchService] = None
+        self._session_services: OrderedDict = OrderedDict()
+        self._websocket_clients: Dict[str, WebSocketClient] = {}
+        self._builds = 0
+        self._hits = 0
+        self.restart_required: List[str] = []
+
+    def get_search_service(self) -> SearchService:
+        """Get the shared search service, building it on first use."""
+        with self._lock:
+            if self._search_service is None:
+                self._builds += 1
+                self._search_service = SearchService(
+                    api_endpoint=self.config["aws"]["api_endpoint"],
+                    api_key=self.config["aws"]["api_key"],
+                    circuit_breaker=get_circuit_breaker("search", self.config["circuit_breaker"]),
+                    pool_config=self.config["aws"]["pool"]
+                )
+            else:
+                self._hits += 1
+            return self._search_service
+
+    def get_openai_client(self) -> OpenAI:
+        """Get the pooled OpenAI client for the configured API key and base URL."""
+        openai_config = self.config["openai"]
+        return get_openai_client(
+            openai_config["api_key"], base_url=openai_config["base_url"], **openai_config["pool"]
+        )
+
+    def get_session_service(self, name: str, session_id: str, factory: Callable[[], Any]) -> Any:
+        """Get a service bound to one session, building it with ``factory`` on first use.
+
+        Args:
+            name: Service name, unique per kind of service
+            session_id: Session the service belongs to
+            factory: Builds the service from the current configuration
+
+        Returns:
+            The session's service instance
+        """
+        key: Tuple[str, str] = (name, session_id)
+        with self._lock:
+            service = self._session_services.get(key)
+            if service is not None:
+                self._hits += 1
+                self._session_services.move_to_end(key)
+                return service
+            self._builds += 1
+            logger.debug(f"Building {name} for session {session_id}")
+            service = factory()
+            self._session_services[key] = service
+            if len(self._session_services) > MAX_SESSION_SERVICES:
+                self._session_services.popitem(last=False)
+            return service
+
+    def create_websocket_client(self, session_id: str) -> WebSocketClient:
+        """Create a session's WebSocket client, disconnecting any previous one.
+
+        Args:
+            session_id: Session the client belongs to
+
+        Returns:
+            New, not yet connected WebSocketClient
+        """
+        client = WebSocketClient(
+            websocket_url=self.config["aws"]["websocket_url"],
+            on_message=handle_websocket_message,
+            on_error=handle_websocket_error
+        )
+        with self._lock:
+            previous = self._websocket_clients.pop(session_id, None)
+            self._websocket_clients[session_id] = client
+        if previous is not None:
+            previous.disconnect()
+        return client
+
+    def get_websocket_client(self, session_id: str) -> Optional[WebSocketClient]:
+        """Get a session's WebSocket client, or None if it has none."""
+        with self._lock:
+            return self._websocket_clients.get(session_id)
+
+    def release_websocket_client(self, session_id: str):
+        """Disconnect a session's WebSocket client and forget it."""
+        with self._lock:
+            client = self._websocket_clients.pop(session_id, None)
+        if client is not None:
+            client.disconnect()
+
+    def close(self):
+        """Release everything the container built."""
+        logger.info(f"Closing service container for configuration {self.fingerprint[:12]}")
+        with self._lock:
+            clients = list(self._websocket_clients.values())
+            self._websocket_clients.clear()
+            self._session_services.clear()
+            self._search_service = None
+        for client in clients:
+            client.disconnect()
+        close_search_sessions()
+        close_client(self.config["openai"]["api_key"], self.config["openai"]["base_url"])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get build and reuse counts of the container.
+
+        Returns:
+            Dictionary with the configuration fingerprint and service counts
+        """
+        with self._lock:
+            return {
+                "fingerprint": self.fingerprint[:12],
+                "generation": self.generation,
+                "age_seconds": round(time.time() - self.created_at, 1),
+                "builds": self._builds,
+                "reuses": self._hits,
+                "search_service": self._search_service is not None,
+                "session_services": len(self._session_services),
+                "websocket_clients": len(self._websocket_clients),
+                "restart_required": self.restart_required
+            }
+
+# Shared by every session in the process
+_container: Optional[ServiceContainer] = None
+_container_lock = threading.Lock()
+# Configuration of the first container, which the process-wide singletons were built from
+_process_config: Optional[Dict[str, Any]] = None
+
+def get_service_container(config: Dict[str, Any]) -> ServiceContainer:
+    """Get the process-wide service container for a configuration.
+
+    The container is rebuilt, and the previous one closed, whenever the
+    configuration fingerprint changes. Settings of process-wide singletons
+    that differ from the first configuration are logged, as they only apply
+    after a restart.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        Shared ServiceContainer instance
+    """
+    global _container, _process_config
+    fingerprint = config_fingerprint(config)
+    with _container_lock:
+        if _container is not None and _container.fingerprint == fingerprint:
+            return _container
+        previous = _container
+        if previous is not None:
+            logger.info("Configuration changed, rebuilding services")
+        if _process_config is None:
+            _process_config = copy.deepcopy(config)
+        _container = ServiceContainer(config)
+        container = _container
+        container.restart_required = restart_required_changes(_process_config, config)
+        if container.restart_required:
+            logger.warning(f"Restart required to apply changed settings of: {', '.join(container.restart_required)}")
+        # Closed under the lock so no service of the new container picks up a client about to be closed
+        if previous is not None:
+            previous.close()
+    return container
+
+def invalidate_service_container():
+    """Close the current service container so the next request rebuilds every service."""
+    global _container
+    with _container_lock:
+        previous = _container
+        _container = None
+        if previous is not None:
+            previous.close()
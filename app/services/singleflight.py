@@ -0,0 +1,186 @@
+import threading
+from typing import Callable, Dict, Any, Iterator, Tuple, TypeVar
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+class _Flight:
+    """State of one in-flight upstream call shared by its waiters."""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.chunks = []
+        self.result = None
+        self.error = None
+        self.done = False
+        self.readers = 0
+        self.cancelled = False
+
+class SingleFlight:
+    """Coalesces identical concurrent calls into one upstream execution.
+
+    The first caller for a key (the leader) runs the call; callers arriving
+    while it is in flight (followers) wait for and share its result. Nothing
+    is cached once the call finishes.
+    """
+
+    def __init__(self):
+        """Initialize the coalescer."""
+        logger.info("Initializing request coalescer")
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+
+    def _join(self, key: str) -> Tuple[_Flight, bool]:
+        """Join the flight for a key, starting one if none is running."""
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.collapsed += 1
+                flight.readers += 1
+                logger.debug("Joining in-flight request")
+                return flight, False
+            flight = _Flight()
+            flight.readers = 1
+            self._flights[key] = flight
+            self.executions += 1
+            return flight, True
+
+    def _finish(self, key: str, flight: _Flight):
+        """Mark a flight as done and wake its followers."""
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        with flight.cond:
+            flight.done = True
+            flight.cond.notify_all()
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run ``fn`` once for all concurrent callers with the same key.
+
+        Args:
+            key: Request identity (e.g. a hash of model, params and messages)
+            fn: Function performing the upstream call
+
+        Returns:
+            The result of the shared call (errors are re-raised to every waiter)
+        """
+        key = f"call:{key}"
+        flight, is_leader = self._join(key)
+        if not is_leader:
+            with flight.cond:
+                flight.cond.wait_for(lambda: flight.done)
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            self._finish(key, flight)
+
+    def do_stream(self, key: str, fn: Callable[[], Iterator[T]]) -> Iterator[T]:
+        """Share one upstream stream between all concurrent callers with the same key.
+
+        The first caller starts a worker thread that drains the upstream
+        stream into a shared buffer, so it advances at upstream speed rather
+        than at the pace of any one reader. Every caller, the first included,
+        replays the buffer and then follows live. A reader that stops early
+        only detaches itself; the upstream call is cancelled once the last
+        reader has left.
+
+        Args:
+            key: Request identity (e.g. a hash of model, params and messages)
+            fn: Function returning the upstream chunk iterator
+
+        Yields:
+            Chunks of the shared stream in order
+        """
+        key = f"stream:{key}"
+        flight, is_leader = self._join(key)
+        if is_leader:
+            pump = threading.Thread(target=self._pump, args=(key, flight, fn), name="singleflight-pump", daemon=True)
+            pump.start()
+
+        received = 0
+        try:
+            while True:
+                with flight.cond:
+                    flight.cond.wait_for(lambda: flight.done or len(flight.chunks) > received)
+                    new_chunks = flight.chunks[received:]
+                    done = flight.done
+                for chunk in new_chunks:
+                    received += 1
+                    yield chunk
+                if done:
+                    break
+        finally:
+            self._leave(key, flight)
+        if flight.error is not None:
+            raise flight.error
+
+    def _pump(self, key: str, flight: _Flight, fn: Callable[[], Iterator[T]]):
+        """Drain the upstream stream into the flight buffer until it ends or every reader has left."""
+        stream = None
+        try:
+            stream = fn()
+            for chunk in stream:
+                with flight.cond:
+                    flight.chunks.append(chunk)
+                    flight.cond.notify_all()
+                if flight.cancelled:
+                    logger.info("Shared stream has no readers left, cancelling upstream")
+                    break
+        except Exception as e:
+            logger.debug(f"Shared upstream stream failed: {str(e)}")
+            flight.error = e
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+            self._finish(key, flight)
+
+    def _leave(self, key: str, flight: _Flight):
+        """Detach a reader from a stream flight, cancelling it if nobody is left."""
+        with self._lock:
+            flight.readers -= 1
+            if flight.readers > 0 or flight.done:
+                return
+            # Later callers must start a new upstream call rather than join a cancelled one
+            flight.cancelled = True
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics.
+
+        Returns:
+            Dictionary with call, upstream execution and collapsed counts
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "upstream_calls": self.executions,
+                "collapsed": self.collapsed,
+                "in_flight": len(self._flights)
+            }
+
+# Shared by every session in the process
+_singleflight = SingleFlight()
+
+def get_singleflight() -> SingleFlight:
+    """Get the process-wide request coalescer.
+
+    Returns:
+        Shared SingleFlight instance
+    """
+    return _singleflight
@@ -0,0 +1,108 @@
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+from app.services.generation_profiles import ROUTE_SUMMARY
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SUMMARY_INSTRUCTIONS = (
+    "You maintain a running summary of a support conversation. "
+    "Update the existing summary with the new messages below. Keep facts, "
+    "user details, decisions and open questions; drop small talk. "
+    "Reply with the updated summary only."
+)
+
+class ConversationSummarizer:
+    """Folds the oldest conversation turns into a running summary.
+
+    Summaries are computed on a background thread and updated incrementally:
+    each update only sends the previous summary plus the newly folded
+    messages, never the whole history.
+    """
+
+    def __init__(self, openai_service, model: str = "gpt-3.5-turbo", threshold: int = 20, keep_recent: int = 6):
+        """Initialize the summarizer.
+
+        Args:
+            openai_service: OpenAIService used to generate summaries
+            model: OpenAI model used for summarization
+            threshold: Number of unsummarized messages that triggers an update
+            keep_recent: Number of latest messages always sent verbatim
+        """
+        logger.info("Initializing conversation summarizer")
+        self.openai_service = openai_service
+        self.model = model
+        self.threshold = threshold
+        self.keep_recent = keep_recent
+        self.summary: Optional[Dict[str, Any]] = None
+        self.summary_text = ""
+        self.summarized_count = 0
+        self.thread = None
+        self._lock = threading.Lock()
+
+    def get_state(self) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Get the running summary message and how many messages it replaces.
+
+        Returns:
+            Tuple of the summary message (None before the first update) and the folded message count
+        """
+        with self._lock:
+            return self.summary, self.summarized_count
+
+    def maybe_schedule(self, messages: List[Dict[str, Any]]) -> bool:
+        """Start a background summary update if the history exceeds the threshold.
+
+        Args:
+            messages: Full conversation history
+
+        Returns:
+            True if an update was started, False otherwise
+        """
+        if self.thread is not None and self.thread.is_alive():
+            logger.debug("Summary update already running")
+            return False
+
+        with self._lock:
+            summarized_count = self.summarized_count
+            previous = self.summary_text
+
+        history = [msg for msg in messages if msg["role"] != "system"]
+        pending = len(history) - summarized_count
+        if pending <= self.threshold:
+            return False
+
+        to_fold = history[summarized_count:len(history) - self.keep_recent]
+        if not to_fold:
+            return False
+
+        logger.info(f"Scheduling summary update for {len(to_fold)} messages")
+        chunk = [{"role": msg["role"], "content": msg["content"]} for msg in to_fold]
+        self.thread = threading.Thread(target=self._update, args=(previous, chunk))
+        self.thread.daemon = True
+        self.thread.start()
+        return True
+
+    def _update(self, previous: str, chunk: List[Dict[str, str]]):
+        """Fold a chunk of messages into the summary (runs on a background thread)."""
+        try:
+            transcript = "\n".join(f"{msg['role']}: {msg['content']}" for msg in chunk)
+            prompt = [
+                {"role": "system", "content": SUMMARY_INSTRUCTIONS},
+                {
+                    "role": "user",
+                    "content": f"Existing summary:\n{previous or '(none)'}\n\nNew messages:\n{transcript}"
+                }
+            ]
+            summary_text = self.openai_service.generate_response(prompt, model=self.model, route=ROUTE_SUMMARY)
+
+            with self._lock:
+                self.summary_text = summary_text
+                self.summary = {
+                    "role": "system",
+                    "content": f"Summary of the earlier conversation:\n{summary_text}"
+                }
+                self.summarized_count += len(chunk)
+            logger.info(f"Summary updated, {self.summarized_count} messages folded")
+
+        except Exception as e:
+            logger.error(f"Error updating conversation summary: {str(e)}", exc_info=True)
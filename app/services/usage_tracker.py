@@ -0,0 +1,225 @@
+import csv
+import io
+import json
+import threading
+import time
+from collections import deque
+from typing import List, Dict, Any, Optional
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Columns of a usage record, in export order
+USAGE_FIELDS = (
+    "timestamp",
+    "session_id",
+    "model",
+    "route",
+    "prompt_tokens",
+    "completion_tokens",
+    "cached_tokens",
+    "time_to_first_token",
+    "latency",
+    "cache_hit",
+    "coalesced",
+    "cancelled",
+    "estimated",
+    "cost"
+)
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of values, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+class UsageTracker:
+    """Per-turn token, latency and cost accounting for OpenAI requests.
+
+    Records are kept in a bounded in-memory ring buffer, so the oldest turns
+    fall off once ``capacity`` is reached. Aggregates by model/route and by
+    session are recomputed at most every ``aggregate_interval`` seconds,
+    keeping the sidebar cheap to render on every rerun.
+    """
+
+    def __init__(self, capacity: int = 10000, aggregate_interval: float = 10.0, prices: Optional[Dict[str, Any]] = None):
+        """Initialize the usage tracker.
+
+        Args:
+            capacity: Maximum number of records kept
+            aggregate_interval: Seconds an aggregate snapshot is reused
+            prices: Optional USD prices per 1M tokens, ``{model: (prompt, completion)}``
+        """
+        logger.info("Initializing usage tracker")
+        logger.debug(f"Usage tracker: capacity={capacity}, aggregate_interval={aggregate_interval}")
+        self.capacity = capacity
+        self.aggregate_interval = aggregate_interval
+        self.prices = prices or {}
+        self._records: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._total_recorded = 0
+        self._aggregates: Optional[Dict[str, Any]] = None
+        self._aggregated_at = 0.0
+
+    def record(
+        self,
+        session_id: str,
+        model: str,
+        route: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0,
+        time_to_first_token: Optional[float] = None,
+        latency: float = 0.0,
+        cache_hit: bool = False,
+        coalesced: bool = False,
+        cancelled: bool = False,
+        estimated: bool = False
+    ):
+        """Record the usage of one request.
+
+        Args:
+            session_id: Session the request belonged to
+            model: OpenAI model used
+            route: Request route (chat, short, summary, ...)
+            prompt_tokens: Prompt tokens billed
+            completion_tokens: Completion tokens billed
+            cached_tokens: Prompt tokens served from the provider's prompt cache
+            time_to_first_token: Seconds until the first delta (streaming only)
+            latency: Total seconds until the response was complete
+            cache_hit: Whether the response came from a local cache
+            coalesced: Whether the response was shared from an identical in-flight request
+            cancelled: Whether the request was abandoned before finishing
+            estimated: Whether token counts were estimated locally rather than reported
+        """
+        prompt_price, completion_price = self.prices.get(model, (0.0, 0.0))
+        record = {
+            "timestamp": round(time.time(), 3),
+            "session_id": session_id,
+            "model": model,
+            "route": route,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_tokens": cached_tokens,
+            "time_to_first_token": round(time_to_first_token, 3) if time_to_first_token is not None else None,
+            "latency": round(latency, 3),
+            "cache_hit": cache_hit,
+            "coalesced": coalesced,
+            "cancelled": cancelled,
+            "estimated": estimated,
+            "cost": round((prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000, 6)
+        }
+        with self._lock:
+            self._records.append(record)
+            self._total_recorded += 1
+        logger.debug(f"Recorded usage: {record}")
+
+    def get_records(self) -> List[Dict[str, Any]]:
+        """Get a snapshot of the buffered records, oldest first."""
+        with self._lock:
+            return list(self._records)
+
+    def get_aggregates(self) -> Dict[str, Any]:
+        """Get usage aggregated by model/route and by session.
+
+        Returns:
+            Dictionary with ``by_model_route`` and ``by_session`` totals
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._aggregates is not None and now - self._aggregated_at < self.aggregate_interval:
+                return self._aggregates
+            records = list(self._records)
+            total_recorded = self._total_recorded
+
+        aggregates = {
+            "records": len(records),
+            "total_recorded": total_recorded,
+            "by_model_route": self._aggregate(records, lambda record: f"{record['model']}/{record['route']}"),
+            "by_session": self._aggregate(records, lambda record: record["session_id"])
+        }
+        with self._lock:
+            self._aggregates = aggregates
+            self._aggregated_at = now
+        return aggregates
+
+    @staticmethod
+    def _aggregate(records: List[Dict[str, Any]], key) -> Dict[str, Any]:
+        """Sum tokens and cost and summarize latencies per group."""
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            groups.setdefault(key(record), []).append(record)
+
+        result = {}
+        for name, group in groups.items():
+            upstream = [record for record in group if not record["cache_hit"] and not record["coalesced"]]
+            latencies = [record["latency"] for record in upstream if not record["cancelled"]]
+            first_tokens = [
+                record["time_to_first_token"] for record in upstream
+                if record["time_to_first_token"] is not None
+            ]
+            prompt_cached = [record for record in upstream if record["cached_tokens"]]
+            prompt_uncached = [record for record in upstream if not record["cached_tokens"]]
+            prompt_tokens = sum(record["prompt_tokens"] for record in group)
+            cached_tokens = sum(record["cached_tokens"] for record in group)
+            result[name] = {
+                "requests": len(group),
+                "cache_hits": sum(1 for record in group if record["cache_hit"]),
+                "coalesced": sum(1 for record in group if record["coalesced"]),
+                "cancelled": sum(1 for record in group if record["cancelled"]),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": sum(record["completion_tokens"] for record in group),
+                "cached_tokens": cached_tokens,
+                "prompt_cache_ratio": round(cached_tokens / prompt_tokens, 3) if prompt_tokens else 0.0,
+                "cost": round(sum(record["cost"] for record in group), 6),
+                "latency_p50": _percentile(latencies, 0.5),
+                "latency_p95": _percentile(latencies, 0.95),
+                "ttft_p50": _percentile(first_tokens, 0.5),
+                "ttft_p95": _percentile(first_tokens, 0.95),
+                # Compare these two to see what the provider prompt cache saves
+                "latency_p50_prompt_cached": _percentile(
+                    [record["latency"] for record in prompt_cached if not record["cancelled"]], 0.5
+                ),
+                "latency_p50_prompt_uncached": _percentile(
+                    [record["latency"] for record in prompt_uncached if not record["cancelled"]], 0.5
+                )
+            }
+        return result
+
+    def export_csv(self) -> str:
+        """Export the buffered records as CSV text."""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=USAGE_FIELDS)
+        writer.writeheader()
+        writer.writerows(self.get_records())
+        return buffer.getvalue()
+
+    def export_jsonl(self) -> str:
+        """Export the buffered records as JSON Lines text."""
+        return "".join(json.dumps(record) + "\n" for record in self.get_records())
+
+# Shared by every session in the process
+_usage_tracker: Optional[UsageTracker] = None
+_usage_tracker_lock = threading.Lock()
+
+def get_usage_tracker(usage_config: Dict[str, Any]) -> Optional[UsageTracker]:
+    """Get the process-wide usage tracker, creating it on first use.
+
+    Args:
+        usage_config: The ``usage`` section of the app configuration
+
+    Returns:
+        Shared UsageTracker instance, or None if accounting is disabled
+    """
+    global _usage_tracker
+    if not usage_config["enabled"]:
+        return None
+    with _usage_tracker_lock:
+        if _usage_tracker is None:
+            _usage_tracker = UsageTracker(
+                capacity=usage_config["capacity"],
+                aggregate_interval=usage_config["aggregate_interval"],
+                prices=usage_config["prices"]
+            )
+        return _usage_tracker
@@ -5,6 +5,8 @@ import time
 from typing import Callable, Optional, Dict, Any
 import websocket
 import streamlit as st
+from app.services.search_cache import get_search_cache
+from app.utils.config import get_config
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -112,26 +114,8 @@ def handle_websocket_message(data: Dict[str, Any]):
     try:
         if "search_results" in data:
             logger.info(f"Received search results: {len(data['search_results'])} items")
+            apply_search_results(data)
             
-            # Store search results in session state
-            st.session_state.search_results = data["search_results"]
-            logger.debug(f"Stored {len(data['search_results'])} search results in session state")
-            
-            # Add assistant message with search results
-            if data["search_results"]:
-                logger.info("Formatting search results for display")
-                result_text = "Here are the search results:\n\n"
-                for idx, result in enumerate(data["search_results"], 1):
-                    result_text += f"{idx}. {result['title']}: {result['snippet']}\n"
-                
-                from app.utils.session import add_message
-                logger.debug("Adding assistant message with search results")
-                add_message("assistant", result_text)
-            else:
-                logger.info("No search results found")
-                from app.utils.session import add_message
-                add_message("assistant", "No search results found.")
-                
             # Force Streamlit to update the UI
             logger.debug("Triggering Streamlit rerun to update UI")
             st.rerun()
@@ -142,6 +126,59 @@ def handle_websocket_message(data: Dict[str, Any]):
     except Exception as e:
         logger.error(f"Error handling WebSocket message: {str(e)}", exc_info=True)
 
+def apply_search_results(data: Dict[str, Any], from_cache: bool = False) -> str:
+    """Store search results and add them to the conversation.
+    
+    Results received from the search API are also put in the search result
+    cache under the conversation and query that produced them, but only
+    when that query is known for certain (see ``pop_search_query``);
+    results that cannot be attributed are shown without being cached.
+    
+    Args:
+        data: Message data with ``search_results`` and optionally ``request_id``
+        from_cache: Whether the results were served from the search result cache
+        
+    Returns:
+        Text of the assistant message added for the results
+    """
+    from app.utils.session import add_message, pop_search_query
+    
+    # Resolve the placeholder of the background search these results answer
+    request_id = data.get("request_id")
+    if request_id:
+        for message in st.session_state.messages:
+            if message.get("search_request_id") == request_id:
+                logger.debug(f"Search results answer request {request_id}")
+                message["search_status"] = "completed"
+    
+    query = None if from_cache else pop_search_query(request_id)
+    search_cache = get_search_cache(get_config()["search_cache"])
+    if query and data["search_results"] and search_cache is not None:
+        logger.debug("Caching search results")
+        conversation_id = st.session_state.conversation_id or "new_conversation"
+        search_cache.put(query, conversation_id, data["search_results"])
+    elif not from_cache and query is None:
+        logger.debug("Search results not attributed to a query, not caching them")
+    
+    # Store search results in session state
+    st.session_state.search_results = data["search_results"]
+    logger.debug(f"Stored {len(data['search_results'])} search results in session state")
+    
+    # Add assistant message with search results
+    if data["search_results"]:
+        logger.info("Formatting search results for display")
+        result_text = "Here are the search results:\n\n"
+        for idx, result in enumerate(data["search_results"], 1):
+            result_text += f"{idx}. {result['title']}: {result['snippet']}\n"
+        
+        logger.debug("Adding assistant message with search results")
+        add_message("assistant", result_text)
+        return result_text
+    
+    logger.info("No search results found")
+    add_message("assistant", "No search results found.", status=True)
+    return "No search results found."
+
 def handle_websocket_error(error):
     """Handle WebSocket errors in the Streamlit app.
     
@@ -1,11 +1,84 @@
+import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 import streamlit as st
 from dotenv import load_dotenv
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+def _parse_model_map(value: str) -> Dict[str, int]:
+    """Parse a comma-separated ``model=value`` list into a dictionary.
+    
+    Args:
+        value: String such as ``"gpt-3.5-turbo=12000,gpt-4=6000"``
+        
+    Returns:
+        Dictionary mapping model names to integer values
+    """
+    result = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        model, _, amount = item.partition("=")
+        try:
+            result[model.strip()] = int(amount)
+        except ValueError:
+            logger.warning(f"Ignoring invalid model setting: {item}")
+    return result
+
+def _parse_price_map(value: str) -> Dict[str, Tuple[float, float]]:
+    """Parse a comma-separated ``model=prompt:completion`` price list.
+    
+    Args:
+        value: String such as ``"gpt-3.5-turbo=0.5:1.5,gpt-4=30:60"`` (USD per 1M tokens)
+        
+    Returns:
+        Dictionary mapping model names to (prompt, completion) prices
+    """
+    result = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        model, _, prices = item.partition("=")
+        prompt_price, _, completion_price = prices.partition(":")
+        try:
+            result[model.strip()] = (float(prompt_price), float(completion_price or prompt_price))
+        except ValueError:
+            logger.warning(f"Ignoring invalid model price: {item}")
+    return result
+
+# Keys a generation profile may set
+PROFILE_KEYS = ("max_tokens", "temperature", "top_p", "stop", "frequency_penalty", "presence_penalty")
+
+def _parse_profiles(value: str) -> Dict[str, Dict[str, Any]]:
+    """Parse a JSON object of named generation profiles.
+    
+    Args:
+        value: JSON such as ``{"short": {"max_tokens": 256, "stop": ["\\n\\n"]}}``
+        
+    Returns:
+        Dictionary mapping names to profiles containing only supported keys
+    """
+    if not value.strip():
+        return {}
+    try:
+        raw = json.loads(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid generation profiles: {value}")
+        return {}
+    
+    profiles = {}
+    for name, profile in raw.items():
+        if not isinstance(profile, dict):
+            logger.warning(f"Ignoring invalid generation profile: {name}")
+            continue
+        unknown = set(profile) - set(PROFILE_KEYS)
+        if unknown:
+            logger.warning(f"Ignoring unknown keys in generation profile {name}: {sorted(unknown)}")
+        profiles[name] = {key: profile[key] for key in PROFILE_KEYS if key in profile}
+    return profiles
+
 def load_config() -> Dict[str, Any]:
     """Load configuration from environment variables and Streamlit secrets.
     
@@ -24,25 +97,187 @@ def load_config() -> Dict[str, Any]:
     config = {
         "openai": {
             "api_key": os.environ.get("OPENAI_API_KEY", ""),
-            "default_model": "gpt-4"
+            "default_model": "gpt-4",
+            "stream": os.environ.get("OPENAI_STREAM", "true").lower() == "true",
+            "base_url": os.environ.get("OPENAI_BASE_URL") or None,
+            "pool": {
+                "max_connections": int(os.environ.get("OPENAI_MAX_CONNECTIONS", "20")),
+                "max_keepalive_connections": int(os.environ.get("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "10")),
+                "keepalive_expiry": float(os.environ.get("OPENAI_KEEPALIVE_EXPIRY", "60"))
+            },
+            "context_budgets": _parse_model_map(
+                os.environ.get("OPENAI_CONTEXT_BUDGETS", "gpt-3.5-turbo=12000,gpt-4=6000")
+            ),
+            "default_context_budget": int(os.environ.get("OPENAI_DEFAULT_CONTEXT_BUDGET", "3000")),
+            "coalesce_requests": os.environ.get("OPENAI_COALESCE_REQUESTS", "true").lower() == "true",
+            "async": os.environ.get("OPENAI_ASYNC", "false").lower() == "true",
+            "prompt": {
+                "preamble": os.environ.get("OPENAI_SYSTEM_PROMPT", ""),
+                "trim_slack": float(os.environ.get("OPENAI_PROMPT_TRIM_SLACK", "0.25"))
+            },
+            "generation": {
+                "model_profiles": _parse_profiles(os.environ.get("OPENAI_MODEL_PROFILES", "")),
+                "route_profiles": _parse_profiles(os.environ.get(
+                    "OPENAI_ROUTE_PROFILES",
+                    '{"summary": {"max_tokens": 500, "temperature": 0.3}}'
+                )),
+                "context_windows": _parse_model_map(
+                    os.environ.get("OPENAI_CONTEXT_WINDOWS", "gpt-3.5-turbo=16385,gpt-4=8192")
+                ),
+                "default_context_window": int(os.environ.get("OPENAI_DEFAULT_CONTEXT_WINDOW", "4096")),
+                "min_completion_tokens": int(os.environ.get("OPENAI_MIN_COMPLETION_TOKENS", "64"))
+            },
+            "rate_limits": {
+                "requests_per_minute": _parse_model_map(os.environ.get("OPENAI_RATE_LIMIT_RPM", "")),
+                "tokens_per_minute": _parse_model_map(os.environ.get("OPENAI_RATE_LIMIT_TPM", "")),
+                "max_wait": float(os.environ.get("OPENAI_RATE_LIMIT_MAX_WAIT", "30"))
+            },
+            "retry": {
+                "timeout": float(os.environ.get("OPENAI_TIMEOUT", "60")),
+                "max_retries": int(os.environ.get("OPENAI_MAX_RETRIES", "2")),
+                "base_delay": float(os.environ.get("OPENAI_RETRY_BASE_DELAY", "0.5")),
+                "max_delay": float(os.environ.get("OPENAI_RETRY_MAX_DELAY", "8")),
+                "hedge": os.environ.get("OPENAI_HEDGE_REQUESTS", "false").lower() == "true",
+                "hedge_min_delay": float(os.environ.get("OPENAI_HEDGE_MIN_DELAY", "2"))
+            }
+        },
+        "jobs": {
+            "enabled": os.environ.get("BACKGROUND_JOBS_ENABLED", "true").lower() == "true",
+            "max_workers": int(os.environ.get("BACKGROUND_JOBS_MAX_WORKERS", "8")),
+            "max_queued": int(os.environ.get("BACKGROUND_JOBS_MAX_QUEUED", "32")),
+            "max_async": int(os.environ.get("BACKGROUND_JOBS_MAX_ASYNC", "256"))
+        },
+        "router": {
+            "fast_model": os.environ.get("ROUTER_FAST_MODEL", "gpt-3.5-turbo"),
+            "strong_model": os.environ.get("ROUTER_STRONG_MODEL", "gpt-4"),
+            "complexity_threshold": float(os.environ.get("ROUTER_COMPLEXITY_THRESHOLD", "0.35")),
+            "short_threshold": float(os.environ.get("ROUTER_SHORT_THRESHOLD", "0.1")),
+            "search_keywords": tuple(
+                keyword.strip() for keyword in os.environ.get(
+                    "SEARCH_KEYWORDS",
+                    "search,find,look up,lookup,search for,find information,get information,retrieve"
+                ).split(",") if keyword.strip()
+            ),
+            "intent_classifier": {
+                "enabled": os.environ.get("INTENT_CLASSIFIER_ENABLED", "true").lower() == "true",
+                "model_path": os.environ.get("INTENT_MODEL_PATH") or None
+            },
+            "speculative": {
+                "enabled": os.environ.get("SPECULATIVE_ROUTING_ENABLED", "false").lower() == "true",
+                "min_score": float(os.environ.get("SPECULATIVE_ROUTING_MIN_SCORE", "0.3")),
+                "max_score": float(os.environ.get("SPECULATIVE_ROUTING_MAX_SCORE", "0.7"))
+            }
+        },
+        "response_cache": {
+            "enabled": os.environ.get("RESPONSE_CACHE_ENABLED", "true").lower() == "true",
+            "capacity": int(os.environ.get("RESPONSE_CACHE_CAPACITY", "1000")),
+            "ttl": float(os.environ.get("RESPONSE_CACHE_TTL", "3600")),
+            "sqlite_path": os.environ.get("RESPONSE_CACHE_PATH") or None
+        },
+        "semantic_cache": {
+            "enabled": os.environ.get("SEMANTIC_CACHE_ENABLED", "false").lower() == "true",
+            "capacity": int(os.environ.get("SEMANTIC_CACHE_CAPACITY", "10000")),
+            "threshold": float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.9")),
+            "ttl": float(os.environ.get("SEMANTIC_CACHE_TTL", "3600"))
+        },
+        "search_cache": {
+            "enabled": os.environ.get("SEARCH_CACHE_ENABLED", "true").lower() == "true",
+            "capacity": int(os.environ.get("SEARCH_CACHE_CAPACITY", "500")),
+            "ttl": float(os.environ.get("SEARCH_CACHE_TTL", "900"))
+        },
+        "summary": {
+            "enabled": os.environ.get("SUMMARY_ENABLED", "true").lower() == "true",
+            "model": os.environ.get("SUMMARY_MODEL", "gpt-3.5-turbo"),
+            "threshold": int(os.environ.get("SUMMARY_THRESHOLD", "20")),
+            "keep_recent": int(os.environ.get("SUMMARY_KEEP_RECENT", "6"))
+        },
+        "circuit_breaker": {
+            "enabled": os.environ.get("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true",
+            "failure_rate": float(os.environ.get("CIRCUIT_BREAKER_FAILURE_RATE", "0.5")),
+            "min_calls": int(os.environ.get("CIRCUIT_BREAKER_MIN_CALLS", "5")),
+            "window": int(os.environ.get("CIRCUIT_BREAKER_WINDOW", "20")),
+            "slow_call_seconds": float(os.environ.get("CIRCUIT_BREAKER_SLOW_CALL_SECONDS", "30")),
+            "reset_timeout": float(os.environ.get("CIRCUIT_BREAKER_RESET_TIMEOUT", "30"))
+        },
+        "usage": {
+            "enabled": os.environ.get("USAGE_TRACKING_ENABLED", "true").lower() == "true",
+            "capacity": int(os.environ.get("USAGE_TRACKING_CAPACITY", "10000")),
+            "aggregate_interval": float(os.environ.get("USAGE_TRACKING_AGGREGATE_INTERVAL", "10")),
+            "prices": _parse_price_map(os.environ.get("USAGE_PRICES", "gpt-3.5-turbo=0.5:1.5,gpt-4=30:60"))
         },
         "aws": {
             "api_endpoint": os.environ.get("AWS_API_ENDPOINT", ""),
             "websocket_url": os.environ.get("AWS_WEBSOCKET_URL", ""),
-            "api_key": os.environ.get("AWS_API_KEY", "")
+            "api_key": os.environ.get("AWS_API_KEY", ""),
+            "client_conversation_ids": os.environ.get("CLIENT_CONVERSATION_IDS", "false").lower() == "true",
+            "pool": {
+                "pool_maxsize": int(os.environ.get("AWS_API_POOL_MAXSIZE", "10")),
+                "connect_timeout": float(os.environ.get("AWS_API_CONNECT_TIMEOUT", "3.05")),
+                "read_timeout": float(os.environ.get("AWS_API_READ_TIMEOUT", "10")),
+                "max_retries": int(os.environ.get("AWS_API_MAX_RETRIES", "2")),
+                "retry_backoff": float(os.environ.get("AWS_API_RETRY_BACKOFF", "0.3"))
+            },
+            "submit": {
+                "async": os.environ.get("AWS_API_ASYNC_SUBMIT", "false").lower() == "true",
+                "max_workers": int(os.environ.get("AWS_API_SUBMIT_WORKERS", "4")),
+                "max_pending": int(os.environ.get("AWS_API_SUBMIT_MAX_PENDING", "64"))
+            }
         },
         "app": {
-            "debug": os.environ.get("DEBUG", "false").lower() == "true"
+            "debug": os.environ.get("DEBUG", "false").lower() == "true",
+            "keep_partial_responses": os.environ.get("KEEP_PARTIAL_RESPONSES", "true").lower() == "true"
         }
     }
     
     # Log environment variables (without sensitive values)
     logger.debug("Environment variables loaded:")
     logger.debug(f"OPENAI_API_KEY: {'[SET]' if os.environ.get('OPENAI_API_KEY') else '[NOT SET]'}")
+    logger.debug(f"OPENAI_STREAM: {os.environ.get('OPENAI_STREAM', 'true')}")
+    logger.debug(f"OPENAI_BASE_URL: {os.environ.get('OPENAI_BASE_URL', '[NOT SET]')}")
+    logger.debug(f"OPENAI_MAX_CONNECTIONS: {os.environ.get('OPENAI_MAX_CONNECTIONS', '20')}")
+    logger.debug(f"OPENAI_MAX_KEEPALIVE_CONNECTIONS: {os.environ.get('OPENAI_MAX_KEEPALIVE_CONNECTIONS', '10')}")
+    logger.debug(f"OPENAI_KEEPALIVE_EXPIRY: {os.environ.get('OPENAI_KEEPALIVE_EXPIRY', '60')}")
+    logger.debug(f"OPENAI_CONTEXT_BUDGETS: {os.environ.get('OPENAI_CONTEXT_BUDGETS', '[NOT SET]')}")
+    logger.debug(f"OPENAI_COALESCE_REQUESTS: {os.environ.get('OPENAI_COALESCE_REQUESTS', 'true')}")
+    logger.debug(f"OPENAI_RATE_LIMIT_RPM: {os.environ.get('OPENAI_RATE_LIMIT_RPM', '[NOT SET]')}")
+    logger.debug(f"OPENAI_RATE_LIMIT_TPM: {os.environ.get('OPENAI_RATE_LIMIT_TPM', '[NOT SET]')}")
+    logger.debug(f"OPENAI_TIMEOUT: {os.environ.get('OPENAI_TIMEOUT', '60')}")
+    logger.debug(f"OPENAI_MAX_RETRIES: {os.environ.get('OPENAI_MAX_RETRIES', '2')}")
+    logger.debug(f"OPENAI_HEDGE_REQUESTS: {os.environ.get('OPENAI_HEDGE_REQUESTS', 'false')}")
+    logger.debug(f"OPENAI_SYSTEM_PROMPT: {'[SET]' if os.environ.get('OPENAI_SYSTEM_PROMPT') else '[NOT SET]'}")
+    logger.debug(f"OPENAI_PROMPT_TRIM_SLACK: {os.environ.get('OPENAI_PROMPT_TRIM_SLACK', '0.25')}")
+    logger.debug(f"OPENAI_MODEL_PROFILES: {os.environ.get('OPENAI_MODEL_PROFILES', '[NOT SET]')}")
+    logger.debug(f"OPENAI_ROUTE_PROFILES: {os.environ.get('OPENAI_ROUTE_PROFILES', '[NOT SET]')}")
+    logger.debug(f"OPENAI_CONTEXT_WINDOWS: {os.environ.get('OPENAI_CONTEXT_WINDOWS', '[NOT SET]')}")
+    logger.debug(f"OPENAI_ASYNC: {os.environ.get('OPENAI_ASYNC', 'false')}")
+    logger.debug(f"BACKGROUND_JOBS_ENABLED: {os.environ.get('BACKGROUND_JOBS_ENABLED', 'true')}")
+    logger.debug(f"BACKGROUND_JOBS_MAX_ASYNC: {os.environ.get('BACKGROUND_JOBS_MAX_ASYNC', '256')}")
+    logger.debug(f"ROUTER_COMPLEXITY_THRESHOLD: {os.environ.get('ROUTER_COMPLEXITY_THRESHOLD', '0.35')}")
+    logger.debug(f"ROUTER_SHORT_THRESHOLD: {os.environ.get('ROUTER_SHORT_THRESHOLD', '0.1')}")
+    logger.debug(f"SEARCH_KEYWORDS: {os.environ.get('SEARCH_KEYWORDS', '[NOT SET]')}")
+    logger.debug(f"INTENT_CLASSIFIER_ENABLED: {os.environ.get('INTENT_CLASSIFIER_ENABLED', 'true')}")
+    logger.debug(f"INTENT_MODEL_PATH: {os.environ.get('INTENT_MODEL_PATH', '[NOT SET]')}")
+    logger.debug(f"SPECULATIVE_ROUTING_ENABLED: {os.environ.get('SPECULATIVE_ROUTING_ENABLED', 'false')}")
+    logger.debug(f"RESPONSE_CACHE_ENABLED: {os.environ.get('RESPONSE_CACHE_ENABLED', 'true')}")
+    logger.debug(f"RESPONSE_CACHE_PATH: {os.environ.get('RESPONSE_CACHE_PATH', '[NOT SET]')}")
+    logger.debug(f"SEMANTIC_CACHE_ENABLED: {os.environ.get('SEMANTIC_CACHE_ENABLED', 'false')}")
+    logger.debug(f"SEARCH_CACHE_ENABLED: {os.environ.get('SEARCH_CACHE_ENABLED', 'true')}")
+    logger.debug(f"SEARCH_CACHE_TTL: {os.environ.get('SEARCH_CACHE_TTL', '900')}")
+    logger.debug(f"SUMMARY_ENABLED: {os.environ.get('SUMMARY_ENABLED', 'true')}")
+    logger.debug(f"CIRCUIT_BREAKER_ENABLED: {os.environ.get('CIRCUIT_BREAKER_ENABLED', 'true')}")
+    logger.debug(f"USAGE_TRACKING_ENABLED: {os.environ.get('USAGE_TRACKING_ENABLED', 'true')}")
+    logger.debug(f"USAGE_PRICES: {os.environ.get('USAGE_PRICES', '[NOT SET]')}")
     logger.debug(f"AWS_API_ENDPOINT: {os.environ.get('AWS_API_ENDPOINT', '[NOT SET]')}")
     logger.debug(f"AWS_WEBSOCKET_URL: {os.environ.get('AWS_WEBSOCKET_URL', '[NOT SET]')}")
     logger.debug(f"AWS_API_KEY: {'[SET]' if os.environ.get('AWS_API_KEY') else '[NOT SET]'}")
+    logger.debug(f"CLIENT_CONVERSATION_IDS: {os.environ.get('CLIENT_CONVERSATION_IDS', 'false')}")
+    logger.debug(f"AWS_API_POOL_MAXSIZE: {os.environ.get('AWS_API_POOL_MAXSIZE', '10')}")
+    logger.debug(f"AWS_API_CONNECT_TIMEOUT: {os.environ.get('AWS_API_CONNECT_TIMEOUT', '3.05')}")
+    logger.debug(f"AWS_API_READ_TIMEOUT: {os.environ.get('AWS_API_READ_TIMEOUT', '10')}")
+    logger.debug(f"AWS_API_MAX_RETRIES: {os.environ.get('AWS_API_MAX_RETRIES', '2')}")
+    logger.debug(f"AWS_API_ASYNC_SUBMIT: {os.environ.get('AWS_API_ASYNC_SUBMIT', 'false')}")
     logger.debug(f"DEBUG: {os.environ.get('DEBUG', 'false')}")
+    logger.debug(f"KEEP_PARTIAL_RESPONSES: {os.environ.get('KEEP_PARTIAL_RESPONSES', 'true')}")
         
     # Validate configuration
     logger.info("Validating configuration")
@@ -0,0 +1,46 @@
+import secrets
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_timestamp = 0
+_counter = 0
+
+def uuid7() -> uuid.UUID:
+    """Generate a time-ordered UUID version 7 (RFC 9562).
+
+    The first 48 bits are the Unix time in milliseconds, so IDs sort by
+    creation time and land next to each other in B-tree indexes. Within
+    one millisecond a 12-bit counter, started at a random value, keeps the
+    IDs generated by this process in order.
+
+    Returns:
+        New UUID
+    """
+    global _last_timestamp, _counter
+    with _lock:
+        timestamp = time.time_ns() // 1_000_000
+        if timestamp <= _last_timestamp:
+            timestamp = _last_timestamp
+            _counter += 1
+            if _counter > 0xFFF:
+                # Counter exhausted; borrow the next millisecond
+                timestamp += 1
+                _counter = 0
+        else:
+            # Random start in the lower half leaves room to count up
+            _counter = secrets.randbits(11)
+        _last_timestamp = timestamp
+        counter = _counter
+
+    value = (timestamp & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= counter << 64
+    value |= 0b10 << 62
+    value |= secrets.randbits(62)
+    return uuid.UUID(int=value)
+
+def new_conversation_id() -> str:
+    """Allocate a conversation ID on the client."""
+    return str(uuid7())
@@ -0,0 +1,79 @@
+from typing import List, Dict, Any, Optional
+from app.utils.logger import get_logger
+from app.utils.tokens import count_message_tokens
+
+logger = get_logger(__name__)
+
+class PromptAssembler:
+    """Builds chat prompts whose prefix stays byte-identical across turns.
+
+    Provider-side prompt caching only applies to an exact prefix match, so
+    the prompt is laid out as: fixed preamble, system messages, running
+    summary, then an append-only window of the conversation. When the
+    window outgrows the budget its start moves forward far enough to leave
+    ``trim_slack`` of the budget free, so the next few turns only append
+    instead of shifting the prefix every turn. Each model keeps its own
+    window, since providers cache per model.
+    """
+
+    def __init__(self, preamble: str = "", trim_slack: float = 0.25):
+        """Initialize the assembler.
+
+        Args:
+            preamble: Fixed system prompt always sent first (empty for none)
+            trim_slack: Fraction of the budget left free after trimming the window
+        """
+        self.preamble = {"role": "system", "content": preamble} if preamble else None
+        self.trim_slack = trim_slack
+        self.window_starts: Dict[str, int] = {}
+
+    def assemble(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        budget: int,
+        summary: Optional[Dict[str, Any]] = None,
+        summarized_count: int = 0
+    ) -> List[Dict[str, str]]:
+        """Build the prompt for a model from the conversation history.
+
+        Args:
+            messages: Full conversation history from session state
+            model: OpenAI model the prompt is for
+            budget: Maximum number of prompt tokens
+            summary: Optional running summary message
+            summarized_count: Number of leading conversation messages the summary replaces
+
+        Returns:
+            List of message dictionaries with exactly the role and content keys
+        """
+        prefix = [self.preamble] if self.preamble is not None else []
+        prefix += [msg for msg in messages if msg["role"] == "system"]
+        if summary is not None:
+            prefix.append(summary)
+        history = [msg for msg in messages if msg["role"] != "system"]
+
+        # The window only moves forward; summarized turns are never sent verbatim
+        start = max(self.window_starts.get(model, 0), summarized_count)
+        start = min(start, max(len(history) - 1, 0))
+        prefix_tokens = sum(count_message_tokens(msg, model) for msg in prefix)
+        window_tokens = [count_message_tokens(msg, model) for msg in history[start:]]
+
+        if prefix_tokens + sum(window_tokens) > budget:
+            target = budget * (1 - self.trim_slack)
+            used = prefix_tokens + sum(window_tokens)
+            offset = 0
+            # Always keep the latest message
+            while offset < len(window_tokens) - 1 and used > target:
+                used -= window_tokens[offset]
+                offset += 1
+            # Start on a user turn so the window never opens with an orphaned reply
+            while offset < len(window_tokens) - 1 and history[start + offset]["role"] != "user":
+                offset += 1
+            logger.info(f"Moved the {model} prompt window forward by {offset} messages to fit {budget} tokens")
+            start += offset
+
+        self.window_starts[model] = start
+        prompt = [{"role": msg["role"], "content": msg["content"]} for msg in prefix + history[start:]]
+        logger.debug(f"Assembled {len(prompt)} messages for {model} ({len(prefix)} in the stable prefix)")
+        return prompt
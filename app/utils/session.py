@@ -1,13 +1,51 @@
+import threading
+import uuid
 import streamlit as st
 from typing import List, Dict, Any, Optional
+from app.services.job_queue import get_job_executor
 from app.utils.logger import get_logger
+from app.utils.config import get_config
+from app.utils.ids import new_conversation_id
+from app.utils.prompt_assembler import PromptAssembler
 
 logger = get_logger(__name__)
 
+# Searches awaiting results whose query is remembered for the result cache
+MAX_REMEMBERED_SEARCHES = 20
+
+class GenerationHandle:
+    """Handle for one in-flight assistant generation, used to cancel it."""
+    
+    def __init__(self):
+        """Initialize an active (not cancelled) handle."""
+        self.id = uuid.uuid4().hex
+        self.reason: Optional[str] = None
+        self._cancelled = threading.Event()
+    
+    def cancel(self, reason: str = "superseded"):
+        """Cancel the generation.
+        
+        Args:
+            reason: Why it was cancelled ("superseded", "cleared", "interrupted" or "speculation")
+        """
+        if not self._cancelled.is_set():
+            logger.info(f"Cancelling generation {self.id}: {reason}")
+            self.reason = reason
+            self._cancelled.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        """Whether the generation has been cancelled."""
+        return self._cancelled.is_set()
+
 def initialize_session_state():
     """Initialize session state variables if they don't exist."""
     logger.info("Initializing session state variables")
     
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+        logger.debug(f"Assigned session ID: {st.session_state.session_id}")
+    
     if "messages" not in st.session_state:
         logger.debug("Creating empty messages list in session state")
         st.session_state.messages = []
@@ -15,8 +53,8 @@ def initialize_session_state():
         logger.debug(f"Messages already in session state: {len(st.session_state.messages)} messages")
     
     if "conversation_id" not in st.session_state:
-        logger.debug("Setting conversation_id to None in session state")
-        st.session_state.conversation_id = None
+        st.session_state.conversation_id = _initial_conversation_id()
+        logger.debug(f"Setting conversation_id to {st.session_state.conversation_id} in session state")
     else:
         logger.debug(f"Conversation ID already in session state: {st.session_state.conversation_id}")
     
@@ -34,13 +72,34 @@ def initialize_session_state():
     
     logger.info("Session state initialization complete")
 
-def add_message(role: str, content: str, search_query: Optional[str] = None):
+def _initial_conversation_id() -> Optional[str]:
+    """Allocate a client-side conversation ID if configured, else leave it to the search API.
+    
+    Returns:
+        Time-ordered conversation ID, or None to let the first search response assign one
+    """
+    if get_config()["aws"]["client_conversation_ids"]:
+        return new_conversation_id()
+    return None
+
+def add_message(
+    role: str,
+    content: str,
+    search_query: Optional[str] = None,
+    truncated: bool = False,
+    search_request_id: Optional[str] = None,
+    status: bool = False
+):
     """Add a message to the conversation history.
     
     Args:
         role: The role of the message sender (user, assistant, system)
         content: The content of the message
         search_query: Optional search query associated with the message
+        truncated: Whether the message is a partial response that was cancelled
+        search_request_id: Optional ID of the background search this message is a placeholder for
+        status: Whether the message only reports status to the user (search
+            placeholders, unavailable services); such messages are never sent to the model
     """
     logger.info(f"Adding {role} message to conversation history")
     logger.debug(f"Message content: {content[:50]}{'...' if len(content) > 50 else ''}")
@@ -55,23 +114,180 @@ def add_message(role: str, content: str, search_query: Optional[str] = None):
         message["search_query"] = search_query
         logger.debug(f"Message includes search query: {search_query}")
     
+    if truncated:
+        message["truncated"] = True
+    
+    if search_request_id:
+        message["search_request_id"] = search_request_id
+        message["search_status"] = "pending"
+    
+    if status or search_request_id:
+        message["status"] = True
+    
     st.session_state.messages.append(message)
     logger.debug(f"Conversation history now has {len(st.session_state.messages)} messages")
 
-def get_messages_for_openai() -> List[Dict[str, str]]:
-    """Get messages formatted for OpenAI API."""
+def remember_search_query(request_id: str, query: str):
+    """Remember which query a search request was sent for, until its results arrive.
+    
+    Args:
+        request_id: Request ID sent with the search
+        query: Search query
+    """
+    queries = st.session_state.setdefault("search_queries", {})
+    queries[request_id] = query
+    # Results that never arrive must not pile up
+    while len(queries) > MAX_REMEMBERED_SEARCHES:
+        del queries[next(iter(queries))]
+
+def pop_search_query(request_id: Optional[str]) -> Optional[str]:
+    """Take the query of the search whose results arrived, if it is known for certain.
+    
+    The query is only returned when the results carry a known request ID,
+    or carry none while exactly one search is outstanding. Otherwise the
+    results cannot be attributed: one outstanding search (the oldest) is
+    counted as answered and the others are marked so their results are
+    never cached either, since they may already have been shown.
+    
+    Args:
+        request_id: Request ID echoed with the results, if the search API sent one
+        
+    Returns:
+        The query, or None if the results cannot be attributed to one
+    """
+    queries = st.session_state.get("search_queries")
+    if not queries:
+        return None
+    if request_id:
+        return queries.pop(request_id, None)
+    if len(queries) == 1:
+        return queries.pop(next(iter(queries)))
+    
+    logger.debug(f"Search results without a request ID while {len(queries)} searches are outstanding")
+    del queries[next(iter(queries))]
+    for outstanding_id in queries:
+        queries[outstanding_id] = None
+    return None
+
+def get_context_budget(model: str) -> int:
+    """Get the prompt token budget configured for a model.
+    
+    Args:
+        model: OpenAI model name
+        
+    Returns:
+        Maximum number of prompt tokens to send
+    """
+    openai_config = get_config()["openai"]
+    return openai_config["context_budgets"].get(model, openai_config["default_context_budget"])
+
+def get_prompt_assembler() -> PromptAssembler:
+    """Get the session's prompt assembler, creating it on first use.
+    
+    Returns:
+        PromptAssembler holding this conversation's prompt windows
+    """
+    if "prompt_assembler" not in st.session_state:
+        prompt_config = get_config()["openai"]["prompt"]
+        st.session_state.prompt_assembler = PromptAssembler(
+            preamble=prompt_config["preamble"],
+            trim_slack=prompt_config["trim_slack"]
+        )
+    return st.session_state.prompt_assembler
+
+def get_prompt_history() -> List[Dict[str, Any]]:
+    """Get the conversation history the model sees, without status messages.
+    
+    Prompt windows and the running summary both index into this list, so
+    it must be used for both.
+    
+    Returns:
+        Messages from session state that are not status messages
+    """
+    return [msg for msg in st.session_state.messages if not msg.get("status")]
+
+def get_messages_for_openai(model: Optional[str] = None, budget: Optional[int] = None) -> List[Dict[str, str]]:
+    """Get messages formatted for OpenAI API, trimmed to the model's token budget.
+    
+    The prompt keeps a stable prefix so provider-side prompt caching can
+    reuse it: the configured preamble, system messages and the running
+    summary (if a conversation summarizer is active) come first, followed by
+    an append-only window of the conversation that is trimmed from the
+    oldest end only when it outgrows the budget. The latest message is
+    always included; status messages such as search placeholders never are.
+    
+    Args:
+        model: OpenAI model the messages are for (defaults to the session model)
+        budget: Optional token budget overriding the configured one
+        
+    Returns:
+        List of message dictionaries with role and content
+    """
     logger.debug("Formatting messages for OpenAI API")
-    messages = [
-        {"role": msg["role"], "content": msg["content"]} 
-        for msg in st.session_state.messages
-    ]
+    model = model or st.session_state.openai_model
+    if budget is None:
+        budget = get_context_budget(model)
+    
+    summary, summarized_count = None, 0
+    summarizer = st.session_state.get("summarizer")
+    if summarizer is not None:
+        # Older turns may already be folded into a running summary
+        summary, summarized_count = summarizer.get_state()
+    
+    messages = get_prompt_assembler().assemble(
+        get_prompt_history(),
+        model,
+        budget,
+        summary=summary,
+        summarized_count=summarized_count
+    )
     logger.debug(f"Formatted {len(messages)} messages for OpenAI API")
     return messages
 
+def start_generation() -> GenerationHandle:
+    """Start a new assistant generation, cancelling the previous one if still running.
+    
+    Returns:
+        Handle for the new generation
+    """
+    cancel_generation("superseded")
+    handle = GenerationHandle()
+    st.session_state.active_generation = handle
+    logger.debug(f"Started generation {handle.id}")
+    return handle
+
+def cancel_generation(reason: str = "superseded"):
+    """Cancel the session's in-flight generation, if any.
+    
+    Args:
+        reason: Why it is cancelled ("superseded", "cleared" or "interrupted")
+    """
+    handle = st.session_state.get("active_generation")
+    if handle is not None:
+        handle.cancel(reason)
+
+def finish_generation(handle: GenerationHandle):
+    """Forget a generation handle once its generation has ended.
+    
+    Args:
+        handle: Handle returned by start_generation
+    """
+    if st.session_state.get("active_generation") is handle:
+        del st.session_state.active_generation
+
 def clear_conversation():
-    """Clear the conversation history."""
+    """Clear the conversation history, cancelling any in-flight generation."""
     logger.info("Clearing conversation history")
+    cancel_generation("cleared")
+    job_id = st.session_state.pop("pending_job_id", None)
+    if job_id:
+        # The cancelled job's output is discarded, so nobody will collect it
+        get_job_executor(get_config()["jobs"]).pop(job_id)
+    st.session_state.pop("pending_search_ids", None)
+    st.session_state.pop("search_queries", None)
     st.session_state.messages = []
-    st.session_state.conversation_id = None
+    st.session_state.conversation_id = _initial_conversation_id()
     st.session_state.search_results = []
-    logger.debug("Conversation history, ID, and search results cleared") 
\ No newline at end of file
+    st.session_state.pop("summarizer", None)
+    st.session_state.pop("prompt_assembler", None)
+    logger.debug("Conversation history, ID, pending searches, search results, summary and prompt windows cleared") 
\ No newline at end of file
@@ -0,0 +1,94 @@
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - depends on the environment
+    tiktoken = None
+
+# Rough characters-per-token ratio used when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+
+# Fixed overhead OpenAI adds per chat message (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+@lru_cache(maxsize=16)
+def _get_encoding(model: str):
+    """Get the tiktoken encoding for a model, or None if unavailable."""
+    if tiktoken is None:
+        logger.debug("tiktoken not installed, using approximate token counts")
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            logger.debug(f"No tiktoken encoding for model {model}, using cl100k_base")
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoding, using approximate token counts: {str(e)}")
+        return None
+
+def count_tokens(text: str, model: str) -> int:
+    """Count the tokens in a piece of text for a model.
+
+    Args:
+        text: Text to count
+        model: OpenAI model the text will be sent to
+
+    Returns:
+        Number of tokens (approximate if tiktoken is unavailable)
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text))
+
+@lru_cache(maxsize=4096)
+def _count_content_tokens(content: str, model: str) -> int:
+    """Count a message's tokens, memoized on its content.
+
+    Prompts are rebuilt as fresh dictionaries on every request, so this
+    lets counting them reuse the counts of the session messages they were
+    copied from instead of tokenizing the conversation again.
+    """
+    return count_tokens(content, model) + MESSAGE_OVERHEAD_TOKENS
+
+def count_message_tokens(message: Dict[str, Any], model: str) -> int:
+    """Count the tokens of a chat message, caching the result on the message.
+
+    The count is stored under ``message["token_counts"][model]`` so that
+    messages kept in session state are only tokenized once per model.
+
+    Args:
+        message: Message dictionary with role and content
+        model: OpenAI model the message will be sent to
+
+    Returns:
+        Number of tokens including per-message overhead
+    """
+    token_counts = message.setdefault("token_counts", {})
+    cached: Optional[int] = token_counts.get(model)
+    if cached is not None:
+        return cached
+
+    tokens = _count_content_tokens(message["content"], model)
+    token_counts[model] = tokens
+    return tokens
+
+def count_prompt_tokens(messages: List[Dict[str, str]], model: str) -> int:
+    """Count the prompt tokens of a list of chat messages.
+
+    Uses the memoized per-message counts, so only messages not seen
+    before are tokenized.
+
+    Args:
+        messages: List of message dictionaries with role and content
+        model: OpenAI model the messages will be sent to
+
+    Returns:
+        Number of tokens including per-message overhead
+    """
+    return sum(_count_content_tokens(msg["content"], model) for msg in messages)
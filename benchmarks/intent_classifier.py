@@ -0,0 +1,61 @@
+"""Benchmark intent classifier inference latency and held-out accuracy.
+
+Usage:
+    PYTHONPATH=. python benchmarks/intent_classifier.py [--data app/data/intent_examples.jsonl] [--runs 10000]
+"""
+import argparse
+import random
+import statistics
+import time
+from app.services.intent_classifier import DEFAULT_MODEL_PATH, IntentClassifier, load_examples
+from app.services.search_intent import score_search_intent
+
+def _percentiles(timings: list) -> str:
+    """Format p50/p99 of a list of millisecond timings."""
+    ordered = sorted(timings)
+    return f"p50={statistics.median(ordered):.4f}ms  p99={ordered[int(0.99 * (len(ordered) - 1))]:.4f}ms"
+
+def run_latency(classifier: IntentClassifier, texts: list, runs: int):
+    """Time single-input inference for the classifier and the keyword scorer."""
+    rng = random.Random(0)
+    inputs = [rng.choice(texts) for _ in range(runs)]
+    for name, fn in (("classifier", classifier.predict_proba), ("keywords", score_search_intent)):
+        timings = []
+        for text in inputs:
+            start = time.perf_counter()
+            fn(text)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{name:>10}  {_percentiles(timings)}")
+
+def run_accuracy(examples: list, folds: int):
+    """Cross-validated accuracy of the classifier vs keyword routing."""
+    rng = random.Random(0)
+    shuffled = examples[:]
+    rng.shuffle(shuffled)
+    classifier_correct = keyword_correct = 0
+    for fold in range(folds):
+        test = shuffled[fold::folds]
+        train = [example for index, example in enumerate(shuffled) if index % folds != fold]
+        classifier = IntentClassifier.train(train)
+        for text, label in test:
+            classifier_correct += (classifier.predict_proba(text) >= 0.5) == bool(label)
+            keyword_correct += (score_search_intent(text) >= 0.5) == bool(label)
+    print(
+        f"{folds}-fold accuracy over {len(examples)} examples: "
+        f"classifier={classifier_correct / len(examples):.3f}  keywords={keyword_correct / len(examples):.3f}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="app/data/intent_examples.jsonl")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--runs", type=int, default=10000)
+    parser.add_argument("--folds", type=int, default=5)
+    args = parser.parse_args()
+
+    examples = load_examples(args.data)
+    run_latency(IntentClassifier.load(args.model), [text for text, _ in examples], args.runs)
+    run_accuracy(examples, args.folds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark semantic cache lookup latency.
+
+Usage:
+    PYTHONPATH=. python benchmarks/semantic_cache.py [--sizes 10000 100000] [--lookups 200]
+"""
+import argparse
+import random
+import statistics
+import string
+import time
+from app.services.semantic_cache import SemanticCache
+
+def _random_prompt(rng: random.Random) -> str:
+    """Build a random prompt of 5-20 pseudo-words."""
+    return " ".join(
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+        for _ in range(rng.randint(5, 20))
+    )
+
+def run(size: int, lookups: int, seed: int = 0):
+    """Fill a cache with ``size`` entries and time ``lookups`` lookups."""
+    rng = random.Random(seed)
+    cache = SemanticCache(capacity=size)
+    prompts = [_random_prompt(rng) for _ in range(size)]
+
+    start = time.perf_counter()
+    for prompt in prompts:
+        cache.put("scope", prompt, "response")
+    fill_seconds = time.perf_counter() - start
+
+    queries = [rng.choice(prompts) if idx % 2 else _random_prompt(rng) for idx in range(lookups)]
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        cache.get("scope", query)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"entries={size:>7}  fill={fill_seconds:6.2f}s  "
+        f"lookup p50={statistics.median(timings):7.3f}ms  p95={p95:7.3f}ms  "
+        f"hit_rate={cache.get_stats()['hit_rate']}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.lookups)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark semantic cache matching quality on paraphrases and near-misses.
+
+Paraphrases should hit (same answer); near-misses share most of their words
+but need a different answer and must miss. For each threshold the hit rate
+on both sets is reported.
+
+Usage:
+    PYTHONPATH=. python benchmarks/semantic_cache_paraphrases.py [--thresholds 0.6 0.7 0.8 0.9]
+"""
+import argparse
+import statistics
+from app.services.semantic_cache import embed_text
+
+PARAPHRASES = [
+    ("What are your opening hours?", "When are you open?"),
+    ("How do I reset my password?", "how can I reset my password"),
+    ("how do i reset my password", "password reset, how do i do it"),
+    ("What is the refund policy?", "what's your refund policy"),
+    ("Can I change my delivery address?", "how do I change the delivery address"),
+    ("cancel my subscription", "How do I cancel my subscription?"),
+    ("Where is my order?", "where's my order"),
+    ("What payment methods do you accept?", "which payment methods are accepted"),
+    ("Do you ship internationally?", "do you offer international shipping"),
+    ("How long does shipping take?", "how long will shipping take"),
+    ("tell me a joke", "Tell me a joke!"),
+    ("What is the capital of France?", "what's the capital of france"),
+    ("explain photosynthesis", "can you explain photosynthesis"),
+    ("How do I contact support?", "how can I contact customer support"),
+    ("summarize the french revolution", "give me a summary of the French Revolution"),
+]
+
+NEAR_MISSES = [
+    ("How do I reset my password?", "How do I reset my username?"),
+    ("What is the refund policy?", "What is the privacy policy?"),
+    ("What is the capital of France?", "What is the capital of Spain?"),
+    ("How long does shipping take?", "How long does a refund take?"),
+    ("cancel my subscription", "upgrade my subscription"),
+    ("Do you ship to Canada?", "Do you ship to Mexico?"),
+    ("convert 10 miles to km", "convert 10 km to miles"),
+    ("tell me a joke", "tell me a story"),
+    ("Where is my order?", "Where is my invoice?"),
+    ("explain photosynthesis", "explain respiration"),
+]
+
+def _similarities(pairs: list, dim: int) -> list:
+    """Cosine similarity of each pair's embeddings."""
+    return [float(embed_text(a, dim) @ embed_text(b, dim)) for a, b in pairs]
+
+def run(thresholds: list, dim: int):
+    """Print similarity statistics and per-threshold hit rates."""
+    paraphrases = _similarities(PARAPHRASES, dim)
+    near_misses = _similarities(NEAR_MISSES, dim)
+    for name, values in (("paraphrases", paraphrases), ("near-misses", near_misses)):
+        print(
+            f"{name:>11}  min={min(values):.3f}  median={statistics.median(values):.3f}  max={max(values):.3f}"
+        )
+    for threshold in thresholds:
+        hits = sum(value >= threshold for value in paraphrases) / len(paraphrases)
+        false_hits = sum(value >= threshold for value in near_misses) / len(near_misses)
+        print(f"threshold={threshold:.2f}  paraphrase hit rate={hits:.2f}  near-miss hit rate={false_hits:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.6, 0.7, 0.8, 0.85, 0.9])
+    parser.add_argument("--dim", type=int, default=512)
+    args = parser.parse_args()
+    run(args.thresholds, args.dim)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+import pytest
+import streamlit as st
+from app.utils.config import load_config
+from app.utils.session import initialize_session_state
+
+@pytest.fixture
+def session_state():
+    """Give the test a fresh Streamlit session state with the default configuration."""
+    st.session_state.clear()
+    st.session_state.config = load_config()
+    initialize_session_state()
+    yield st.session_state
+    st.session_state.clear()
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from app.services.async_openai_service import AsyncOpenAIService, EventLoopThread
+from app.services.resilience import CircuitBreaker
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+def _chunk(content: str):
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+class FakeStream:
+    """Async completion stream yielding deltas, optionally after a long wait for the first one."""
+
+    def __init__(self, deltas, first_delay: float = 0.0):
+        self.deltas = list(deltas)
+        self.first_delay = first_delay
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.first_delay:
+            delay, self.first_delay = self.first_delay, 0.0
+            await asyncio.sleep(delay)
+        if not self.deltas:
+            raise StopAsyncIteration
+        return _chunk(self.deltas.pop(0))
+
+    async def close(self):
+        self.closed = True
+
+class FakeCompletions:
+    """Stands in for ``client.chat.completions`` with a slow or fast response."""
+
+    def __init__(self, stream: FakeStream, response_delay: float = 0.0):
+        self.stream = stream
+        self.response_delay = response_delay
+        self.requests = 0
+
+    async def create(self, **kwargs):
+        self.requests += 1
+        await asyncio.sleep(self.response_delay)
+        return self.stream
+
+@pytest.fixture(scope="module")
+def loop_thread():
+    return EventLoopThread(name="test-event-loop")
+
+def _service(loop_thread, completions: FakeCompletions, **kwargs) -> AsyncOpenAIService:
+    service = AsyncOpenAIService("test-key", loop_thread=loop_thread, **kwargs)
+    service.async_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service
+
+def _cancel_after(seconds: float) -> threading.Event:
+    """Build a cancellation flag raised from another thread after ``seconds``."""
+    cancelled = threading.Event()
+    threading.Timer(seconds, cancelled.set).start()
+    return cancelled
+
+def test_stream_completes(loop_thread):
+    completions = FakeCompletions(FakeStream(["Hello", " there"]))
+    received = []
+    future = _service(loop_thread, completions).submit_stream(MESSAGES, received.append)
+    assert future.result(5) == "Hello there"
+    assert received == ["Hello", " there"]
+    assert completions.stream.closed
+
+def test_cancelled_before_the_request_is_never_sent(loop_thread):
+    completions = FakeCompletions(FakeStream(["Hello"]))
+    future = _service(loop_thread, completions).submit_stream(MESSAGES, lambda delta: None, should_cancel=lambda: True)
+    assert future.result(5) == ""
+    assert completions.requests == 0
+
+def test_cancel_while_waiting_for_the_response(loop_thread):
+    completions = FakeCompletions(FakeStream(["Hello"]), response_delay=30.0)
+    breaker = CircuitBreaker("test", half_open_calls=1)
+    service = _service(loop_thread, completions, circuit_breaker=breaker)
+    cancelled = _cancel_after(0.1)
+
+    start = time.monotonic()
+    future = service.submit_stream(MESSAGES, lambda delta: None, should_cancel=cancelled.is_set)
+    assert future.result(5) == ""
+    assert time.monotonic() - start < 2.0
+    # A cancelled call is neither a success nor a failure
+    assert breaker.get_stats()["window_failures"] == 0
+    assert breaker.get_stats()["window_calls"] == 0
+
+def test_cancel_while_waiting_for_the_first_token(loop_thread):
+    completions = FakeCompletions(FakeStream(["Hello"], first_delay=30.0))
+    cancelled = _cancel_after(0.1)
+
+    start = time.monotonic()
+    received = []
+    future = _service(loop_thread, completions).submit_stream(MESSAGES, received.append, should_cancel=cancelled.is_set)
+    assert future.result(5) == ""
+    assert time.monotonic() - start < 2.0
+    assert received == []
+    assert completions.stream.closed
@@ -0,0 +1,122 @@
+import time
+import pytest
+from app.services.resilience import CircuitBreaker, CircuitOpenError
+
+class Interrupted(BaseException):
+    """Stands in for cancellation (e.g. GeneratorExit or KeyboardInterrupt)."""
+
+def _breaker(**kwargs) -> CircuitBreaker:
+    """Build a breaker that opens after two failures out of two calls."""
+    options = {"failure_rate": 0.5, "min_calls": 2, "window": 4, "reset_timeout": 0.05}
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+def _fail():
+    raise ValueError("upstream failed")
+
+def _trip(breaker: CircuitBreaker):
+    """Open the breaker with failing calls."""
+    for _ in range(breaker.min_calls):
+        with pytest.raises(ValueError):
+            breaker.call(_fail)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def _half_open(breaker: CircuitBreaker):
+    """Open the breaker and wait until it lets a probe through."""
+    _trip(breaker)
+    time.sleep(breaker.reset_timeout * 1.5)
+
+def test_stays_closed_below_min_calls():
+    breaker = _breaker(min_calls=3)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            breaker.call(_fail)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_stays_closed_below_failure_rate():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.call(lambda: "ok")
+    with pytest.raises(ValueError):
+        breaker.call(_fail)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_closed_to_open_rejects_calls():
+    breaker = _breaker()
+    _trip(breaker)
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
+    stats = breaker.get_stats()
+    assert stats["trips"] == 1
+    assert stats["rejected"] == 1
+
+def test_slow_calls_count_as_failures():
+    breaker = _breaker(slow_call_seconds=0.0)
+    breaker.call(lambda: time.sleep(0.001))
+    breaker.call(lambda: time.sleep(0.001))
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_non_failure_errors_count_as_success():
+    breaker = _breaker()
+    for _ in range(4):
+        with pytest.raises(ValueError):
+            breaker.call(_fail, is_failure=lambda e: False)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.get_stats()["window_failures"] == 0
+
+def test_open_to_half_open_after_reset_timeout():
+    breaker = _breaker()
+    _half_open(breaker)
+    breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+def test_half_open_limits_concurrent_probes():
+    breaker = _breaker(half_open_calls=1)
+    _half_open(breaker)
+    breaker.allow_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.allow_request()
+
+def test_half_open_to_closed_on_successful_probe():
+    breaker = _breaker()
+    _half_open(breaker)
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.get_stats()["window_failures"] == 0
+
+def test_half_open_to_open_on_failed_probe():
+    breaker = _breaker()
+    _half_open(breaker)
+    with pytest.raises(ValueError):
+        breaker.call(_fail)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.get_stats()["trips"] == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
+
+def test_half_open_to_closed_on_non_failure_error():
+    breaker = _breaker()
+    _half_open(breaker)
+    with pytest.raises(ValueError):
+        breaker.call(_fail, is_failure=lambda e: False)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_cancelled_probe_releases_its_slot():
+    breaker = _breaker(half_open_calls=1)
+    _half_open(breaker)
+
+    def cancelled():
+        raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        breaker.call(cancelled)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # The slot is free again, so the next probe can close the breaker
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_release_outside_half_open_is_a_no_op():
+    breaker = _breaker()
+    breaker.release()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.call(lambda: "ok") == "ok"
@@ -0,0 +1,144 @@
+import threading
+import pytest
+from app.services.resilience import HedgedAttempt, Hedger
+
+class ManualTimer:
+    """Stands in for threading.Timer; the test decides when it fires."""
+
+    created = []
+
+    def __init__(self, delay: float, fn):
+        self.delay = delay
+        self.fn = fn
+        self.cancelled = False
+        self.daemon = False
+        ManualTimer.created.append(self)
+
+    def start(self):
+        pass
+
+    def cancel(self):
+        self.cancelled = True
+
+    def fire(self):
+        if not self.cancelled:
+            self.fn()
+
+@pytest.fixture
+def hedger():
+    ManualTimer.created = []
+    return Hedger(min_delay=1.0, timer=ManualTimer)
+
+def _call_in_background(hedger: Hedger, fn, discard=None):
+    """Run a hedged call on a thread, returning its result holder and thread."""
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = hedger.call("model", fn, discard=discard)
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return outcome, thread
+
+def test_fast_primary_is_not_hedged(hedger):
+    assert hedger.call("model", lambda attempt: "primary") == "primary"
+    assert ManualTimer.created[0].cancelled
+    assert ManualTimer.created[0].delay == 1.0
+    assert hedger.get_stats() == {"calls": 1, "hedged": 0, "backup_wins": 0}
+
+def test_first_success_wins_and_the_loser_is_abandoned(hedger):
+    primary_started = threading.Event()
+    primary_aborted = threading.Event()
+    discarded = []
+
+    def attempt(hedged: HedgedAttempt):
+        if not primary_started.is_set():
+            primary_started.set()
+            hedged.on_abandon(primary_aborted.set)
+            primary_aborted.wait(5)
+            return "late primary"
+        return "backup"
+
+    outcome, thread = _call_in_background(hedger, attempt, discard=discarded.append)
+    assert primary_started.wait(5)
+    ManualTimer.created[0].fire()
+    thread.join(5)
+
+    assert outcome == {"result": "backup"}
+    assert primary_aborted.is_set()
+    assert discarded == ["late primary"]
+    assert hedger.get_stats() == {"calls": 1, "hedged": 1, "backup_wins": 1}
+
+def test_primary_win_abandons_the_backup(hedger):
+    release_primary = threading.Event()
+    backup_started = threading.Event()
+    backup_aborted = threading.Event()
+    backup_finished = threading.Event()
+    discarded = []
+    attempts = []
+
+    def attempt(hedged: HedgedAttempt):
+        attempts.append(hedged)
+        if len(attempts) == 1:
+            release_primary.wait(5)
+            return "primary"
+        hedged.on_abandon(backup_aborted.set)
+        backup_started.set()
+        backup_aborted.wait(5)
+        return "late backup"
+
+    def discard(result):
+        discarded.append(result)
+        backup_finished.set()
+
+    outcome, thread = _call_in_background(hedger, attempt, discard=discard)
+    ManualTimer.created[0].fire()
+    assert backup_started.wait(5)
+    release_primary.set()
+    thread.join(5)
+    assert backup_finished.wait(5)
+
+    assert outcome == {"result": "primary"}
+    assert backup_aborted.is_set()
+    assert discarded == ["late backup"]
+    assert hedger.get_stats()["backup_wins"] == 0
+
+def test_failed_primary_waits_for_a_launched_backup(hedger):
+    fail_primary = threading.Event()
+    attempts = []
+
+    def attempt(hedged: HedgedAttempt):
+        attempts.append(hedged)
+        if len(attempts) == 1:
+            fail_primary.wait(5)
+            raise ConnectionError("primary failed")
+        return "backup"
+
+    outcome, thread = _call_in_background(hedger, attempt)
+    ManualTimer.created[0].fire()
+    fail_primary.set()
+    thread.join(5)
+
+    assert outcome == {"result": "backup"}
+
+def test_primary_error_is_raised_when_no_backup_ran(hedger):
+    def attempt(hedged: HedgedAttempt):
+        raise ConnectionError("primary failed")
+
+    with pytest.raises(ConnectionError):
+        hedger.call("model", attempt)
+    # A timer already firing as the primary failed must not start a backup
+    ManualTimer.created[0].fn()
+    assert hedger.get_stats()["hedged"] == 0
+
+def test_hedge_delay_follows_observed_latency(hedger):
+    assert hedger.get_delay("model") == 1.0
+    for _ in range(50):
+        hedger.latency.record("model", 3.0)
+    assert hedger.get_delay("model") == 3.0
+    for _ in range(50):
+        hedger.latency.record("fast", 0.1)
+    assert hedger.get_delay("fast") == 1.0
@@ -0,0 +1,45 @@
+import time
+import uuid
+from app.utils import ids
+from app.utils.ids import new_conversation_id, uuid7
+
+def _timestamp_ms(value: uuid.UUID) -> int:
+    return value.int >> 80
+
+def _counter(value: uuid.UUID) -> int:
+    return (value.int >> 64) & 0xFFF
+
+def test_version_and_variant_bits():
+    value = uuid7()
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert (value.int >> 76) & 0xF == 0x7
+    assert (value.int >> 62) & 0b11 == 0b10
+
+def test_timestamp_is_current_unix_ms():
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+    assert before <= _timestamp_ms(value) <= after + 1
+
+def test_ids_sort_in_creation_order():
+    values = [uuid7() for _ in range(10000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    # The canonical string form sorts the same way
+    assert [str(value) for value in values] == sorted(str(value) for value in values)
+
+def test_counter_overflow_borrows_next_millisecond(monkeypatch):
+    future = time.time_ns() // 1_000_000 + 60_000
+    monkeypatch.setattr(ids, "_last_timestamp", future)
+    monkeypatch.setattr(ids, "_counter", 0xFFE)
+
+    last_in_ms = uuid7()
+    borrowed = uuid7()
+    assert (_timestamp_ms(last_in_ms), _counter(last_in_ms)) == (future, 0xFFF)
+    assert (_timestamp_ms(borrowed), _counter(borrowed)) == (future + 1, 0)
+    assert borrowed > last_in_ms
+
+def test_new_conversation_id_is_a_uuid7_string():
+    conversation_id = new_conversation_id()
+    assert uuid.UUID(conversation_id).version == 7
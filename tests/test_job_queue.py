@@ -0,0 +1,170 @@
+import threading
+import time
+import pytest
+from app.services import openai_service
+from app.services.job_queue import GenerationJob, JobExecutor, JobQueueFullError
+from app.services.openai_service import collect_pending_job, get_pending_job, submit_user_input
+from app.utils.session import GenerationHandle
+
+def _wait_until(predicate, timeout: float = 5.0):
+    """Poll until ``predicate`` holds, failing the test after ``timeout`` seconds."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("Timed out waiting for condition")
+        time.sleep(0.005)
+
+def _blocked(release: threading.Event):
+    """Build a job function that waits for ``release``."""
+    return lambda job: release.wait(5)
+
+def test_submitted_job_runs_and_is_kept_until_popped():
+    executor = JobExecutor(max_workers=1, max_queued=0)
+    job = executor.submit(lambda job: job.append("answer"), GenerationHandle())
+    assert job.wait(5)
+
+    assert job.status == GenerationJob.DONE
+    assert job.text == "answer"
+    assert executor.get(job.id) is job
+    assert executor.get_stats()["uncollected"] == 1
+    assert executor.pop(job.id) is job
+    assert executor.get(job.id) is None
+    assert executor.pop(job.id) is None
+
+def test_failed_job_records_its_error():
+    executor = JobExecutor(max_workers=1, max_queued=0)
+
+    def fail(job):
+        raise ValueError("upstream failed")
+
+    job = executor.submit(fail, GenerationHandle())
+    assert job.wait(5)
+    assert job.status == GenerationJob.FAILED
+    assert isinstance(job.error, ValueError)
+    assert executor.get_stats()["failed"] == 1
+
+def test_job_cancelled_while_queued_never_runs():
+    executor = JobExecutor(max_workers=1, max_queued=1)
+    release = threading.Event()
+    blocker = executor.submit(_blocked(release), GenerationHandle())
+    calls = []
+    handle = GenerationHandle()
+    queued = executor.submit(lambda job: calls.append(job), handle)
+    assert executor.get_stats()["queued"] == 1
+
+    handle.cancel("superseded")
+    release.set()
+    assert blocker.wait(5) and queued.wait(5)
+    assert calls == []
+    assert queued.status == GenerationJob.DONE
+
+def test_full_queue_rejects_submissions():
+    executor = JobExecutor(max_workers=1, max_queued=1)
+    release = threading.Event()
+    executor.submit(_blocked(release), GenerationHandle())
+    executor.submit(_blocked(release), GenerationHandle())
+    try:
+        with pytest.raises(JobQueueFullError):
+            executor.submit(_blocked(release), GenerationHandle())
+        assert executor.get_stats()["rejected"] == 1
+    finally:
+        release.set()
+
+def test_finished_jobs_free_their_slot():
+    executor = JobExecutor(max_workers=1, max_queued=0)
+    first = executor.submit(lambda job: None, GenerationHandle())
+    assert first.wait(5)
+    # Uncollected but finished jobs do not count against the queue
+    second = executor.submit(lambda job: None, GenerationHandle())
+    assert second.wait(5)
+
+def test_uncollected_jobs_are_purged_after_retention():
+    executor = JobExecutor(max_workers=1, max_queued=0, retention=600.0)
+    stale = executor.submit(lambda job: None, GenerationHandle())
+    assert stale.wait(5)
+    recent = executor.submit(lambda job: None, GenerationHandle())
+    assert recent.wait(5)
+    stale.finished_at = time.time() - 601
+    recent.finished_at = time.time() - 599
+
+    executor.submit(lambda job: None, GenerationHandle()).wait(5)
+    assert executor.get(stale.id) is None
+    assert executor.get(recent.id) is recent
+
+class FakeOpenAIService:
+    """Streams a first delta, then waits for ``release`` before the rest."""
+
+    def __init__(self, release: threading.Event):
+        self.release = release
+
+    def generate_response_stream(self, messages, model, route):
+        yield "partial "
+        self.release.wait(5)
+        yield "answer"
+
+@pytest.fixture
+def executor(session_state, monkeypatch):
+    """Route the session's background jobs to a private executor with fake dependencies."""
+    executor = JobExecutor(max_workers=1, max_queued=0)
+    monkeypatch.setattr(openai_service, "get_job_executor", lambda job_config: executor)
+    monkeypatch.setattr(openai_service, "get_turn_model", lambda user_input: "gpt-test")
+    monkeypatch.setattr(openai_service, "get_turn_route", lambda user_input: "chat")
+    monkeypatch.setattr(openai_service, "get_messages_for_openai", lambda model: [])
+    monkeypatch.setattr(openai_service, "schedule_summary", lambda: None)
+    return executor
+
+def _use(monkeypatch, service):
+    monkeypatch.setattr(openai_service, "create_openai_service", lambda: service)
+
+def test_submit_and_collect_user_input(session_state, executor, monkeypatch):
+    release = threading.Event()
+    release.set()
+    _use(monkeypatch, FakeOpenAIService(release))
+
+    job_id = submit_user_input("hello")
+    assert session_state.pending_job_id == job_id
+    job = get_pending_job()
+    assert job.wait(5)
+
+    collect_pending_job()
+    assert [(msg["role"], msg["content"]) for msg in session_state.messages] == [
+        ("user", "hello"), ("assistant", "partial answer")
+    ]
+    assert "pending_job_id" not in session_state
+    assert "active_generation" not in session_state
+    assert executor.get(job_id) is None
+
+def test_new_input_collects_the_superseded_job_first(session_state, executor, monkeypatch):
+    release = threading.Event()
+    _use(monkeypatch, FakeOpenAIService(release))
+    first_id = submit_user_input("first")
+    first = get_pending_job()
+    _wait_until(lambda: first.text == "partial ")
+
+    # The superseded job keeps its partial text, ahead of the new turn
+    executor.max_queued = 1
+    submit_user_input("second")
+    release.set()
+    assert get_pending_job().wait(5)
+
+    assert first.handle.cancelled
+    assert executor.get(first_id) is None
+    assert [(msg["role"], msg["content"]) for msg in session_state.messages] == [
+        ("user", "first"), ("assistant", "partial"), ("user", "second")
+    ]
+    assert session_state.messages[1]["truncated"]
+
+def test_full_queue_is_reported_in_the_conversation(session_state, executor, monkeypatch):
+    release = threading.Event()
+    _use(monkeypatch, FakeOpenAIService(release))
+    blocker = executor.submit(_blocked(release), GenerationHandle())
+    try:
+        with pytest.raises(JobQueueFullError):
+            submit_user_input("hello")
+    finally:
+        release.set()
+    blocker.wait(5)
+
+    assert [msg["role"] for msg in session_state.messages] == ["user", "assistant"]
+    assert "pending_job_id" not in session_state
+    assert "active_generation" not in session_state
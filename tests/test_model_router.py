@@ -0,0 +1,59 @@
+import pytest
+from app.services import model_router
+from app.services.model_router import AUTO_MODEL, ModelRouter, record_model_latency, resolve_model, score_complexity
+
+ROUTER_CONFIG = {"fast_model": "fast", "strong_model": "strong", "complexity_threshold": 0.35}
+
+@pytest.fixture(autouse=True)
+def histograms(monkeypatch):
+    """Start every test without latency data."""
+    monkeypatch.setattr(model_router, "_histograms", {})
+
+@pytest.mark.parametrize("text", ["hi", "Thanks!", "good morning", "  ok. "])
+def test_greetings_score_zero(text):
+    assert score_complexity(text) == 0.0
+
+def test_short_question_stays_below_threshold():
+    assert score_complexity("What is the capital of France?") < ROUTER_CONFIG["complexity_threshold"]
+
+def test_reasoning_request_reaches_threshold():
+    assert score_complexity("Explain it") >= ROUTER_CONFIG["complexity_threshold"]
+
+def test_code_reaches_threshold_with_some_length():
+    text = "Why does this fail?\n```\ndef f(x): return x\n```"
+    assert score_complexity(text) >= ROUTER_CONFIG["complexity_threshold"]
+    assert score_complexity("def f(x): pass") == pytest.approx(0.3 + 3 / 150)
+
+def test_length_and_history_contributions_are_capped():
+    long_text = " ".join(["word"] * 1000)
+    assert score_complexity(long_text) == pytest.approx(0.4)
+    assert score_complexity(long_text, history_depth=1000) == pytest.approx(0.6)
+
+def test_score_is_capped_at_one():
+    text = "Explain and compare these? Why? " + " ".join(["word"] * 200) + "\n```\ndef f(): pass\n```"
+    assert score_complexity(text, history_depth=100) == 1.0
+
+def test_explicit_model_is_kept():
+    assert resolve_model("gpt-4", "hi", [], ROUTER_CONFIG) == "gpt-4"
+
+def test_auto_falls_back_to_first_adequate_model_without_latency_data():
+    assert resolve_model(AUTO_MODEL, "What is the capital of France?", [], ROUTER_CONFIG) == "fast"
+    assert resolve_model(AUTO_MODEL, "Explain the trade-offs", [], ROUTER_CONFIG) == "strong"
+
+def test_auto_prefers_the_faster_adequate_model():
+    for _ in range(3):
+        record_model_latency("fast", 6.0)
+        record_model_latency("strong", 1.5)
+    assert resolve_model(AUTO_MODEL, "What is the capital of France?", [], ROUTER_CONFIG) == "strong"
+
+def test_complex_prompt_never_uses_the_fast_model():
+    record_model_latency("fast", 0.1)
+    record_model_latency("strong", 30.0)
+    router = ModelRouter("fast", "strong")
+    assert router.choose_model("Explain the trade-offs") == "strong"
+
+def test_history_depth_counts_towards_complexity():
+    history = [{"role": "user", "content": "hi"}] * 14
+    text = " ".join(["word"] * 25)
+    assert resolve_model(AUTO_MODEL, text, [], ROUTER_CONFIG) == "fast"
+    assert resolve_model(AUTO_MODEL, text, history, ROUTER_CONFIG) == "strong"
@@ -0,0 +1,91 @@
+import json
+import pytest
+from app.utils import prompt_assembler
+from app.utils.prompt_assembler import PromptAssembler
+from app.utils.session import add_message, get_messages_for_openai
+
+@pytest.fixture(autouse=True)
+def flat_token_counts(monkeypatch):
+    """Count every message as 10 tokens so budgets translate to message counts."""
+    monkeypatch.setattr(prompt_assembler, "count_message_tokens", lambda message, model: 10)
+
+def _turns(count: int, start: int = 0):
+    """Build alternating user and assistant messages, starting with a user turn."""
+    return [
+        {"role": "user" if idx % 2 == 0 else "assistant", "content": f"message {idx}", "timestamp": idx}
+        for idx in range(start, start + count)
+    ]
+
+def _serialize(prompt) -> bytes:
+    return json.dumps(prompt, separators=(",", ":")).encode()[:-1]
+
+def test_prefix_bytes_stay_identical_across_appends():
+    assembler = PromptAssembler(preamble="You are a helpful assistant.")
+    messages = [{"role": "system", "content": "Answer in English."}] + _turns(3)
+    first = assembler.assemble(messages, "gpt-4", budget=1000)
+    messages += _turns(2, start=3)
+    second = assembler.assemble(messages, "gpt-4", budget=1000)
+
+    assert second[:len(first)] == first
+    assert _serialize(second).startswith(_serialize(first))
+
+def test_prompt_layout_and_keys():
+    assembler = PromptAssembler(preamble="Preamble")
+    summary = {"role": "system", "content": "Summary of earlier turns"}
+    messages = _turns(2) + [{"role": "system", "content": "Rules"}] + _turns(2, start=2)
+    prompt = assembler.assemble(messages, "gpt-4", budget=1000, summary=summary, summarized_count=2)
+
+    assert [msg["content"] for msg in prompt] == ["Preamble", "Rules", "Summary of earlier turns", "message 2", "message 3"]
+    assert all(set(msg) == {"role", "content"} for msg in prompt)
+
+def test_retrim_only_after_slack_is_used_up():
+    # 10 messages fit; trimming leaves a quarter of the budget free
+    assembler = PromptAssembler(trim_slack=0.25)
+    messages = _turns(11)
+    trimmed = assembler.assemble(messages, "gpt-4", budget=100)
+    assert [msg["content"] for msg in trimmed] == [f"message {idx}" for idx in range(4, 11)]
+
+    # The next three messages fill the slack without moving the window
+    for idx in range(11, 14):
+        messages += _turns(1, start=idx)
+        prompt = assembler.assemble(messages, "gpt-4", budget=100)
+        assert prompt[:len(trimmed)] == trimmed
+    assert assembler.window_starts["gpt-4"] == 4
+
+    messages += _turns(1, start=14)
+    prompt = assembler.assemble(messages, "gpt-4", budget=100)
+    assert assembler.window_starts["gpt-4"] == 8
+    assert len(prompt) == 7
+
+def test_window_starts_on_a_user_turn():
+    assembler = PromptAssembler(trim_slack=0.35)
+    prompt = assembler.assemble(_turns(11), "gpt-4", budget=100)
+    # Dropping five messages would be enough, but the sixth is an assistant reply
+    assert prompt[0]["role"] == "user"
+    assert prompt[0]["content"] == "message 6"
+
+def test_latest_message_is_always_kept():
+    assembler = PromptAssembler(preamble="Preamble")
+    prompt = assembler.assemble(_turns(3), "gpt-4", budget=5)
+    assert [msg["content"] for msg in prompt] == ["Preamble", "message 2"]
+
+def test_each_model_keeps_its_own_window():
+    assembler = PromptAssembler()
+    messages = _turns(11)
+    assembler.assemble(messages, "small", budget=100)
+    prompt = assembler.assemble(messages, "large", budget=1000)
+    assert len(prompt) == 11
+    assert assembler.window_starts == {"small": 4, "large": 0}
+
+def test_status_messages_are_left_out_of_the_prompt(session_state):
+    add_message("user", "vacation policy")
+    add_message("assistant", "Searching for relevant information...", search_query="vacation policy", search_request_id="r1")
+    add_message("assistant", "Here are the search results:\n\n1. Policy: 25 days")
+    add_message("user", "and sick leave?")
+    add_message("assistant", "OpenAI is temporarily unavailable.", status=True)
+
+    prompt = get_messages_for_openai("gpt-4", budget=10_000)
+    assert [msg["content"] for msg in prompt if msg["role"] != "system"] == [
+        "vacation policy", "Here are the search results:\n\n1. Policy: 25 days", "and sick leave?"
+    ]
+    assert len(session_state.messages) == 5
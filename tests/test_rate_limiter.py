@@ -0,0 +1,65 @@
+import threading
+import time
+import pytest
+from app.services.rate_limiter import RateLimiter, RateLimitTimeoutError
+
+def _wait_until(predicate, timeout: float = 5.0):
+    """Poll until ``predicate`` holds, failing the test after ``timeout`` seconds."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("Timed out waiting for condition")
+        time.sleep(0.005)
+
+def _drained_limiter(requests_per_minute: int, max_wait: float = 10.0) -> RateLimiter:
+    """Build a limiter for model "m" whose request bucket starts empty."""
+    limiter = RateLimiter({"m": requests_per_minute}, {}, max_wait=max_wait)
+    limiter._request_buckets["m"].tokens = 0
+    return limiter
+
+def test_unlimited_model_does_not_wait():
+    limiter = RateLimiter({"m": 1}, {})
+    assert limiter.acquire("other", 1000) == 0.0
+
+def test_sessions_are_served_round_robin():
+    # One grant every 100ms
+    limiter = _drained_limiter(600)
+    order = []
+    order_lock = threading.Lock()
+
+    def request(session_id: str):
+        limiter.acquire("m", 1, session_id=session_id)
+        with order_lock:
+            order.append(session_id)
+
+    threads = []
+    for _ in range(4):
+        threads.append(threading.Thread(target=request, args=("chatty",), daemon=True))
+        threads[-1].start()
+    _wait_until(lambda: limiter.get_stats()["m"]["queue_depth"] == 4)
+    threads.append(threading.Thread(target=request, args=("quiet",), daemon=True))
+    threads[-1].start()
+    for thread in threads:
+        thread.join(5)
+
+    # The quiet session is served after one chatty request, not behind all four
+    assert order == ["chatty", "quiet", "chatty", "chatty", "chatty"]
+    stats = limiter.get_stats()["m"]
+    assert stats["granted"] == 5
+    assert stats["queue_depth"] == 0
+
+def test_wait_beyond_max_wait_fails_fast():
+    # The next grant is a second away, past the 0.1s limit
+    limiter = _drained_limiter(60, max_wait=0.1)
+    start = time.monotonic()
+    with pytest.raises(RateLimitTimeoutError):
+        limiter.acquire("m", 1)
+    assert time.monotonic() - start < 0.1
+    assert limiter.get_stats()["m"]["timeouts"] == 1
+
+def test_token_limit_delays_large_requests():
+    limiter = RateLimiter({}, {"m": 6000}, max_wait=5.0)
+    assert limiter.acquire("m", 6000) < 0.05
+    # 100 tokens refill in about a second
+    waited = limiter.acquire("m", 100)
+    assert 0.5 < waited < 2.0
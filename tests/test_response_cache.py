@@ -0,0 +1,94 @@
+import pytest
+from app.services import response_cache
+from app.services.response_cache import ResponseCache, make_cache_key
+
+MESSAGES = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "What is the capital of France?"}]
+
+class FakeClock:
+    """Stands in for the time module with a manually advanced wall clock."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache, "time", clock)
+    return clock
+
+def test_cache_key_is_stable():
+    params = {"temperature": 0.7, "max_tokens": 100}
+    key = make_cache_key("gpt-4", params, MESSAGES)
+    assert key == make_cache_key("gpt-4", dict(reversed(list(params.items()))), [dict(msg) for msg in MESSAGES])
+    assert len(key) == 64
+
+def test_cache_key_ignores_whitespace_differences():
+    spaced = [MESSAGES[0], {"role": "user", "content": "  What is the capital\nof   France? "}]
+    assert make_cache_key("gpt-4", {}, spaced) == make_cache_key("gpt-4", {}, MESSAGES)
+
+@pytest.mark.parametrize("model, params, messages", [
+    ("gpt-3.5-turbo", {}, MESSAGES),
+    ("gpt-4", {"temperature": 0.0}, MESSAGES),
+    ("gpt-4", {}, [MESSAGES[0], {"role": "user", "content": "What is the capital of Spain?"}]),
+    ("gpt-4", {}, [{"role": "assistant", "content": msg["content"]} for msg in MESSAGES]),
+])
+def test_cache_key_changes_with_the_request(model, params, messages):
+    assert make_cache_key(model, params, messages) != make_cache_key("gpt-4", {}, MESSAGES)
+
+def test_hit_and_miss_are_counted():
+    cache = ResponseCache()
+    assert cache.get("key") is None
+    cache.put("key", "Paris")
+    assert cache.get("key") == "Paris"
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(capacity=2)
+    cache.put("first", "1")
+    cache.put("second", "2")
+    cache.get("first")
+    cache.put("third", "3")
+    assert cache.get("second") is None
+    assert cache.get("first") == "1"
+    assert cache.get("third") == "3"
+    assert cache.get_stats()["evictions"] == 1
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(ttl=60.0)
+    cache.put("key", "Paris")
+    clock.now += 60.0
+    assert cache.get("key") == "Paris"
+    clock.now += 0.1
+    assert cache.get("key") is None
+    assert cache.get_stats()["size"] == 0
+
+def test_entries_survive_a_restart_in_sqlite(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    ResponseCache(sqlite_path=path).put("key", "Paris")
+
+    restarted = ResponseCache(sqlite_path=path)
+    assert restarted.get("key") == "Paris"
+    assert restarted.get("key") == "Paris"
+    # Only the first lookup reads the disk; the hit is promoted into memory
+    assert restarted.get_stats()["disk_hits"] == 1
+
+def test_expired_rows_are_dropped_on_open(tmp_path, clock):
+    path = str(tmp_path / "responses.sqlite3")
+    ResponseCache(ttl=60.0, sqlite_path=path).put("key", "Paris")
+    clock.now += 61.0
+
+    restarted = ResponseCache(ttl=60.0, sqlite_path=path)
+    assert restarted.get("key") is None
+    assert restarted._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+
+def test_clear_removes_memory_and_disk_entries(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    cache = ResponseCache(sqlite_path=path)
+    cache.put("key", "Paris")
+    cache.clear()
+    assert cache.get("key") is None
+    assert ResponseCache(sqlite_path=path).get("key") is None
@@ -0,0 +1,80 @@
+import httpx
+import openai
+import pytest
+from app.services import resilience
+from app.services.resilience import call_with_retry, is_retryable_error
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+def _status_error(status_code: int) -> openai.APIStatusError:
+    return openai.APIStatusError("upstream error", response=httpx.Response(status_code, request=REQUEST), body=None)
+
+class Flaky:
+    """Raises the given errors in turn, then returns "ok"."""
+
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+@pytest.fixture
+def sleeps():
+    """Record backoff delays instead of sleeping."""
+    return []
+
+@pytest.mark.parametrize("error", [
+    openai.APITimeoutError(request=REQUEST),
+    openai.APIConnectionError(request=REQUEST),
+    _status_error(429),
+    _status_error(500),
+    _status_error(503),
+])
+def test_transient_errors_are_retryable(error):
+    assert is_retryable_error(error)
+
+@pytest.mark.parametrize("error", [_status_error(400), _status_error(401), _status_error(404), ValueError("bug")])
+def test_other_errors_are_not_retryable(error):
+    assert not is_retryable_error(error)
+
+def test_retryable_error_is_retried_until_success(sleeps):
+    fn = Flaky(_status_error(503), openai.APITimeoutError(request=REQUEST))
+    assert call_with_retry(fn, max_retries=2, sleep=sleeps.append) == "ok"
+    assert fn.calls == 3
+    assert len(sleeps) == 2
+
+def test_non_retryable_error_is_raised_immediately(sleeps):
+    fn = Flaky(_status_error(400))
+    with pytest.raises(openai.APIStatusError):
+        call_with_retry(fn, max_retries=2, sleep=sleeps.append)
+    assert fn.calls == 1
+    assert sleeps == []
+
+def test_attempts_are_capped(sleeps):
+    fn = Flaky(*[_status_error(503) for _ in range(5)])
+    with pytest.raises(openai.APIStatusError):
+        call_with_retry(fn, max_retries=2, sleep=sleeps.append)
+    assert fn.calls == 3
+    assert len(sleeps) == 2
+
+def test_zero_retries_makes_a_single_attempt(sleeps):
+    fn = Flaky(_status_error(503))
+    with pytest.raises(openai.APIStatusError):
+        call_with_retry(fn, max_retries=0, sleep=sleeps.append)
+    assert fn.calls == 1
+
+def test_backoff_uses_full_jitter_capped_by_max_delay(sleeps, monkeypatch):
+    # Always pick the upper bound of the jitter range
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: high)
+    fn = Flaky(*[_status_error(503) for _ in range(4)])
+    call_with_retry(fn, max_retries=4, base_delay=0.5, max_delay=2.0, sleep=sleeps.append)
+    assert sleeps == [0.5, 1.0, 2.0, 2.0]
+
+def test_custom_retry_predicate(sleeps):
+    fn = Flaky(ValueError("flaky"))
+    assert call_with_retry(fn, is_retryable=lambda e: isinstance(e, ValueError), sleep=sleeps.append) == "ok"
+    assert fn.calls == 2
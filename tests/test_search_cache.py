@@ -0,0 +1,99 @@
+import pytest
+from app.services import websocket_client
+from app.services.search_cache import SearchResultCache, normalize_query
+from app.utils.session import pop_search_query, remember_search_query
+
+RESULTS_A = [{"title": "A", "snippet": "about a"}]
+RESULTS_B = [{"title": "B", "snippet": "about b"}]
+
+@pytest.mark.parametrize("query, expected", [
+    ("Search for the vacation policy!", "vacation policy"),
+    ("vacation  policy?", "vacation policy"),
+    ("Can you look up the Q3 report", "q3 report"),
+    ("find me hotels in Rome", "hotels in rome"),
+    ("please show me the   travel   rules", "travel rules"),
+    ("the", "the"),
+])
+def test_normalize_query(query, expected):
+    assert normalize_query(query) == expected
+
+def test_normalize_query_keeps_word_order_and_relational_words():
+    assert normalize_query("flights from Paris to Rome") == "flights from paris to rome"
+    assert normalize_query("flights from Paris to Rome") != normalize_query("flights from Rome to Paris")
+
+def test_equivalent_queries_share_an_entry():
+    cache = SearchResultCache()
+    cache.put("Search for the vacation policy!", "c1", RESULTS_A)
+    assert cache.get("vacation policy", "c1") == RESULTS_A
+
+def test_entries_are_scoped_to_the_conversation():
+    cache = SearchResultCache()
+    cache.put("vacation policy", "c1", RESULTS_A)
+    assert cache.get("vacation policy", "c2") is None
+    assert cache.get_stats()["misses"] == 1
+
+def test_entries_expire():
+    cache = SearchResultCache(ttl=0.0)
+    cache.put("vacation policy", "c1", RESULTS_A)
+    assert cache.get("vacation policy", "c1") is None
+    assert cache.get_stats()["expirations"] == 1
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SearchResultCache(capacity=2)
+    cache.put("first", "c1", RESULTS_A)
+    cache.put("second", "c1", RESULTS_A)
+    cache.get("first", "c1")
+    cache.put("third", "c1", RESULTS_A)
+    assert cache.get("second", "c1") is None
+    assert cache.get("first", "c1") == RESULTS_A
+
+def test_results_with_known_request_id_are_attributed(session_state):
+    remember_search_query("r1", "first query")
+    remember_search_query("r2", "second query")
+    assert pop_search_query("r1") == "first query"
+    assert pop_search_query("unknown") is None
+    assert pop_search_query("r2") == "second query"
+
+def test_results_without_request_id_are_attributed_to_the_only_search(session_state):
+    remember_search_query("r1", "only query")
+    assert pop_search_query(None) == "only query"
+    assert pop_search_query(None) is None
+
+def test_results_without_request_id_are_not_attributed_while_searches_overlap(session_state):
+    remember_search_query("r1", "first query")
+    remember_search_query("r2", "second query")
+    assert pop_search_query(None) is None
+    # The remaining search may be the one that was just answered, so it is never attributed
+    assert pop_search_query(None) is None
+    remember_search_query("r3", "third query")
+    assert pop_search_query(None) == "third query"
+
+@pytest.fixture
+def search_cache(monkeypatch):
+    cache = SearchResultCache()
+    monkeypatch.setattr(websocket_client, "get_search_cache", lambda cache_config: cache)
+    return cache
+
+def test_overlapping_results_are_shown_but_not_cached(session_state, search_cache):
+    session_state.conversation_id = "c1"
+    remember_search_query("r1", "first query")
+    remember_search_query("r2", "second query")
+
+    # The first search finishes late: its results arrive after the second was sent
+    websocket_client.apply_search_results({"search_results": RESULTS_A})
+    websocket_client.apply_search_results({"search_results": RESULTS_B})
+
+    assert session_state.search_results == RESULTS_B
+    assert search_cache.get_stats()["size"] == 0
+    assert session_state.messages[-1]["content"].startswith("Here are the search results")
+
+def test_attributed_results_are_cached(session_state, search_cache):
+    session_state.conversation_id = "c1"
+    remember_search_query("r1", "first query")
+    remember_search_query("r2", "second query")
+
+    websocket_client.apply_search_results({"search_results": RESULTS_B, "request_id": "r2"})
+    websocket_client.apply_search_results({"search_results": RESULTS_A})
+
+    assert search_cache.get("second query", "c1") == RESULTS_B
+    assert search_cache.get("first query", "c1") == RESULTS_A
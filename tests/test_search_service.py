@@ -0,0 +1,59 @@
+import time
+from types import SimpleNamespace
+import pytest
+from app.services.resilience import CircuitBreaker, CircuitOpenError
+from app.services.search_service import SearchService
+
+class Interrupted(BaseException):
+    """Stands in for cancellation (e.g. KeyboardInterrupt) during the request."""
+
+class FakeSession:
+    """Stands in for the pooled requests session, replying or raising in turn."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+
+    def post(self, url, headers, json, timeout):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return SimpleNamespace(status_code=outcome, text="", json=lambda: {"conversation_id": "c1"})
+
+def _half_open_service(*outcomes) -> SearchService:
+    """Build a search service whose breaker is ready to let one probe through."""
+    breaker = CircuitBreaker("search", failure_rate=0.5, min_calls=1, window=4, reset_timeout=0.05, half_open_calls=1)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.075)
+    service = SearchService("https://search.example.com", circuit_breaker=breaker)
+    service.session = FakeSession(*outcomes)
+    return service
+
+def test_accepted_probe_closes_the_breaker():
+    service = _half_open_service(202)
+    assert service.send_search("query", "new_conversation") == (True, "c1")
+    assert service.circuit_breaker.state == CircuitBreaker.CLOSED
+
+def test_server_error_probe_reopens_the_breaker():
+    service = _half_open_service(503)
+    assert service.send_search("query", "c1") == (False, None)
+    assert service.circuit_breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        service.send_search("query", "c1")
+
+def test_interrupted_probe_gives_its_slot_back():
+    service = _half_open_service(Interrupted(), 202)
+    with pytest.raises(Interrupted):
+        service.send_search("query", "c1")
+    assert service.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    # Without the slot back the breaker would reject every later request
+    assert service.send_search("query", "c1") == (True, None)
+    assert service.circuit_breaker.state == CircuitBreaker.CLOSED
+
+def test_failure_before_sending_gives_the_slot_back():
+    service = _half_open_service(202)
+    service.headers = None
+    assert service.send_search("query", "c1") == (False, None)
+    assert service.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    service.headers = {}
+    assert service.send_search("query", "c1") == (True, None)
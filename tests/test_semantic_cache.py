@@ -0,0 +1,55 @@
+from app.services.semantic_cache import SemanticCache
+
+SCOPE = "gpt-test|0.7|system"
+
+def test_near_verbatim_repeat_hits():
+    cache = SemanticCache(capacity=8)
+    cache.put(SCOPE, "What are your opening hours?", "9 to 5")
+    assert cache.get(SCOPE, "what are your opening hours") == "9 to 5"
+    assert cache.get_stats()["hits"] == 1
+
+def test_different_question_misses():
+    cache = SemanticCache(capacity=8)
+    cache.put(SCOPE, "What are your opening hours?", "9 to 5")
+    assert cache.get(SCOPE, "How do I reset my password?") is None
+    assert cache.get_stats()["misses"] == 1
+
+def test_entries_are_scoped():
+    cache = SemanticCache(capacity=8)
+    cache.put(SCOPE, "What are your opening hours?", "9 to 5")
+    assert cache.get("other-model|0.7|system", "What are your opening hours?") is None
+
+def test_identical_prompt_replaces_its_entry():
+    cache = SemanticCache(capacity=8)
+    cache.put(SCOPE, "What are your opening hours?", "9 to 5")
+    cache.put(SCOPE, "What are your opening hours?", "10 to 6")
+    assert cache.get_stats()["size"] == 1
+    assert cache.get(SCOPE, "What are your opening hours?") == "10 to 6"
+
+def test_identical_prompt_in_another_scope_is_a_new_entry():
+    cache = SemanticCache(capacity=8)
+    cache.put(SCOPE, "What are your opening hours?", "9 to 5")
+    cache.put("other-model|0.7|system", "What are your opening hours?", "10 to 6")
+    assert cache.get_stats()["size"] == 2
+    assert cache.get(SCOPE, "What are your opening hours?") == "9 to 5"
+
+def test_evicted_prompt_is_stored_again():
+    cache = SemanticCache(capacity=2)
+    cache.put(SCOPE, "first question about billing", "a")
+    cache.put(SCOPE, "second question about shipping", "b")
+    cache.put(SCOPE, "third question about returns", "c")
+    assert cache.get_stats()["evictions"] == 1
+
+    # The evicted prompt no longer owns a slot, so it takes the least recently used one
+    cache.put(SCOPE, "first question about billing", "a2")
+    assert cache.get_stats()["evictions"] == 2
+    assert cache.get(SCOPE, "first question about billing") == "a2"
+    assert cache.get(SCOPE, "third question about returns") == "c"
+
+def test_expired_entry_is_refreshed_in_place():
+    cache = SemanticCache(capacity=8, ttl=0.0)
+    cache.put(SCOPE, "What are your opening hours?", "9 to 5")
+    cache.ttl = 3600.0
+    cache.put(SCOPE, "What are your opening hours?", "10 to 6")
+    assert cache.get_stats()["size"] == 1
+    assert cache.get(SCOPE, "What are your opening hours?") == "10 to 6"
@@ -0,0 +1,38 @@
+import copy
+from app.services import openai_client, service_container
+from app.services.service_container import get_service_container, invalidate_service_container, restart_required_changes
+from app.utils.config import load_config
+
+def test_unchanged_configuration_needs_no_restart():
+    config = load_config()
+    assert restart_required_changes(config, copy.deepcopy(config)) == []
+
+def test_changed_singleton_settings_need_a_restart():
+    config = load_config()
+    changed = copy.deepcopy(config)
+    changed["openai"]["rate_limits"]["max_wait"] += 1
+    changed["jobs"]["max_workers"] += 1
+    # Read per session, so applied by the rebuild
+    changed["openai"]["retry"]["max_retries"] += 1
+    assert restart_required_changes(config, changed) == ["rate limiter", "job executor"]
+
+def test_rebuild_closes_the_pooled_client_and_reports_restart_settings(monkeypatch):
+    monkeypatch.setattr(service_container, "_container", None)
+    monkeypatch.setattr(service_container, "_process_config", None)
+    config = load_config()
+    config["openai"]["api_key"] = "test-key"
+    first = get_service_container(config)
+    client = first.get_openai_client()
+
+    changed = copy.deepcopy(config)
+    changed["jobs"]["max_workers"] += 1
+    second = get_service_container(changed)
+
+    assert second is not first
+    assert second.generation > first.generation
+    assert second.get_stats()["restart_required"] == ["job executor"]
+    assert client.is_closed()
+    assert second.get_openai_client() is not client
+
+    invalidate_service_container()
+    openai_client.close_client("test-key", config["openai"]["base_url"])
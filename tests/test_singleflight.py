@@ -0,0 +1,203 @@
+import threading
+import time
+import pytest
+from app.services.singleflight import SingleFlight
+
+def _wait_until(predicate, timeout: float = 5.0):
+    """Poll until ``predicate`` holds, failing the test after ``timeout`` seconds."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("Timed out waiting for condition")
+        time.sleep(0.005)
+
+def _start(target) -> threading.Thread:
+    """Run ``target`` on a daemon thread."""
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+def test_follower_shares_leader_result():
+    singleflight = SingleFlight()
+    release = threading.Event()
+    executions = []
+
+    def upstream():
+        executions.append(1)
+        release.wait(5)
+        return "answer"
+
+    results = []
+    leader = _start(lambda: results.append(singleflight.do("key", upstream)))
+    _wait_until(lambda: executions)
+    follower = _start(lambda: results.append(singleflight.do("key", upstream)))
+    _wait_until(lambda: singleflight.get_stats()["collapsed"] == 1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert results == ["answer", "answer"]
+    assert len(executions) == 1
+    assert singleflight.get_stats() == {"calls": 2, "upstream_calls": 1, "collapsed": 1, "in_flight": 0}
+
+def test_follower_receives_leader_error():
+    singleflight = SingleFlight()
+    release = threading.Event()
+    started = threading.Event()
+
+    def upstream():
+        started.set()
+        release.wait(5)
+        raise ValueError("upstream failed")
+
+    errors = []
+
+    def call():
+        try:
+            singleflight.do("key", upstream)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = _start(call)
+    started.wait(5)
+    follower = _start(call)
+    _wait_until(lambda: singleflight.get_stats()["collapsed"] == 1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(errors) == 2
+    assert errors[0] is errors[1]
+
+def test_finished_call_is_not_cached():
+    singleflight = SingleFlight()
+    executions = []
+
+    def upstream():
+        executions.append(1)
+        return len(executions)
+
+    assert singleflight.do("key", upstream) == 1
+    assert singleflight.do("key", upstream) == 2
+
+def test_stream_follower_replays_then_follows_live():
+    singleflight = SingleFlight()
+    release = threading.Event()
+
+    def upstream():
+        yield "a"
+        release.wait(5)
+        yield "b"
+        yield "c"
+
+    leader = singleflight.do_stream("key", upstream)
+    assert next(leader) == "a"
+
+    received = []
+    follower = _start(lambda: received.extend(singleflight.do_stream("key", upstream)))
+    _wait_until(lambda: received == ["a"])
+    release.set()
+    assert list(leader) == ["b", "c"]
+    follower.join(5)
+
+    assert received == ["a", "b", "c"]
+    assert singleflight.get_stats()["upstream_calls"] == 1
+
+def test_stream_follower_continues_after_leader_cancels():
+    singleflight = SingleFlight()
+    release = threading.Event()
+    closed = []
+
+    def upstream():
+        try:
+            yield "a"
+            release.wait(5)
+            yield "b"
+            yield "c"
+        finally:
+            closed.append(True)
+
+    leader = singleflight.do_stream("key", upstream)
+    assert next(leader) == "a"
+
+    received = []
+    follower = _start(lambda: received.extend(singleflight.do_stream("key", upstream)))
+    _wait_until(lambda: singleflight.get_stats()["collapsed"] == 1)
+    leader.close()
+    release.set()
+    follower.join(5)
+
+    assert received == ["a", "b", "c"]
+    assert closed == [True]
+    assert singleflight.get_stats()["upstream_calls"] == 1
+    assert singleflight.get_stats()["in_flight"] == 0
+
+def test_stream_runs_ahead_of_a_slow_leader():
+    singleflight = SingleFlight()
+
+    def upstream():
+        yield from ["a", "b", "c"]
+
+    leader = singleflight.do_stream("key", upstream)
+    assert next(leader) == "a"
+    _wait_until(lambda: singleflight.get_stats()["in_flight"] == 0)
+
+    # The upstream finished while the leader was still on its first chunk
+    assert list(leader) == ["b", "c"]
+
+def test_stream_is_cancelled_when_every_reader_leaves():
+    singleflight = SingleFlight()
+    closed = []
+
+    def upstream():
+        try:
+            while True:
+                yield "chunk"
+                time.sleep(0.005)
+        finally:
+            closed.append(True)
+
+    leader = singleflight.do_stream("key", upstream)
+    follower = singleflight.do_stream("key", upstream)
+    assert next(leader) == "chunk"
+    assert next(follower) == "chunk"
+    leader.close()
+    assert next(follower) == "chunk"
+    follower.close()
+
+    _wait_until(lambda: closed == [True])
+    assert singleflight.get_stats()["in_flight"] == 0
+    # A later caller starts a new upstream call instead of joining the cancelled one
+    fresh = singleflight.do_stream("key", upstream)
+    assert next(fresh) == "chunk"
+    fresh.close()
+    assert singleflight.get_stats()["upstream_calls"] == 2
+
+def test_stream_error_reaches_every_reader():
+    singleflight = SingleFlight()
+    release = threading.Event()
+
+    def upstream():
+        yield "a"
+        release.wait(5)
+        raise ValueError("upstream failed")
+
+    leader = singleflight.do_stream("key", upstream)
+    assert next(leader) == "a"
+
+    errors = []
+
+    def follow():
+        try:
+            list(singleflight.do_stream("key", upstream))
+        except ValueError as e:
+            errors.append(e)
+
+    follower = _start(follow)
+    _wait_until(lambda: singleflight.get_stats()["collapsed"] == 1)
+    release.set()
+    with pytest.raises(ValueError):
+        list(leader)
+    follower.join(5)
+
+    assert len(errors) == 1
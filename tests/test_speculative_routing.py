@@ -0,0 +1,140 @@
+import threading
+import pytest
+from app.services import openai_service
+from app.services.job_queue import JobExecutor, JobQueueFullError
+from app.services.openai_service import SEARCHING_MESSAGE, process_user_input
+from app.services.resilience import CircuitOpenError
+
+class FakeOpenAIService:
+    """Streams a fixed answer, optionally blocking until released."""
+
+    def __init__(self, release: threading.Event = None, error: Exception = None):
+        self.release = release
+        self.error = error
+
+    def generate_response_stream(self, messages, model, route):
+        if self.release is not None:
+            self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        yield "speculative "
+        yield "answer"
+
+    def generate_response(self, messages, model, route):
+        return "direct answer"
+
+class FakeSearchService:
+    """Accepts, rejects or fails every search."""
+
+    def __init__(self, accepted: bool = True, error: Exception = None):
+        self.accepted = accepted
+        self.error = error
+        self.queries = []
+
+    def perform_search(self, query, request_id=None):
+        self.queries.append(query)
+        if self.error is not None:
+            raise self.error
+        return self.accepted
+
+class FullExecutor:
+    """Job executor without room for another job."""
+
+    def submit(self, fn, handle):
+        raise JobQueueFullError("busy")
+
+    def get(self, job_id):
+        return None
+
+@pytest.fixture
+def executor():
+    return JobExecutor(max_workers=2, max_queued=2)
+
+@pytest.fixture
+def speculative(session_state, monkeypatch, executor):
+    """Route every input into the speculative band with fake dependencies."""
+    session_state.config["router"]["speculative"]["enabled"] = True
+    monkeypatch.setattr(openai_service, "get_search_score", lambda user_input: 0.4)
+    monkeypatch.setattr(openai_service, "get_search_cache", lambda cache_config: None)
+    monkeypatch.setattr(openai_service, "get_job_executor", lambda job_config: executor)
+    monkeypatch.setattr(openai_service, "get_turn_model", lambda user_input: "gpt-test")
+    monkeypatch.setattr(openai_service, "get_turn_route", lambda user_input: "chat")
+    monkeypatch.setattr(openai_service, "get_messages_for_openai", lambda model: [])
+    monkeypatch.setattr(openai_service, "schedule_summary", lambda: None)
+
+    def use(service: FakeOpenAIService):
+        monkeypatch.setattr(openai_service, "create_openai_service", lambda: service)
+
+    return use
+
+def _assert_no_jobs_left(executor: JobExecutor):
+    stats = executor.get_stats()
+    assert (stats["running"], stats["queued"], stats["uncollected"]) == (0, 0, 0)
+
+def test_accepted_search_cancels_and_drops_the_answer(session_state, speculative, executor):
+    release = threading.Event()
+    speculative(FakeOpenAIService(release=release))
+    try:
+        response = process_user_input("vacation policy", FakeSearchService(accepted=True))
+    finally:
+        release.set()
+
+    assert response == SEARCHING_MESSAGE
+    assert "active_generation" not in session_state
+    assert [message["role"] for message in session_state.messages] == ["user"]
+    _assert_no_jobs_left(executor)
+
+def test_rejected_search_keeps_the_answer(session_state, speculative, executor):
+    speculative(FakeOpenAIService())
+    response = process_user_input("vacation policy", FakeSearchService(accepted=False))
+
+    assert response == "speculative answer"
+    assert session_state.messages[-1]["role"] == "assistant"
+    assert session_state.messages[-1]["content"] == "speculative answer"
+    assert "active_generation" not in session_state
+    _assert_no_jobs_left(executor)
+
+def test_search_circuit_open_keeps_the_answer(session_state, speculative, executor):
+    speculative(FakeOpenAIService())
+    search_service = FakeSearchService(error=CircuitOpenError("search down"))
+    response = process_user_input("vacation policy", search_service)
+
+    assert response == "speculative answer"
+    _assert_no_jobs_left(executor)
+
+def test_failed_answer_is_reported(session_state, speculative, executor):
+    speculative(FakeOpenAIService(error=RuntimeError("upstream failed")))
+    response = process_user_input("vacation policy", FakeSearchService(accepted=False))
+
+    assert response == "Error: upstream failed"
+    assert "active_generation" not in session_state
+    _assert_no_jobs_left(executor)
+
+def test_no_worker_and_rejected_search_answers_directly(session_state, speculative, monkeypatch):
+    monkeypatch.setattr(openai_service, "get_job_executor", lambda job_config: FullExecutor())
+    speculative(FakeOpenAIService())
+    response = process_user_input("vacation policy", FakeSearchService(accepted=False))
+
+    assert response == "direct answer"
+    assert session_state.messages[-1]["content"] == "direct answer"
+
+def test_no_worker_and_accepted_search_waits_for_results(session_state, speculative, monkeypatch):
+    monkeypatch.setattr(openai_service, "get_job_executor", lambda job_config: FullExecutor())
+    speculative(FakeOpenAIService())
+    search_service = FakeSearchService(accepted=True)
+    response = process_user_input("vacation policy", search_service)
+
+    assert response == SEARCHING_MESSAGE
+    assert search_service.queries == ["vacation policy"]
+
+def test_precomputed_search_score_is_not_recomputed(session_state, speculative, monkeypatch):
+    def fail(user_input):
+        raise AssertionError("search intent scored twice")
+
+    monkeypatch.setattr(openai_service, "get_search_score", fail)
+    speculative(FakeOpenAIService())
+    response = process_user_input("vacation policy", FakeSearchService(accepted=False), search_score=0.4)
+
+    assert response == "speculative answer"
+    assert openai_service.should_speculate("vacation policy", 0.4)
+    assert not openai_service.should_use_semantic_search("vacation policy", 0.4)
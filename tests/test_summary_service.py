@@ -0,0 +1,101 @@
+import threading
+import pytest
+from app.services.generation_profiles import ROUTE_SUMMARY
+from app.services.summary_service import ConversationSummarizer
+from app.utils.session import get_messages_for_openai
+
+class FakeOpenAIService:
+    """Returns numbered summaries, optionally waiting for ``release`` first."""
+
+    def __init__(self, release: threading.Event = None, error: Exception = None):
+        self.release = release
+        self.error = error
+        self.prompts = []
+
+    def generate_response(self, messages, model, route):
+        assert route == ROUTE_SUMMARY
+        self.prompts.append(messages)
+        if self.release is not None:
+            self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return f"summary {len(self.prompts)}"
+
+def _turns(count: int, start: int = 0):
+    """Build alternating user and assistant messages, starting with a user turn."""
+    return [
+        {"role": "user" if idx % 2 == 0 else "assistant", "content": f"message {idx}"}
+        for idx in range(start, start + count)
+    ]
+
+def _summarizer(service: FakeOpenAIService) -> ConversationSummarizer:
+    return ConversationSummarizer(service, model="gpt-test", threshold=4, keep_recent=2)
+
+def _new_messages(prompt) -> str:
+    return prompt[1]["content"].split("New messages:\n", 1)[1]
+
+def test_no_update_below_threshold():
+    summarizer = _summarizer(FakeOpenAIService())
+    assert not summarizer.maybe_schedule(_turns(4))
+    assert summarizer.get_state() == (None, 0)
+
+def test_update_folds_all_but_the_recent_messages():
+    service = FakeOpenAIService()
+    summarizer = _summarizer(service)
+    messages = [{"role": "system", "content": "Rules"}] + _turns(5)
+    assert summarizer.maybe_schedule(messages)
+    summarizer.thread.join(5)
+
+    summary, summarized_count = summarizer.get_state()
+    assert summarized_count == 3
+    assert summary == {"role": "system", "content": "Summary of the earlier conversation:\nsummary 1"}
+    assert "Existing summary:\n(none)" in service.prompts[0][1]["content"]
+    assert _new_messages(service.prompts[0]) == "user: message 0\nassistant: message 1\nuser: message 2"
+
+def test_update_is_incremental():
+    service = FakeOpenAIService()
+    summarizer = _summarizer(service)
+    messages = _turns(5)
+    summarizer.maybe_schedule(messages)
+    summarizer.thread.join(5)
+
+    # Only messages beyond the folded ones count towards the next update
+    messages += _turns(2, start=5)
+    assert not summarizer.maybe_schedule(messages)
+    messages += _turns(1, start=7)
+    assert summarizer.maybe_schedule(messages)
+    summarizer.thread.join(5)
+
+    assert "Existing summary:\nsummary 1" in service.prompts[1][1]["content"]
+    assert _new_messages(service.prompts[1]) == "assistant: message 3\nuser: message 4\nassistant: message 5"
+    assert summarizer.get_state()[1] == 6
+
+def test_state_changes_only_when_the_background_update_finishes():
+    release = threading.Event()
+    summarizer = _summarizer(FakeOpenAIService(release=release))
+    messages = _turns(5)
+    assert summarizer.maybe_schedule(messages)
+
+    assert summarizer.get_state() == (None, 0)
+    assert not summarizer.maybe_schedule(messages + _turns(10, start=5))
+    release.set()
+    summarizer.thread.join(5)
+    assert summarizer.get_state()[1] == 3
+
+def test_failed_update_keeps_the_previous_state():
+    summarizer = _summarizer(FakeOpenAIService(error=RuntimeError("upstream failed")))
+    summarizer.maybe_schedule(_turns(5))
+    summarizer.thread.join(5)
+    assert summarizer.get_state() == (None, 0)
+
+def test_prompt_replaces_folded_messages_with_the_summary(session_state):
+    summarizer = _summarizer(FakeOpenAIService())
+    session_state.summarizer = summarizer
+    session_state.messages = _turns(5)
+    summarizer.maybe_schedule(session_state.messages)
+    summarizer.thread.join(5)
+
+    prompt = get_messages_for_openai("gpt-4", budget=10_000)
+    contents = [msg["content"] for msg in prompt]
+    assert "Summary of the earlier conversation:\nsummary 1" in contents
+    assert [content for content in contents if content.startswith("message")] == ["message 3", "message 4"]